@@ -0,0 +1,236 @@
+"""
+Suíte de benchmarks dos caminhos críticos do analisador
+
+Mede vazão (jogadas/s) e pico de memória (tracemalloc) de cada caminho em
+vários tamanhos de histórico, grava em JSON e falha quando algum resultado
+piora além da tolerância em relação ao baseline.
+
+Uso:
+    python scripts/benchmark.py                    # compara com o baseline
+    python scripts/benchmark.py --record           # grava novo baseline
+    python scripts/benchmark.py --sizes 1e3 1e5    # só alguns tamanhos
+    python scripts/benchmark.py --only trends      # filtra pelo nome
+"""
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from analyzer import BacBoAnalyzer
+from charts import ChartPanel
+from utils import FileExporter
+
+BASELINE_FILE = os.path.join(ROOT, "scripts", "baselines", "benchmark.json")
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+# simulate_game é um laço Python por jogada; acima disso levaria minutos
+MAX_GAME_ROUNDS = 10 ** 5
+
+def _history(n: int) -> BacBoAnalyzer:
+    analyzer = BacBoAnalyzer()
+    analyzer.simulate_batch(n, seed=12345)
+    return analyzer
+
+def bench_simulate_game(n):
+    analyzer = BacBoAnalyzer()
+    def run():
+        analyzer.reset_history()
+        for _ in range(n):
+            analyzer.simulate_game()
+    return run
+
+def bench_simulate_batch(n):
+    analyzer = BacBoAnalyzer()
+    def run():
+        analyzer.reset_history()
+        analyzer.simulate_batch(n, seed=1)
+    return run
+
+def bench_statistics_live(n):
+    analyzer = _history(n)
+    return lambda: analyzer.calculate_statistics(analyzer.get_last_results())
+
+def bench_statistics_slice(n):
+    analyzer = _history(n + 1)
+    def run():
+        # Mede o cálculo, não a consulta ao cache
+        analyzer.cache.clear()
+        analyzer.calculate_statistics(analyzer.get_last_results(n))
+    return run
+
+def _bench_trends(window_size, cached=False):
+    def bench(n):
+        analyzer = _history(n)
+        def run():
+            if not cached:
+                analyzer.cache.clear()
+            analyzer.analyze_trends(analyzer.get_last_results(), window_size)
+        return run
+    return bench
+
+def _bench_export(format_type):
+    def bench(n):
+        analyzer = _history(n)
+        exporter = FileExporter()
+        exporter.export_dir = tempfile.mkdtemp(prefix="bacbo_bench_") + os.sep
+        def run():
+            filename = exporter.export_to_file(analyzer.get_last_results(), format_type)
+            os.remove(filename)
+        run.cleanup = lambda: shutil.rmtree(exporter.export_dir, ignore_errors=True)
+        return run
+    return bench
+
+def bench_charts(n):
+    analyzer = _history(n)
+    panel = ChartPanel()
+    canvas = FigureCanvasAgg(panel.figure)
+    def run():
+        panel.update(analyzer.get_last_results())
+        canvas.draw()
+    return run
+
+# nome -> (fábrica que prepara o estado e devolve a função medida, tamanho máximo)
+BENCHMARKS = {
+    "simulate_game": (bench_simulate_game, MAX_GAME_ROUNDS),
+    "simulate_batch": (bench_simulate_batch, None),
+    "statistics_live": (bench_statistics_live, None),
+    "statistics_slice": (bench_statistics_slice, None),
+    "trends_w5": (_bench_trends(5), None),
+    "trends_w50": (_bench_trends(50), None),
+    "trends_w500": (_bench_trends(500), None),
+    "trends_w50_cached": (_bench_trends(50, cached=True), None),
+    "export_csv": (_bench_export("csv"), None),
+    "export_txt": (_bench_export("txt"), None),
+    "charts_offscreen": (bench_charts, None),
+}
+
+def measure(factory, n: int, repeats: int) -> dict:
+    """Melhor tempo de repeats execuções e pico de memória de uma execução extra"""
+    run = factory(n)
+    try:
+        tempos = []
+        for _ in range(repeats):
+            gc.collect()
+            inicio = time.perf_counter()
+            run()
+            tempos.append(time.perf_counter() - inicio)
+
+        gc.collect()
+        tracemalloc.start()
+        run()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        getattr(run, "cleanup", lambda: None)()
+
+    melhor = min(tempos)
+    return {
+        "seconds": round(melhor, 6),
+        "rounds_per_s": round(n / melhor, 1) if melhor > 0 else None,
+        "peak_mb": round(pico / 2 ** 20, 3)
+    }
+
+def run_suite(sizes, only, repeats) -> dict:
+    """Executa os benchmarks selecionados; chave '<nome>@<tamanho>'"""
+    resultados = {}
+    for nome, (factory, maximo) in BENCHMARKS.items():
+        if only and not any(filtro in nome for filtro in only):
+            continue
+        for n in sizes:
+            if maximo is not None and n > maximo:
+                continue
+            chave = f"{nome}@{n}"
+            resultados[chave] = measure(factory, n, repeats)
+            r = resultados[chave]
+            print(f"{chave:28s} {r['seconds']:10.4f} s  {r['rounds_per_s'] or 0:14,.0f} jogadas/s  "
+                  f"{r['peak_mb']:9.2f} MB", flush=True)
+    return resultados
+
+def compare(atual: dict, baseline: dict, tolerance: float, slack_mb: float, min_seconds: float) -> list:
+    """Lista as métricas que pioraram além da tolerância"""
+    regressoes = []
+    for chave, ref in baseline.items():
+        r = atual.get(chave)
+        if r is None:
+            continue
+        # Medições muito curtas são dominadas por ruído de temporização
+        if ref["seconds"] >= min_seconds and r["rounds_per_s"] and ref["rounds_per_s"]:
+            limite = ref["rounds_per_s"] * (1 - tolerance)
+            if r["rounds_per_s"] < limite:
+                regressoes.append(f"{chave}: {r['rounds_per_s']:,.0f} jogadas/s "
+                                  f"(baseline {ref['rounds_per_s']:,.0f}, mínimo {limite:,.0f})")
+        limite_mb = ref["peak_mb"] * (1 + tolerance) + slack_mb
+        if r["peak_mb"] > limite_mb:
+            regressoes.append(f"{chave}: pico {r['peak_mb']:.2f} MB "
+                              f"(baseline {ref['peak_mb']:.2f} MB, máximo {limite_mb:.2f} MB)")
+    return regressoes
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmarks do VT BacBo Analyzer")
+    parser.add_argument("--sizes", nargs="+", type=float, default=DEFAULT_SIZES,
+                        help="Tamanhos de histórico (ex.: 1e3 1e6)")
+    parser.add_argument("--only", nargs="+", default=None, help="Só benchmarks cujo nome contém o texto")
+    parser.add_argument("--repeats", type=int, default=3, help="Execuções por medição (melhor tempo)")
+    parser.add_argument("--output", default=None, help="Grava os resultados neste JSON")
+    parser.add_argument("--record", action="store_true", help="Grava os resultados como novo baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Arquivo de baseline")
+    parser.add_argument("--tolerance", type=float, default=0.30, help="Piora relativa aceita (0.30 = 30%%)")
+    parser.add_argument("--slack-mb", type=float, default=1.0, help="Folga absoluta de memória (MB)")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="Ignora a vazão de medições do baseline mais curtas que isso")
+    args = parser.parse_args()
+
+    resultados = run_suite([int(n) for n in args.sizes], args.only, args.repeats)
+
+    destinos = [args.output] if args.output else []
+    if args.record:
+        if os.path.exists(args.baseline):
+            # Mantém as medições de benchmarks/tamanhos que não foram rodados agora
+            with open(args.baseline, encoding="utf-8") as f:
+                resultados = {**json.load(f), **resultados}
+        destinos.append(args.baseline)
+    for destino in destinos:
+        os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+        with open(destino, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"✅ Resultados gravados em {destino}")
+    if args.record:
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"❌ Baseline não encontrado: {args.baseline} (rode com --record)")
+        return 1
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    sem_baseline = sorted(set(resultados) - set(baseline))
+    if sem_baseline:
+        print(f"⚠️ Sem baseline (não verificados, grave com --record --only ...): {', '.join(sem_baseline)}")
+
+    regressoes = compare(resultados, baseline, args.tolerance, args.slack_mb, args.min_seconds)
+    if regressoes:
+        print("❌ Regressões de desempenho:")
+        for regressao in regressoes:
+            print(f"  - {regressao}")
+        return 1
+
+    print("✅ Desempenho dentro do baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark de inicialização - tempo de import por módulo e até o primeiro frame
+
+Uso:
+    python scripts/benchmark_startup.py             # compara com o baseline
+    python scripts/benchmark_startup.py --record    # grava novo baseline
+
+O gate cobre só os tempos de import, que não dependem de display. O tempo
+até o primeiro frame é medido e mostrado quando há display (ou sob
+xvfb-run), mas não entra no baseline: varia demais com o servidor X e a
+máquina para servir de limite.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT, "src")
+BASELINE_FILE = os.path.join(ROOT, "scripts", "baselines", "startup.json")
+
+# Módulos cujo tempo cumulativo de import é acompanhado
+MODULES = ["numpy", "tkinter", "matplotlib", "store", "running_stats", "analyzer", "utils", "gui"]
+
+# Mede do início do processo até a janela principal ser mapeada na tela
+FIRST_FRAME_SNIPPET = """
+import time
+import tkinter as tk
+from gui import BacBoAnalyzerApp
+
+root = tk.Tk()
+app = BacBoAnalyzerApp(root)
+
+def on_map(event):
+    if event.widget is root:
+        root.update_idletasks()
+        print(time.time(), flush=True)
+        root.after(0, root.destroy)
+
+root.bind('<Map>', on_map)
+root.mainloop()
+"""
+
+def measure_imports(module: str) -> dict:
+    """Roda python -X importtime em um processo limpo e retorna o cumulativo (ms) por módulo"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=SRC_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {}
+
+    cumulativos = {}
+    for line in proc.stderr.splitlines():
+        # Formato: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulativo, nome = [parte.strip() for parte in line[len("import time:"):].split("|")]
+        if cumulativo.isdigit():
+            cumulativos[nome] = int(cumulativo) / 1000
+    return cumulativos
+
+def measure_first_frame():
+    """Tempo (ms) do lançamento do processo até o primeiro frame, ou None sem display"""
+    inicio = time.time()
+    proc = subprocess.run([sys.executable, "-c", FIRST_FRAME_SNIPPET],
+                          cwd=SRC_DIR, capture_output=True, text=True, timeout=60)
+    if proc.returncode != 0 or not proc.stdout.strip():
+        return None
+    return (float(proc.stdout.split()[0]) - inicio) * 1000
+
+def run(repeats: int) -> dict:
+    """Executa todas as medições e devolve as medianas em ms"""
+    resultado = {"imports_ms": {}, "first_frame_ms": None}
+
+    for module in MODULES:
+        amostras = [measure_imports(module).get(module) for _ in range(repeats)]
+        amostras = [a for a in amostras if a is not None]
+        if amostras:
+            resultado["imports_ms"][module] = round(statistics.median(amostras), 2)
+
+    frames = [measure_first_frame() for _ in range(repeats)]
+    frames = [f for f in frames if f is not None]
+    if frames:
+        resultado["first_frame_ms"] = round(statistics.median(frames), 2)
+    return resultado
+
+def compare(atual: dict, baseline: dict, tolerance: float, slack_ms: float) -> list:
+    """Lista os imports que pioraram além da tolerância"""
+    regressoes = []
+    pares = [(f"import {m}", atual["imports_ms"].get(m), v)
+             for m, v in baseline.get("imports_ms", {}).items()]
+
+    for nome, valor, referencia in pares:
+        if valor is None:
+            continue
+        limite = referencia * (1 + tolerance) + slack_ms
+        if valor > limite:
+            regressoes.append(f"{nome}: {valor:.1f} ms (baseline {referencia:.1f} ms, limite {limite:.1f} ms)")
+    return regressoes
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização do VT BacBo Analyzer")
+    parser.add_argument("--record", action="store_true", help="Grava o resultado como novo baseline")
+    parser.add_argument("--repeats", type=int, default=5, help="Execuções por medição (mediana)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Piora relativa aceita (0.25 = 25%%)")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="Folga absoluta para módulos muito rápidos")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Arquivo de baseline")
+    args = parser.parse_args()
+
+    atual = run(args.repeats)
+    print(json.dumps(atual, indent=2))
+    if atual["first_frame_ms"] is None:
+        print("ℹ️ Sem display disponível: tempo até o primeiro frame não medido (use xvfb-run)")
+    else:
+        print(f"ℹ️ Primeiro frame: {atual['first_frame_ms']:.1f} ms (informativo, fora do gate)")
+
+    if args.record:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"imports_ms": atual["imports_ms"]}, f, indent=2)
+            f.write("\n")
+        print(f"✅ Baseline gravado em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"❌ Baseline não encontrado: {args.baseline} (rode com --record)")
+        return 1
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressoes = compare(atual, baseline, args.tolerance, args.slack_ms)
+    if regressoes:
+        print("❌ Regressões de inicialização:")
+        for regressao in regressoes:
+            print(f"  - {regressao}")
+        return 1
+
+    print("✅ Imports dentro do baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Feed local simulado - Substituto da mesa ao vivo para testar o modo --feed
+
+Gera jogadas em CSV (Dado1,Dado2 por linha) numa taxa fixa, para stdout,
+para um arquivo que cresce ou para quem se conectar numa porta TCP.
+
+Uso:
+    python scripts/feed_simulator.py --taxa 1000 | python src/main.py --headless --feed -
+    python scripts/feed_simulator.py --arquivo mesa.csv       # e --feed mesa.csv
+    python scripts/feed_simulator.py --porta 9000             # e --feed tcp://127.0.0.1:9000
+"""
+import argparse
+import socket
+import sys
+import time
+
+import numpy as np
+
+# Envios por segundo (cada envio leva taxa / TICKS_PER_SECOND jogadas)
+TICKS_PER_SECOND = 20
+
+def generate(rate: float, total, seed):
+    """Blocos de linhas CSV no ritmo de rate jogadas por segundo"""
+    rng = np.random.default_rng(seed)
+    enviadas = 0
+    inicio = time.perf_counter()
+    while total is None or enviadas < total:
+        devidas = int((time.perf_counter() - inicio) * rate) + 1
+        lote = devidas - enviadas
+        if total is not None:
+            lote = min(lote, total - enviadas)
+        if lote > 0:
+            dados = rng.integers(1, 7, size=(lote, 2))
+            yield ''.join(f"{d1},{d2}\n" for d1, d2 in dados.tolist()).encode()
+            enviadas += lote
+        time.sleep(1 / TICKS_PER_SECOND)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Feed local de jogadas simuladas")
+    parser.add_argument("--taxa", type=float, default=100, help="Jogadas por segundo (padrão: 100)")
+    parser.add_argument("--total", type=int, default=None, help="Encerra depois de N jogadas")
+    parser.add_argument("--seed", type=int, default=None)
+    destino = parser.add_mutually_exclusive_group()
+    destino.add_argument("--arquivo", default=None, help="Acrescenta as jogadas a este arquivo")
+    destino.add_argument("--porta", type=int, default=None, help="Serve as jogadas em TCP (127.0.0.1)")
+    args = parser.parse_args()
+
+    blocos = generate(args.taxa, args.total, args.seed)
+    try:
+        if args.arquivo:
+            with open(args.arquivo, "ab") as f:
+                for bloco in blocos:
+                    f.write(bloco)
+                    f.flush()
+        elif args.porta:
+            with socket.create_server(("127.0.0.1", args.porta)) as servidor:
+                print(f"Aguardando conexão em tcp://127.0.0.1:{args.porta}", file=sys.stderr)
+                conexao, _ = servidor.accept()
+                with conexao:
+                    for bloco in blocos:
+                        # sendall bloqueia quando o leitor aplica backpressure
+                        conexao.sendall(bloco)
+        else:
+            for bloco in blocos:
+                sys.stdout.buffer.write(bloco)
+                sys.stdout.buffer.flush()
+    except (KeyboardInterrupt, BrokenPipeError, ConnectionError):
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,66 @@
 Módulo de análise do Bac Bo - Lógica do jogo e cálculos estatísticos
 """
 import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Union
+
+import numpy as np
+
+import probability
+import session
+from cache import AnalysisCache, freeze
+from profiling import span
+from running_stats import RunningStatistics
+from patterns import PatternIndex
+from store import ResultsStore, ResultsView, as_view
+from streaks import STREAK_BLOCK, StreakIndex
+
+# Códigos da coluna 'trend' de analyze_trends (índices de TREND_LABELS)
+TREND_IMPAR = 0
+TREND_PAR = 1
+TREND_LABELS = ('ÍMPAR', 'PAR')
+
+# Janelas calculadas por bloco no modo lazy de analyze_trends
+TREND_BLOCK = 1 << 16
+
+# Janelas comparadas por padrão em analyze_trends_multi
+TREND_WINDOWS = (5, 10, 20, 50, 100, 500)
+
+# Posições iniciais de janela por bloco no resumo de analyze_trends_multi
+TREND_SUMMARY_BLOCK = 1 << 20
+
+# Séries indexadas por get_streaks: tipo -> (quantidade de valores, coluna da ResultsView)
+STREAK_KINDS = {
+    'paridade': (2, 'par'),
+    'total': (13, 'total')
+}
+
+# Séries indexadas por get_patterns: tipo -> (alfabeto, comprimento indexado, coluna, menor valor)
+# Paridade até 15 jogadas cabe em códigos uint16; totais até 6 em uint32
+PATTERN_KINDS = {
+    'paridade': (2, 15, 'par', 0),
+    'total': (11, 6, 'total', 2)
+}
+
+# Rótulos aceitos em padrões de paridade
+PARITY_SYMBOLS = {'PAR': TREND_PAR, 'P': TREND_PAR, 'ÍMPAR': TREND_IMPAR, 'IMPAR': TREND_IMPAR, 'I': TREND_IMPAR}
 
 class BacBoAnalyzer:
     def __init__(self):
-        self.results_history = []
+        self.results_history = ResultsStore()
+        self.stats = RunningStatistics()
+        self.rng = np.random.default_rng()
+        # Semente da simulação que iniciou o histórico (gravada nas sessões)
+        self.seed = None
+        # Índices de sequências, criados na primeira consulta e alimentados sob demanda
+        self._streaks: Dict[str, StreakIndex] = {}
+        self._patterns: Dict[str, PatternIndex] = {}
+        # Banco de sessões (opcional) que recebe cada jogada adicionada
+        self.database = None
+        self.session_id = None
+        # Resultados memoizados por (geração, operação, parâmetros, início do trecho);
+        # a geração muda a cada reset, já que até lá o histórico só cresce
+        self.cache = AnalysisCache()
+        self._generation = 0
         
     def simulate_game(self) -> Dict[str, Any]:
         """
@@ -30,65 +85,399 @@ class BacBoAnalyzer:
             'resultado': resultado
         }
         
-        self.results_history.append(result)
+        self.results_history.append(dado1, dado2)
+        self.stats.update_one(dado1, dado2)
+        if self.database is not None:
+            self.database.append(self.session_id, dado1, dado2)
         return result
     
+    def simulate_batch(self, n: int, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Simula n jogadas de uma vez, sorteando todos os dados em bloco
+        
+        Args:
+            n: Quantidade de jogadas
+            seed: Semente para um gerador próprio (None usa o gerador da instância)
+            
+        Returns:
+            Dict com colunas numpy 'dado1', 'dado2', 'total' e 'par' (bool)
+        """
+        if n < 0:
+            raise ValueError("Quantidade de jogadas não pode ser negativa")
+            
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+        if seed is not None and not len(self.results_history):
+            self.seed = seed
+            if self.database is not None:
+                self.database.set_seed(self.session_id, seed)
+        with span('analyzer.sorteio', jogadas=n):
+            dados = rng.integers(1, 7, size=(2, n), dtype=np.uint8)
+            dado1, dado2 = dados[0], dados[1]
+            total = dado1 + dado2
+            
+            batch = {
+                'dado1': dado1,
+                'dado2': dado2,
+                'total': total,
+                'par': (total & 1) == 0
+            }
+        
+        self.extend_history(dado1, dado2)
+        return batch
+    
+    def extend_history(self, dado1: np.ndarray, dado2: np.ndarray):
+        """
+        Adiciona um lote de jogadas ao histórico
+        
+        Args:
+            dado1: Valores do primeiro dado (1 a 6)
+            dado2: Valores do segundo dado (1 a 6)
+        """
+        with span('analyzer.historico', jogadas=len(dado1)):
+            self.results_history.extend(dado1, dado2)
+            self.stats.update(dado1, dado2)
+            if self.database is not None:
+                self.database.append(self.session_id, dado1, dado2)
+    
     def calculate_statistics(self, results: List[Dict]) -> Dict[str, float]:
         """
         Calcula estatísticas dos resultados
         
+        Para o histórico completo usa o acumulador incremental (O(1));
+        demais entradas são resumidas em uma única passada vetorizada.
+        
         Args:
-            results: Lista de resultados das jogadas
+            results: Lista de resultados, ResultsView ou colunas de simulate_batch
             
         Returns:
             Dict com estatísticas calculadas
         """
-        if not results:
+        if self._is_live_history(results):
+            return self.stats.to_dict()
+        if not len(results):
             return {}
+        return self.memoize('estatisticas', results, _accumulate, extend=_extend_accumulator).to_dict()
+    
+    def compare_with_theory(self, results=None) -> Dict[str, Dict[str, float]]:
+        """
+        Compara os resultados com as distribuições exatas de dois dados justos
+        
+        Args:
+            results: Lista de resultados, ResultsView ou colunas (None para o histórico)
             
-        total_jogadas = len(results)
-        pares = sum(1 for r in results if r['resultado'] == 'PAR')
-        impares = total_jogadas - pares
-        soma_totais = sum(r['total'] for r in results)
+        Returns:
+            Dict de probability.goodness_of_fit (qui-quadrado e escores z)
+        """
+        if results is None or self._is_live_history(results):
+            return probability.goodness_of_fit(self.stats)
+        return probability.goodness_of_fit(
+            self.memoize('estatisticas', results, _accumulate, extend=_extend_accumulator))
+    
+    def confidence_intervals(self, results=None, window_sizes=TREND_WINDOWS, min_length: int = 6,
+                             resamples: Optional[int] = None, confidence: Optional[float] = None,
+                             seed: Optional[int] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Intervalos de confiança das estatísticas, tendências e sequências
         
-        return {
-            'total_jogadas': total_jogadas,
-            'pares': pares,
-            'impares': impares,
-            'perc_pares': (pares / total_jogadas) * 100,
-            'perc_impares': (impares / total_jogadas) * 100,
-            'media_total': soma_totais / total_jogadas
-        }
+        Args:
+            results: Lista de resultados, ResultsView ou colunas (None para o histórico)
+            window_sizes: Janelas das frações de tendência
+            min_length: Comprimento mínimo das sequências contadas
+            resamples: Reamostragens do bootstrap (None para o padrão)
+            confidence: Nível de confiança (None para 95%)
+            seed: Semente; com ela o resultado é reproduzível e memoizado
+            workers: Processos para históricos grandes (None usa todos os núcleos)
+            
+        Returns:
+            Dict de bootstrap.bootstrap_intervals
+        """
+        from bootstrap import DEFAULT_CONFIDENCE, DEFAULT_RESAMPLES, bootstrap_intervals
+        
+        if results is None:
+            results = self.get_last_results()
+        resamples = DEFAULT_RESAMPLES if resamples is None else resamples
+        confidence = DEFAULT_CONFIDENCE if confidence is None else confidence
+        janelas = tuple(sorted(set(int(j) for j in window_sizes)))
+        
+        def calcular(results):
+            stats = self.stats if self._is_live_history(results) else None
+            with span('analyzer.intervalos', jogadas=len(results), reamostragens=resamples):
+                return bootstrap_intervals(results, stats, janelas, min_length, resamples,
+                                           confidence, seed, workers)
+                
+        if seed is None:
+            return calcular(results)
+        return self.memoize('intervalos', results, calcular,
+                            params=(janelas, min_length, resamples, confidence, seed))
+    
+    def _is_live_history(self, results) -> bool:
+        """Verifica se results é uma view do histórico inteiro"""
+        if not isinstance(results, ResultsView) or len(results) != len(self.results_history):
+            return False
+        if results is self.results_history or not len(results):
+            return True
+        return np.shares_memory(results.dado1[:1], self.results_history.dado1[:1])
+    
+    def _history_range(self, results) -> Optional[tuple]:
+        """(início, fim) do trecho do histórico atual visto por results, ou None"""
+        if not isinstance(results, ResultsView) or not len(results):
+            return None
+        historico = self.results_history
+        if results is historico:
+            return 0, len(historico)
+        n = len(historico)
+        if not n:
+            return None
+        trechos = []
+        for coluna, base in ((results.dado1, historico.dado1), (results.dado2, historico.dado2)):
+            if coluna.strides != (1,):
+                return None
+            # Views antigas apontam para buffers anteriores, fora deste intervalo
+            inicio = coluna.ctypes.data - base.ctypes.data
+            if inicio < 0 or inicio + len(coluna) > n:
+                return None
+            trechos.append(inicio)
+        if trechos[0] != trechos[1]:
+            return None
+        return trechos[0], trechos[0] + len(results)
+    
+    def memoize(self, operation: str, results, compute, params: tuple = (), extend=None):
+        """
+        Resultado de compute(results) guardado no cache do analisador
+        
+        Só trechos do histórico atual são memoizados: como o histórico só
+        cresce até o próximo reset, o trecho é identificado pelo início e
+        sua versão é o fim. Com a mesma versão o valor sai do cache; se o
+        trecho cresceu e extend foi dado, extend(valor, results, anterior)
+        completa o valor com as jogadas a partir de 'anterior' em vez de
+        recalcular. Os valores são compartilhados e seus arrays ficam
+        somente leitura.
+        
+        Args:
+            operation: Nome da operação
+            results: ResultsView do histórico (outras entradas não são memoizadas)
+            compute: Função que calcula o resultado a partir de results
+            params: Parâmetros da operação (hasheáveis)
+            extend: Função opcional de extensão incremental
+            
+        Returns:
+            Resultado de compute(results)
+        """
+        trecho = self._history_range(results)
+        if trecho is None:
+            return compute(results)
+            
+        inicio, fim = trecho
+        chave = (self._generation, operation, params, inicio)
+        encontrado = self.cache.lookup(chave)
+        if encontrado is not None:
+            versao, valor = encontrado
+            if versao == fim:
+                self.cache.record(hit=True)
+                return valor
+            if extend is not None and versao < fim:
+                valor = freeze(extend(valor, results, versao - inicio))
+                self.cache.record(extended=True)
+                self.cache.store(chave, fim, valor)
+                return valor
+                
+        valor = freeze(compute(results))
+        self.cache.record()
+        self.cache.store(chave, fim, valor)
+        return valor
     
-    def analyze_trends(self, results: List[Dict], window_size: int = 5) -> List[Dict]:
+    def analyze_trends(self, results: List[Dict], window_size: int = 5,
+                       lazy: bool = False) -> Union[Dict[str, np.ndarray], Iterator[Dict]]:
         """
         Analisa tendências em janelas deslizantes
         
+        As contagens saem de uma soma acumulada da paridade, em O(n)
+        independente do tamanho da janela.
+        
         Args:
-            results: Lista de resultados
+            results: Lista de resultados, ResultsView ou colunas de simulate_batch
             window_size: Tamanho da janela para análise
+            lazy: Se True, retorna um gerador que produz um dict por janela
             
         Returns:
-            Lista com tendências calculadas
+            Dict com arrays 'window_start' (1-based), 'pares_in_window',
+            'impares_in_window' e 'trend' (TREND_PAR/TREND_IMPAR), ou o
+            gerador de dicts quando lazy=True
+        """
+        if window_size <= 0:
+            raise ValueError("Tamanho da janela deve ser positivo")
+            
+        if lazy:
+            return _iter_trends(as_view(results).par, window_size)
+            
+        def calcular(results):
+            par = as_view(results).par
+            with span('analyzer.tendencias', jogadas=len(par), janela=window_size):
+                return _window_trends(par, window_size)
+                
+        def estender(anterior, results, n_anterior):
+            # Só as janelas que terminam nas jogadas novas são calculadas
+            primeira = max(n_anterior - window_size + 1, 0)
+            novas = _window_trends(results[primeira:].par, window_size, primeira)
+            return {chave: np.concatenate([anterior[chave], novas[chave]]) for chave in anterior}
+            
+        return self.memoize('tendencias', results, calcular, params=(window_size,), extend=estender)
+    
+    def analyze_trends_multi(self, results, window_sizes=TREND_WINDOWS,
+                             summary: bool = False) -> Dict[str, Any]:
         """
-        trends = []
+        Analisa várias janelas de uma vez sobre a mesma soma acumulada
         
-        for i in range(len(results) - window_size + 1):
-            window = results[i:i + window_size]
-            stats = self.calculate_statistics(window)
+        Args:
+            results: Lista de resultados, ResultsView ou colunas de simulate_batch
+            window_sizes: Tamanhos de janela (repetidos são ignorados)
+            summary: Se True, retorna só os agregados por janela, em blocos
+                de memória limitada, sem montar o array 2-D
+                
+        Returns:
+            Com summary=False, dict com 'window_sizes' (crescentes),
+            'window_start' (1-based), 'pares_in_window' (int32, uma linha
+            por janela, -1 onde a janela não cabe) e 'trend' (int8,
+            TREND_PAR/TREND_IMPAR ou -1); ímpares = window_sizes[:, None] - pares.
+            Com summary=True, dict janela -> 'total_janelas', 'janelas_par',
+            'janelas_impar', 'frac_par', 'frac_par_esperada' e 'media_pares'
+        """
+        janelas = np.unique(np.asarray(window_sizes, dtype=np.int64))
+        if not len(janelas) or janelas[0] <= 0:
+            raise ValueError("Tamanhos de janela devem ser positivos")
             
-            trend = {
-                'window_start': i + 1,
-                'window_end': i + window_size,
-                'pares_in_window': stats['pares'],
-                'impares_in_window': stats['impares'],
-                'trend': 'PAR' if stats['pares'] > stats['impares'] else 'ÍMPAR'
-            }
-            trends.append(trend)
+        def calcular(results):
+            par = as_view(results).par
+            n = len(par)
+            with span('analyzer.tendencias_multi', jogadas=n, janelas=len(janelas), resumo=summary):
+                if summary:
+                    return _trend_summary(par, janelas)
+                    
+                n_colunas = max(n - int(janelas[0]) + 1, 0)
+                pares = np.full((len(janelas), n_colunas), -1, dtype=np.int32)
+                acumulado = _parity_cumsum(par)
+                for linha, janela in enumerate(janelas.tolist()):
+                    k = max(n - janela + 1, 0)
+                    np.subtract(acumulado[janela:janela + k], acumulado[:k], out=pares[linha, :k],
+                                casting='unsafe')
+                    
+                trend = (2 * pares > janelas[:, None]).astype(np.int8)
+                trend[pares < 0] = -1
+                return {
+                    'window_sizes': janelas,
+                    'window_start': np.arange(1, n_colunas + 1, dtype=np.int64),
+                    'pares_in_window': pares,
+                    'trend': trend
+                }
+                
+        return self.memoize('tendencias_multi', results, calcular,
+                            params=(tuple(janelas.tolist()), summary))
+    
+    def get_streaks(self, kind: str = 'paridade') -> StreakIndex:
+        """
+        Índice de sequências do histórico, atualizado com as jogadas novas
+        
+        Só as jogadas adicionadas desde a última consulta são processadas.
+        
+        Args:
+            kind: 'paridade' (valores TREND_IMPAR/TREND_PAR) ou 'total' (2 a 12)
             
-        return trends
+        Returns:
+            StreakIndex com histogramas, maiores sequências e a sequência atual
+        """
+        if kind not in STREAK_KINDS:
+            raise ValueError(f"Tipo de sequência não suportado: {kind}")
+        n_valores, coluna = STREAK_KINDS[kind]
+        index = self._streaks.get(kind)
+        if index is None:
+            index = self._streaks[kind] = StreakIndex(n_valores)
+            
+        n = len(self.results_history)
+        if index.n < n:
+            with span('analyzer.sequencias', tipo=kind, jogadas=n - index.n):
+                for bloco in self.results_history[index.n:].iter_chunks(STREAK_BLOCK):
+                    index.extend(getattr(bloco, coluna).view(np.uint8))
+        return index
     
-    def get_last_results(self, count: int = None) -> List[Dict]:
+    def streak_summary(self, top: int = 3, min_length: int = 6) -> Dict[str, Any]:
+        """
+        Resumo das sequências PAR/ÍMPAR do histórico
+        
+        Args:
+            top: Maiores sequências listadas por resultado
+            min_length: Conta as sequências com pelo menos este comprimento
+            
+        Returns:
+            Dict com 'atual', 'maiores' e 'pelo_menos' por rótulo (PAR/ÍMPAR)
+        """
+        index = self.get_streaks('paridade')
+        atual = index.current
+        if atual is not None:
+            atual = dict(atual, valor=TREND_LABELS[atual['valor']])
+        return {
+            'atual': atual,
+            'maiores': {TREND_LABELS[v]: [{'inicio': s['inicio'], 'comprimento': s['comprimento']}
+                                          for s in index.longest(v, top)]
+                        for v in (TREND_PAR, TREND_IMPAR)},
+            'pelo_menos': {'comprimento': min_length,
+                           **{TREND_LABELS[v]: index.count_at_least(v, min_length)
+                              for v in (TREND_PAR, TREND_IMPAR)}}
+        }
+    
+    def get_patterns(self, kind: str = 'paridade') -> PatternIndex:
+        """
+        Índice de padrões do histórico, atualizado com as jogadas novas
+        
+        Args:
+            kind: 'paridade' (símbolos TREND_IMPAR/TREND_PAR) ou 'total' (total - 2)
+            
+        Returns:
+            PatternIndex com contagem, posições e próximo resultado
+        """
+        if kind not in PATTERN_KINDS:
+            raise ValueError(f"Tipo de padrão não suportado: {kind}")
+        alfabeto, comprimento, coluna, menor = PATTERN_KINDS[kind]
+        index = self._patterns.get(kind)
+        if index is None:
+            index = self._patterns[kind] = PatternIndex(alfabeto, comprimento)
+            
+        n = len(self.results_history)
+        if index.n < n:
+            with span('analyzer.padroes', tipo=kind, jogadas=n - index.n):
+                for bloco in self.results_history[index.n:].iter_chunks(STREAK_BLOCK):
+                    simbolos = getattr(bloco, coluna).view(np.uint8)
+                    index.extend(simbolos - np.uint8(menor) if menor else simbolos)
+        return index
+    
+    def find_pattern(self, pattern, kind: str = 'paridade', max_positions: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Busca um padrão de resultados consecutivos no histórico
+        
+        Args:
+            pattern: Sequência de rótulos ('PAR', 'ÍMPAR', códigos TREND_*) ou
+                de totais (2 a 12), ou texto separado por vírgulas
+            kind: 'paridade' ou 'total'
+            max_positions: Limita as posições retornadas (None para todas)
+            
+        Returns:
+            Dict com 'ocorrencias', 'posicoes' (jogada inicial, 1-based) e
+            'proximo' (contagem do resultado seguinte por rótulo)
+        """
+        index = self.get_patterns(kind)
+        simbolos = _pattern_symbols(pattern, kind)
+        posicoes = index.positions(simbolos)
+        proximos = index.next_counts(simbolos).tolist()
+        if kind == 'paridade':
+            proximo = {TREND_LABELS[v]: proximos[v] for v in (TREND_PAR, TREND_IMPAR)}
+        else:
+            proximo = {v + PATTERN_KINDS[kind][3]: c for v, c in enumerate(proximos)}
+        return {
+            'ocorrencias': len(posicoes),
+            'posicoes': posicoes[:max_positions] + 1,
+            'proximo': proximo
+        }
+    
+    def get_last_results(self, count: int = None) -> ResultsView:
         """
         Retorna os últimos resultados
         
@@ -96,12 +485,236 @@ class BacBoAnalyzer:
             count: Quantidade de resultados (None para todos)
             
         Returns:
-            Lista de resultados
+            ResultsView sem cópia, indexável como a lista de dicts
         """
         if count is None:
-            return self.results_history.copy()
+            return self.results_history[:]
         return self.results_history[-count:]
     
+    def get_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Retorna o histórico completo em colunas numpy
+        
+        Returns:
+            Dict com colunas 'dado1', 'dado2', 'total' e 'par'
+        """
+        return self.results_history.columns()
+    
+    def save_session(self, path: str) -> str:
+        """
+        Grava o histórico no formato binário de sessão (.vtbb)
+        
+        Args:
+            path: Caminho do arquivo
+            
+        Returns:
+            Caminho do arquivo gravado
+        """
+        with span('analyzer.salvar_sessao', jogadas=len(self.results_history)):
+            return session.save_session(path, self.results_history, self.stats, self.seed)
+    
+    @classmethod
+    def open_session(cls, path: str, mmap: bool = True) -> 'BacBoAnalyzer':
+        """
+        Cria um analisador sobre uma sessão gravada
+        
+        Com mmap=True o histórico fica mapeado do arquivo, e estatísticas,
+        tendências e gráficos leem direto dele sem carregá-lo.
+        
+        Args:
+            path: Caminho do arquivo
+            mmap: Mapeia o arquivo em vez de lê-lo para a memória
+            
+        Returns:
+            BacBoAnalyzer com o histórico da sessão
+        """
+        analyzer = cls()
+        with span('analyzer.abrir_sessao', mmap=mmap):
+            analyzer.results_history, analyzer.stats, header = session.open_session(path, mmap)
+        analyzer.seed = header.get('seed')
+        return analyzer
+    
+    @classmethod
+    def from_file(cls, path: str, format_type: str = 'auto', skip_invalid: bool = False,
+                  progress=None) -> 'BacBoAnalyzer':
+        """
+        Cria um analisador com as jogadas de um CSV/NDJSON gravado
+        
+        Args:
+            path: Caminho do arquivo (pode estar comprimido)
+            format_type: 'csv', 'ndjson' ou 'auto'
+            skip_invalid: Ignora linhas inválidas em vez de falhar
+            progress: Chamado com (bytes lidos, tamanho do arquivo)
+            
+        Returns:
+            BacBoAnalyzer com o histórico importado
+        """
+        from importer import FileImporter
+        
+        analyzer = cls()
+        with span('analyzer.importar', formato=format_type):
+            FileImporter(skip_invalid=skip_invalid).import_file(analyzer, path, format_type,
+                                                                progress=progress)
+        return analyzer
+    
+    def attach_database(self, database, session_id: Optional[int] = None,
+                        name: Optional[str] = None) -> int:
+        """
+        Passa a gravar o histórico numa sessão do banco
+        
+        Sem session_id, cria uma sessão nova com as jogadas já existentes.
+        
+        Args:
+            database: SessionDatabase
+            session_id: Sessão que já contém este histórico
+            name: Nome da sessão criada
+            
+        Returns:
+            ID da sessão
+        """
+        if session_id is None:
+            session_id = database.create_session(name, self.seed)
+            for bloco in self.results_history.iter_chunks(STREAK_BLOCK):
+                database.append(session_id, bloco.dado1, bloco.dado2)
+        self.database = database
+        self.session_id = session_id
+        return session_id
+    
+    @classmethod
+    def open_database_session(cls, database, session_id: int) -> 'BacBoAnalyzer':
+        """
+        Reabre uma sessão do banco; jogadas novas continuam nela
+        
+        As estatísticas vêm das contagens agregadas do banco, sem recalcular
+        a partir das jogadas.
+        
+        Args:
+            database: SessionDatabase
+            session_id: ID da sessão
+            
+        Returns:
+            BacBoAnalyzer com o histórico da sessão
+        """
+        analyzer = cls()
+        with span('analyzer.abrir_banco', sessao=session_id):
+            analyzer.seed = database.get_session(session_id)['seed']
+            analyzer.results_history = database.load_history(session_id)
+            analyzer.stats = database.load_statistics(session_id)
+        analyzer.database = database
+        analyzer.session_id = session_id
+        return analyzer
+    
     def reset_history(self):
         """Limpa o histórico de resultados"""
         self.results_history.clear()
+        self.stats.reset()
+        self.seed = None
+        self._streaks.clear()
+        self._patterns.clear()
+        self._generation += 1
+        self.cache.clear()
+        if self.database is not None:
+            # As jogadas antigas continuam na sessão anterior do banco
+            self.session_id = self.database.create_session()
+
+
+def _pattern_symbols(pattern, kind: str) -> np.ndarray:
+    """Converte um padrão em rótulos/totais para os símbolos do PatternIndex"""
+    if isinstance(pattern, str):
+        pattern = [p.strip() for p in pattern.split(',') if p.strip()]
+    simbolos = []
+    for item in pattern:
+        if kind == 'paridade' and isinstance(item, str):
+            if item.upper() not in PARITY_SYMBOLS:
+                raise ValueError(f"Rótulo inválido no padrão: {item}")
+            simbolos.append(PARITY_SYMBOLS[item.upper()])
+        else:
+            simbolos.append(int(item) - PATTERN_KINDS[kind][3])
+    return np.array(simbolos, dtype=np.int64)
+
+
+def _accumulate(results) -> RunningStatistics:
+    """Acumulador de estatísticas de um trecho, em uma passada vetorizada"""
+    with span('analyzer.estatisticas', jogadas=len(results)):
+        view = as_view(results)
+        return RunningStatistics.from_results(view.dado1, view.dado2)
+
+def _extend_accumulator(stats: RunningStatistics, results, anterior: int) -> RunningStatistics:
+    """Cópia do acumulador com as jogadas de results a partir de 'anterior'"""
+    novas = as_view(results)[anterior:]
+    estendido = stats.copy()
+    estendido.update(novas.dado1, novas.dado2)
+    return estendido
+
+def _window_trends(par: np.ndarray, window_size: int, offset: int = 0) -> Dict[str, np.ndarray]:
+    """Tendências das janelas de par; offset desloca o 'window_start' (trecho do meio da série)"""
+    n_janelas = max(len(par) - window_size + 1, 0)
+    acumulado = _parity_cumsum(par)
+    pares = (acumulado[window_size:] - acumulado[:-window_size]).astype(np.int32)
+    impares = window_size - pares
+    return {
+        'window_start': np.arange(offset + 1, offset + n_janelas + 1, dtype=np.int64),
+        'pares_in_window': pares,
+        'impares_in_window': impares,
+        'trend': (pares > impares).astype(np.uint8)
+    }
+
+def _parity_cumsum(par: np.ndarray) -> np.ndarray:
+    """Soma acumulada da paridade com zero inicial, em int32 quando cabe"""
+    dtype = np.int32 if len(par) < np.iinfo(np.int32).max else np.int64
+    acumulado = np.zeros(len(par) + 1, dtype=dtype)
+    np.cumsum(par, out=acumulado[1:])
+    return acumulado
+
+
+def _trend_summary(par: np.ndarray, janelas: np.ndarray) -> Dict[int, Dict[str, float]]:
+    """Agregados por janela de analyze_trends_multi, um bloco de posições por vez"""
+    n = len(par)
+    maior = int(janelas[-1])
+    janelas_par = np.zeros(len(janelas), dtype=np.int64)
+    soma_pares = np.zeros(len(janelas), dtype=np.int64)
+    
+    for inicio in range(0, max(n - int(janelas[0]) + 1, 0), TREND_SUMMARY_BLOCK):
+        fim = min(inicio + TREND_SUMMARY_BLOCK, n)
+        # O bloco carrega a maior janela além do fim, para todas as janelas que começam nele
+        acumulado = _parity_cumsum(par[inicio:fim + maior - 1])
+        for linha, janela in enumerate(janelas.tolist()):
+            k = min(fim, n - janela + 1) - inicio
+            if k <= 0:
+                continue
+            pares = acumulado[janela:janela + k] - acumulado[:k]
+            janelas_par[linha] += np.count_nonzero(2 * pares > janela)
+            soma_pares[linha] += int(pares.sum(dtype=np.int64))
+            
+    resumo = {}
+    for linha, janela in enumerate(janelas.tolist()):
+        total = max(n - janela + 1, 0)
+        resumo[janela] = {
+            'total_janelas': total,
+            'janelas_par': int(janelas_par[linha]),
+            'janelas_impar': total - int(janelas_par[linha]),
+            'frac_par': float(janelas_par[linha] / total) if total else None,
+            'frac_par_esperada': probability.trend_probabilities(janela)['par'],
+            'media_pares': float(soma_pares[linha] / total) if total else None
+        }
+    return resumo
+
+
+def _iter_trends(par: np.ndarray, window_size: int) -> Iterator[Dict]:
+    """Gera as janelas de analyze_trends em blocos, sem montar a lista completa"""
+    n_janelas = len(par) - window_size + 1
+    for inicio in range(0, max(n_janelas, 0), TREND_BLOCK):
+        fim = min(inicio + TREND_BLOCK, n_janelas)
+        acumulado = np.zeros(fim - inicio + window_size, dtype=np.int64)
+        np.cumsum(par[inicio:fim + window_size - 1], out=acumulado[1:])
+        pares = (acumulado[window_size:] - acumulado[:-window_size]).tolist()
+        
+        for i, pares_janela in enumerate(pares, inicio + 1):
+            impares_janela = window_size - pares_janela
+            yield {
+                'window_start': i,
+                'window_end': i + window_size - 1,
+                'pares_in_window': pares_janela,
+                'impares_in_window': impares_janela,
+                'trend': 'PAR' if pares_janela > impares_janela else 'ÍMPAR'
+            }
@@ -0,0 +1,305 @@
+"""
+Módulo de intervalos de confiança - Bootstrap vetorizado e intervalos analíticos
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from analyzer import TREND_IMPAR, TREND_LABELS, TREND_PAR, TREND_WINDOWS
+from probability import prob_longest_streak_at_least
+from running_stats import RunningStatistics
+from store import as_view
+from streaks import run_lengths
+
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_CONFIDENCE = 0.95
+
+# Reamostragens por shard; define a divisão da semente, não depende do número de processos
+SHARD_RESAMPLES = 1000
+
+# Abaixo disso o trabalho por shard não compensa abrir processos
+PARALLEL_MIN_ROUNDS = 1 << 18
+
+# Acima deste comprimento a cauda da maior sequência usa a aproximação assintótica
+LONGEST_EXACT_MAX = 64
+
+# Totais 2..12 indexados pela célula (dado1 - 1) * 6 + (dado2 - 1)
+_CELL_TOTALS = (np.arange(6)[:, None] + np.arange(6)[None, :] + 2).ravel()
+_CELL_PAR = (_CELL_TOTALS % 2 == 0).astype(np.int64)
+
+def _z(confidence: float) -> float:
+    """Quantil normal bicaudal da confiança"""
+    if not 0 < confidence < 1:
+        raise ValueError("Confiança deve estar entre 0 e 1")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def _interval(estimativa: float, inferior: float, superior: float, metodo: str, **extra) -> Dict[str, Any]:
+    return {'estimativa': float(estimativa), 'inferior': float(inferior), 'superior': float(superior),
+            'metodo': metodo, **extra}
+
+def wilson_interval(k: int, n: int, confidence: float = DEFAULT_CONFIDENCE) -> Tuple[float, float]:
+    """Intervalo de Wilson de uma proporção k/n (bom também perto de 0 e 1)"""
+    if n <= 0:
+        return 0.0, 1.0
+    z = _z(confidence)
+    p = k / n
+    denominador = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / denominador
+    raio = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominador
+    return max(centro - raio, 0.0), min(centro + raio, 1.0)
+
+def analytic_intervals(stats: RunningStatistics, confidence: float = DEFAULT_CONFIDENCE) -> Dict[str, Dict[str, Any]]:
+    """
+    Intervalos analíticos das chaves de calculate_statistics
+
+    Percentuais pelo intervalo de Wilson; média e variância pela
+    aproximação normal, com o erro padrão da variância estimado pelo
+    quarto momento central do histograma de totais.
+    """
+    n = stats.total_jogadas
+    if not n:
+        return {}
+    z = _z(confidence)
+    inferior, superior = wilson_interval(stats.pares, n, confidence)
+    media = stats.soma_totais / n
+    variancia = stats.variancia_total
+    totais = np.arange(len(stats.hist_totais))
+    quarto_momento = float((stats.hist_totais * (totais - media) ** 4).sum() / n)
+    erro_variancia = math.sqrt(max(quarto_momento - variancia * variancia, 0.0) / n)
+    erro_media = math.sqrt(variancia / n)
+    return {
+        'perc_pares': _interval(stats.pares / n * 100, inferior * 100, superior * 100, 'wilson'),
+        'perc_impares': _interval(stats.impares / n * 100, (1 - superior) * 100, (1 - inferior) * 100, 'wilson'),
+        'media_total': _interval(media, media - z * erro_media, media + z * erro_media, 'normal'),
+        'variancia_total': _interval(variancia, max(variancia - z * erro_variancia, 0.0),
+                                     variancia + z * erro_variancia, 'normal')
+    }
+
+def block_sum_histogram(series: np.ndarray, block_size: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Distribuição das somas dos blocos circulares de uma série 0/1
+
+    No bootstrap de blocos circulares cada bloco começa numa posição
+    uniforme, então a soma de uma reamostragem é a soma de n_blocos
+    sorteios independentes desta distribuição: basta um sorteio
+    multinomial sobre os valores possíveis (no máximo block_size + 1), em
+    vez de montar a série reamostrada.
+
+    Returns:
+        (valores de soma, quantas posições iniciais dão cada valor, n_blocos)
+    """
+    m = len(series)
+    estendida = np.concatenate([series, series[:block_size - 1]]).astype(np.int32)
+    acumulado = np.zeros(len(estendida) + 1, dtype=np.int64)
+    np.cumsum(estendida, out=acumulado[1:])
+    somas = acumulado[block_size:block_size + m] - acumulado[:m]
+    contagens = np.bincount(somas, minlength=block_size + 1)
+    valores = np.flatnonzero(contagens)
+    return valores, contagens[valores], -(-m // block_size)
+
+def resample_shard(seed_seq: np.random.SeedSequence, resamples: int, cells: np.ndarray,
+                   blocks: List[Tuple[np.ndarray, np.ndarray, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Um shard de reamostragens
+
+    Args:
+        cells: Contagens das 36 células (dado1, dado2), reamostradas como jogadas independentes
+        blocks: block_sum_histogram de cada série reamostrada em blocos
+
+    Returns:
+        (contagens das células por reamostragem (resamples, 36), soma de cada
+        série por reamostragem (séries, resamples))
+    """
+    rng = np.random.default_rng(seed_seq)
+    n = int(cells.sum())
+    celulas = rng.multinomial(n, cells / n, size=resamples) if n else np.zeros((resamples, 36), np.int64)
+    somas = np.zeros((len(blocks), resamples), dtype=np.int64)
+    for i, (valores, contagens, n_blocos) in enumerate(blocks):
+        sorteios = rng.multinomial(n_blocos, contagens / contagens.sum(), size=resamples)
+        somas[i] = sorteios @ valores
+    return celulas, somas
+
+def _run_shards(resamples: int, cells: np.ndarray, blocks, seed, workers: Optional[int],
+                parallel: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Distribui as reamostragens em shards de SHARD_RESAMPLES, em processos se parallel"""
+    raiz = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    tamanhos = [SHARD_RESAMPLES] * (resamples // SHARD_RESAMPLES)
+    if resamples % SHARD_RESAMPLES:
+        tamanhos.append(resamples % SHARD_RESAMPLES)
+    shards = list(zip(raiz.spawn(len(tamanhos)), tamanhos))
+    workers = workers or os.cpu_count() or 1
+
+    if not parallel or workers == 1 or len(shards) <= 1:
+        partes = [resample_shard(seed_seq, tamanho, cells, blocks) for seed_seq, tamanho in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            # map mantém a ordem dos shards: o resultado não depende dos processos
+            partes = list(executor.map(resample_shard, *zip(*shards),
+                                       [cells] * len(shards), [blocks] * len(shards)))
+    return (np.concatenate([p[0] for p in partes]),
+            np.concatenate([p[1] for p in partes], axis=1))
+
+def _block_size(m: int, dependence: int) -> int:
+    """Bloco da ordem de m^(1/3), e pelo menos o dobro do alcance da dependência"""
+    return int(max(min(max(round(m ** (1 / 3)), 2 * dependence, 1), m), 1))
+
+def _longest_tail(n: int, k: int, p: float) -> float:
+    """P(maior sequência >= k): exata até LONGEST_EXACT_MAX, depois exp(-n (1 - p) p^k)"""
+    if k <= LONGEST_EXACT_MAX:
+        return prob_longest_streak_at_least(n, k, p)
+    return -math.expm1(-n * (1 - p) * p ** k)
+
+def _longest_interval(observado: int, n: int, p: float, confidence: float) -> Dict[str, Any]:
+    """Quantis da maior sequência de n jogadas independentes com probabilidade p"""
+    if p <= 0 or p >= 1:
+        # Sem variação: a maior sequência é 0 ou o histórico inteiro
+        return _interval(observado, observado, observado, 'exato')
+    alfa = (1 - confidence) / 2
+    inferior = 0
+    k = 1
+    # P(maior >= k) cai de 1 a 0 com k; o laço para logo depois da cauda superior
+    while True:
+        cauda = _longest_tail(n, k, p)
+        if cauda >= 1 - alfa:
+            inferior = k
+        if cauda <= alfa or k > n:
+            return _interval(observado, inferior, k - 1, 'analitico')
+        k += 1
+
+def bootstrap_intervals(results, stats: Optional[RunningStatistics] = None,
+                        window_sizes: Sequence[int] = TREND_WINDOWS, min_length: int = 6,
+                        resamples: int = DEFAULT_RESAMPLES, confidence: float = DEFAULT_CONFIDENCE,
+                        seed=None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Intervalos de confiança das estatísticas, tendências e sequências
+
+    As estatísticas de calculate_statistics vêm de um bootstrap de jogadas
+    independentes, feito como sorteio multinomial das 36 células (dado1,
+    dado2): equivale a reamostrar as jogadas e custa O(36) por
+    reamostragem. Frações de tendência e contagens de sequências dependem
+    da ordem, então usam bootstrap de blocos circulares sobre séries 0/1
+    (janela PAR, troca de resultado, sequência que atinge min_length),
+    com o custo de block_sum_histogram. A maior sequência não tem
+    bootstrap consistente (é um máximo): o intervalo é o dos quantis
+    exatos para jogadas independentes com a proporção observada.
+
+    O resultado depende só das entradas e de seed: as reamostragens são
+    divididas em shards de SHARD_RESAMPLES com SeedSequence próprias,
+    rodados em processos para históricos grandes.
+
+    Args:
+        results: Lista de resultados, ResultsView ou colunas de simulate_batch
+        stats: Acumulador de results, se já existir (evita uma passada)
+        window_sizes: Janelas das frações de tendência
+        min_length: Comprimento mínimo das sequências contadas
+        resamples: Reamostragens do bootstrap
+        confidence: Nível de confiança
+        seed: Semente para reprodutibilidade
+        workers: Processos (None usa todos os núcleos, 1 roda no processo atual)
+
+    Returns:
+        Dict com 'estatisticas' (bootstrap) e 'analitico' (Wilson/normal)
+        por chave de calculate_statistics, 'tendencias' por janela e
+        'sequencias' ('total', 'media_comprimento', 'pelo_menos' e
+        'maior' por rótulo), cada intervalo com 'estimativa', 'inferior',
+        'superior' e 'metodo'; vazio sem jogadas
+    """
+    if resamples <= 0:
+        raise ValueError("Quantidade de reamostragens deve ser positiva")
+    if min_length <= 0:
+        raise ValueError("Comprimento mínimo deve ser positivo")
+    janelas = np.unique(np.asarray(window_sizes, dtype=np.int64))
+    if len(janelas) and janelas[0] <= 0:
+        raise ValueError("Tamanhos de janela devem ser positivos")
+    alfa = (1 - confidence) / 2
+    _z(confidence)
+
+    view = as_view(results)
+    n = len(view)
+    if not n:
+        return {}
+    if stats is None:
+        stats = RunningStatistics.from_results(view.dado1, view.dado2)
+    par = view.par
+
+    # Séries 0/1 cujas médias dão as métricas dependentes da ordem
+    series = []
+    acumulado = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(par, out=acumulado[1:])
+    janelas = janelas[janelas <= n]
+    for janela in janelas.tolist():
+        pares = acumulado[janela:] - acumulado[:-janela]
+        x = (2 * pares > janela).astype(np.uint8)
+        series.append(('janela', janela, x, _block_size(len(x), janela)))
+    if n > 1:
+        x = (par[1:] != par[:-1]).astype(np.uint8)
+        series.append(('trocas', None, x, _block_size(len(x), 1)))
+    inicios, comprimentos, valores = run_lengths(par)
+    for valor in (TREND_PAR, TREND_IMPAR):
+        # 1 na jogada em que uma sequência do valor atinge min_length
+        x = np.zeros(n, dtype=np.uint8)
+        longas = (valores == valor) & (comprimentos >= min_length)
+        x[inicios[longas] + min_length - 1] = 1
+        series.append(('pelo_menos', valor, x, _block_size(n, min_length)))
+
+    blocos = [block_sum_histogram(x, bloco) for _, _, x, bloco in series]
+    celulas, somas = _run_shards(resamples, stats.joint_counts.ravel().astype(np.int64), blocos, seed,
+                                 workers, parallel=n >= PARALLEL_MIN_ROUNDS)
+
+    def percentis(amostras):
+        return np.quantile(amostras, [alfa, 1 - alfa])
+
+    # Estatísticas por reamostragem a partir das células
+    pares_b = celulas @ _CELL_PAR
+    soma_b = celulas @ _CELL_TOTALS
+    media_b = soma_b / n
+    variancia_b = np.maximum(celulas @ (_CELL_TOTALS ** 2) / n - media_b * media_b, 0.0)
+    pontuais = stats.to_dict()
+    amostras_stats = {
+        'perc_pares': pares_b / n * 100,
+        'perc_impares': (n - pares_b) / n * 100,
+        'media_total': media_b,
+        'variancia_total': variancia_b
+    }
+    estatisticas = {chave: _interval(pontuais[chave], *percentis(amostras), 'bootstrap')
+                    for chave, amostras in amostras_stats.items()}
+
+    tendencias = {}
+    sequencias = {'pelo_menos': {'comprimento': min_length}}
+    for (tipo, chave, x, bloco), (_, _, n_blocos), amostras in zip(series, blocos, somas):
+        # A reamostragem tem n_blocos * bloco posições; escala para o tamanho da série
+        media = amostras / (n_blocos * bloco)
+        if tipo == 'janela':
+            tendencias[chave] = _interval(x.mean(), *percentis(media), 'bloco', bloco=bloco)
+        elif tipo == 'trocas':
+            total = 1 + media * (n - 1)
+            observado = 1 + int(x.sum())
+            sequencias['total'] = _interval(observado, *percentis(total), 'bloco', bloco=bloco)
+            inferior, superior = percentis(n / total)
+            sequencias['media_comprimento'] = _interval(n / observado, inferior, superior, 'bloco', bloco=bloco)
+        else:
+            sequencias['pelo_menos'][TREND_LABELS[chave]] = _interval(
+                int(x.sum()), *percentis(media * n), 'bloco', bloco=bloco)
+    if n == 1:
+        sequencias['total'] = _interval(1, 1, 1, 'exato')
+        sequencias['media_comprimento'] = _interval(1, 1, 1, 'exato')
+
+    p_par = stats.pares / n
+    sequencias['maior'] = {}
+    for valor, p in ((TREND_PAR, p_par), (TREND_IMPAR, 1 - p_par)):
+        longas = comprimentos[valores == valor]
+        observado = int(longas.max()) if len(longas) else 0
+        sequencias['maior'][TREND_LABELS[valor]] = _longest_interval(observado, n, p, confidence)
+
+    return {
+        'confianca': confidence,
+        'reamostragens': resamples,
+        'estatisticas': estatisticas,
+        'analitico': analytic_intervals(stats, confidence),
+        'tendencias': tendencias,
+        'sequencias': sequencias
+    }
@@ -0,0 +1,124 @@
+"""
+Módulo de cache - Memoização versionada dos resultados de análise
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+# Limite padrão de memória das entradas (estimada pelos arrays guardados)
+CACHE_MAX_BYTES = 256 << 20
+
+# Limite padrão de entradas, para resultados pequenos não acumularem sem fim
+CACHE_MAX_ENTRIES = 256
+
+def estimate_size(value: Any) -> int:
+    """Memória aproximada de um resultado: arrays pelo nbytes, contêineres recursivamente"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+def freeze(value: Any) -> Any:
+    """Marca como somente leitura os arrays de um resultado compartilhado pelo cache"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze(item)
+    return value
+
+class AnalysisCache:
+    """
+    Cache LRU de resultados com limite de memória
+
+    Cada entrada guarda a versão dos dados de que saiu (para o histórico,
+    a quantidade de jogadas), então quem consulta decide entre usar o
+    valor, estendê-lo com as jogadas novas ou recalcular. As entradas
+    menos usadas saem quando o total passa de max_bytes ou max_entries;
+    um valor maior que max_bytes nem chega a entrar.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        # Jobs da interface consultam de outras threads
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, Tuple[int, Any, int]]' = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Hashable) -> Optional[Tuple[int, Any]]:
+        """(versão, valor) da entrada, marcada como recém-usada, ou None"""
+        with self._lock:
+            entrada = self._entries.get(key)
+            if entrada is None:
+                return None
+            self._entries.move_to_end(key)
+            return entrada[0], entrada[1]
+
+    def store(self, key: Hashable, version: int, value: Any):
+        """Guarda o valor da versão dada, substituindo a entrada anterior da chave"""
+        tamanho = estimate_size(value)
+        with self._lock:
+            self._remove(key)
+            if tamanho > self.max_bytes:
+                return
+            self._entries[key] = (version, value, tamanho)
+            self.nbytes += tamanho
+            while self.nbytes > self.max_bytes or len(self._entries) > self.max_entries:
+                antiga = next(iter(self._entries))
+                self._remove(antiga)
+                self.evictions += 1
+
+    def record(self, hit: bool = False, extended: bool = False):
+        """Contabiliza o desfecho de uma consulta"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            elif extended:
+                self.extensions += 1
+            else:
+                self.misses += 1
+
+    def _remove(self, key: Hashable):
+        entrada = self._entries.pop(key, None)
+        if entrada is not None:
+            self.nbytes -= entrada[2]
+
+    def clear(self):
+        """Descarta todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def info(self) -> Dict[str, int]:
+        """Contadores de uso e ocupação"""
+        with self._lock:
+            return {
+                'entradas': len(self._entries),
+                'bytes': self.nbytes,
+                'acertos': self.hits,
+                'extensoes': self.extensions,
+                'falhas': self.misses,
+                'descartes': self.evictions
+            }
+
+    def __repr__(self) -> str:
+        return f"AnalysisCache({len(self._entries)} entradas, {self.nbytes} bytes)"
@@ -0,0 +1,181 @@
+"""
+Módulo de gráficos - Painel persistente atualizado no lugar
+"""
+from typing import Dict
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from store import as_view
+
+# Pontos máximos da linha acumulada (da ordem da largura do gráfico em pixels)
+MAX_LINE_POINTS = 2000
+
+# Até esta quantidade de pontos a linha acumulada ainda mostra marcadores
+MAX_MARKER_POINTS = 50
+
+TOTALS = np.arange(2, 13)
+FACES = np.arange(1, 7)
+
+def chart_data(results, max_points: int = MAX_LINE_POINTS) -> Dict[str, np.ndarray]:
+    """
+    Calcula os dados dos quatro gráficos em O(n), sem listas Python
+
+    Args:
+        results: Lista de resultados, ResultsView ou colunas de simulate_batch
+        max_points: Limite de pontos da linha acumulada
+
+    Returns:
+        Dict com 'hist_totais' (totais 2..12), 'pares', 'impares',
+        'acumulado_x'/'acumulado_y' (pares acumulados, já reduzidos)
+        e 'hist_dado1'/'hist_dado2' (faces 1..6)
+    """
+    view = as_view(results)
+    par = view.par
+    x, y = cumulative_downsample(par, max_points)
+    pares = int(y[-1]) if len(y) else 0
+    return {
+        'hist_totais': np.bincount(view.total, minlength=13)[2:13],
+        'pares': pares,
+        'impares': len(par) - pares,
+        'acumulado_x': x,
+        'acumulado_y': y,
+        'hist_dado1': np.bincount(view.dado1, minlength=7)[1:7],
+        'hist_dado2': np.bincount(view.dado2, minlength=7)[1:7]
+    }
+
+def extend_chart_data(data: Dict[str, np.ndarray], results, previous: int,
+                      max_points: int = MAX_LINE_POINTS) -> Dict[str, np.ndarray]:
+    """
+    Dados de chart_data(results) a partir dos de results[:previous]
+
+    Os histogramas só somam as jogadas novas; a linha acumulada é
+    reamostrada, já que os blocos da redução mudam com o tamanho.
+    """
+    view = as_view(results)
+    novas = view[previous:]
+    x, y = cumulative_downsample(view.par, max_points)
+    pares = int(y[-1]) if len(y) else 0
+    return {
+        'hist_totais': data['hist_totais'] + np.bincount(novas.total, minlength=13)[2:13],
+        'pares': pares,
+        'impares': len(view) - pares,
+        'acumulado_x': x,
+        'acumulado_y': y,
+        'hist_dado1': data['hist_dado1'] + np.bincount(novas.dado1, minlength=7)[1:7],
+        'hist_dado2': data['hist_dado2'] + np.bincount(novas.dado2, minlength=7)[1:7]
+    }
+
+def cumulative_downsample(mask: np.ndarray, max_points: int = MAX_LINE_POINTS):
+    """
+    Soma acumulada de uma máscara booleana reduzida a no máximo max_points
+
+    Como a soma acumulada é monótona, o mínimo e o máximo de cada bloco são
+    os valores nas bordas do bloco: amostrar as bordas equivale à redução
+    min-max e dispensa materializar a série completa.
+
+    Returns:
+        (x, y) com x = índice 0-based da jogada e y = acumulado até ela
+    """
+    n = len(mask)
+    if n <= max_points:
+        return np.arange(n), np.cumsum(mask, dtype=np.int64)
+
+    inicios = np.linspace(0, n, max_points, endpoint=False).astype(np.int64)
+    fins = np.append(inicios[1:], n) - 1
+    y = np.cumsum(np.add.reduceat(mask, inicios, dtype=np.int64))
+    return fins, y
+
+class ChartPanel:
+    """
+    Os quatro gráficos de análise sobre uma única Figure
+
+    Eixos e artistas são criados uma vez; update() só troca os dados,
+    então o custo de redesenho depende dos pixels e não das jogadas.
+    """
+
+    def __init__(self, figure: Figure = None):
+        self.figure = figure or Figure(figsize=(12, 8), facecolor='#0d0d0d')
+        fig = self.figure
+
+        # Gráfico 1: Distribuição de resultados
+        self.ax_totais = fig.add_subplot(221)
+        self.barras_totais = self.ax_totais.bar(TOTALS, np.zeros(len(TOTALS)), width=0.9, alpha=0.7,
+                                                color='#00ffea', edgecolor='white')
+        self._style(self.ax_totais, 'Distribuição dos Totais')
+        self.ax_totais.set_xticks(TOTALS)
+
+        # Gráfico 2: Proporção Par/Ímpar (redesenhado por inteiro, custo constante)
+        self.ax_pizza = fig.add_subplot(222)
+        self._draw_pie(0, 0)
+
+        # Gráfico 3: Tendência ao longo do tempo
+        self.ax_acumulado = fig.add_subplot(223)
+        self.linha_acumulado, = self.ax_acumulado.plot([], [], color='#00ff00', linewidth=2)
+        self._style(self.ax_acumulado, 'Tendência de Pares (Acumulado)')
+        self.ax_acumulado.grid(True, alpha=0.3)
+
+        # Gráfico 4: Frequência dos dados
+        self.ax_dados = fig.add_subplot(224)
+        zeros = np.zeros(len(FACES))
+        self.barras_dado1 = self.ax_dados.bar(FACES - 0.2, zeros, width=0.4, alpha=0.7,
+                                              color='#00ffea', label='Dado 1')
+        self.barras_dado2 = self.ax_dados.bar(FACES + 0.2, zeros, width=0.4, alpha=0.7,
+                                              color='#ffaa00', label='Dado 2')
+        self._style(self.ax_dados, 'Distribuição dos Dados')
+        self.ax_dados.set_xticks(FACES)
+        self.ax_dados.legend(facecolor='#1a1a1a', labelcolor='white')
+
+        fig.tight_layout(pad=3.0)
+
+    def update(self, results):
+        """Atualiza todos os gráficos com os resultados dados"""
+        self.update_data(chart_data(results))
+
+    def update_data(self, data: Dict[str, np.ndarray]):
+        """Atualiza todos os gráficos com dados já calculados por chart_data"""
+        self._set_heights(self.ax_totais, self.barras_totais, data['hist_totais'])
+        self._set_heights(self.ax_dados, self.barras_dado1, data['hist_dado1'],
+                          self.barras_dado2, data['hist_dado2'])
+
+        self._draw_pie(data['pares'], data['impares'])
+
+        x, y = data['acumulado_x'], data['acumulado_y']
+        self.linha_acumulado.set_data(x, y)
+        self.linha_acumulado.set_marker('o' if len(x) <= MAX_MARKER_POINTS else '')
+        self.ax_acumulado.relim()
+        self.ax_acumulado.autoscale_view()
+
+    def clear(self):
+        """Zera os gráficos mantendo os artistas"""
+        vazio = np.zeros(0, dtype=np.int64)
+        self.update_data({
+            'hist_totais': np.zeros(len(TOTALS)), 'pares': 0, 'impares': 0,
+            'acumulado_x': vazio, 'acumulado_y': vazio,
+            'hist_dado1': np.zeros(len(FACES)), 'hist_dado2': np.zeros(len(FACES))
+        })
+
+    def _draw_pie(self, pares: int, impares: int):
+        ax = self.ax_pizza
+        ax.clear()
+        if pares + impares:
+            ax.pie([pares, impares],
+                   labels=['PAR', 'ÍMPAR'],
+                   colors=['#00ff00', '#ff4444'],
+                   autopct='%1.1f%%',
+                   textprops={'color': 'white', 'fontweight': 'bold'})
+        ax.set_title('Proporção Par/Ímpar', color='#00ffea', fontweight='bold')
+
+    @staticmethod
+    def _set_heights(ax, *barras_e_alturas):
+        for barras, alturas in zip(barras_e_alturas[::2], barras_e_alturas[1::2]):
+            for barra, altura in zip(barras, alturas.tolist()):
+                barra.set_height(altura)
+        ax.relim()
+        ax.autoscale_view()
+
+    @staticmethod
+    def _style(ax, titulo: str):
+        ax.set_title(titulo, color='#00ffea', fontweight='bold')
+        ax.set_facecolor('#1a1a1a')
+        ax.tick_params(colors='#00ff00')
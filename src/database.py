@@ -0,0 +1,198 @@
+"""
+Módulo de banco de sessões - Persistência em SQLite com escrita em lote
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from running_stats import RunningStatistics
+from store import ResultsStore
+
+DEFAULT_DATABASE = os.path.join('sessions', 'bacbo.db')
+
+# Jogadas por linha da tabela rounds (cada linha guarda um bloco em BLOBs)
+ROUNDS_BLOCK = 1 << 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    seed INTEGER,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    total_jogadas INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    block INTEGER NOT NULL,
+    first_round INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    dado1 BLOB NOT NULL,
+    dado2 BLOB NOT NULL,
+    PRIMARY KEY (session_id, block)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS session_cells (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    cell INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (session_id, cell)
+) WITHOUT ROWID;
+"""
+
+class SessionDatabase:
+    """
+    Banco SQLite de sessões de análise
+
+    As jogadas ficam em blocos de até ROUNDS_BLOCK por linha de 'rounds'
+    (colunas uint8 em BLOB), e as 36 contagens (dado1, dado2) de cada
+    sessão ficam em 'session_cells', atualizadas na mesma transação. Assim
+    as estatísticas de uma sessão saem de 36 linhas, sem ler as jogadas.
+    append() só acumula em memória; a escrita acontece em lote a cada
+    batch_size jogadas ou em flush().
+    """
+
+    def __init__(self, path: str = DEFAULT_DATABASE, batch_size: int = ROUNDS_BLOCK):
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        # Jobs da interface escrevem de outras threads; o lock serializa o acesso
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._pending: Dict[int, ResultsStore] = {}
+
+    def create_session(self, name: Optional[str] = None, seed: Optional[int] = None) -> int:
+        """Cria uma sessão vazia e retorna o ID"""
+        agora = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO sessions (name, seed, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (name, seed, agora, agora))
+        return cursor.lastrowid
+
+    def set_seed(self, session_id: int, seed: Optional[int]):
+        """Registra a semente da sessão"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE sessions SET seed = ? WHERE id = ?", (seed, session_id))
+
+    def list_sessions(self) -> List[Dict]:
+        """Sessões gravadas, da mais recente para a mais antiga (inclui jogadas pendentes)"""
+        with self._lock:
+            linhas = self._conn.execute(
+                "SELECT id, name, seed, created_at, updated_at, total_jogadas "
+                "FROM sessions ORDER BY updated_at DESC, id DESC").fetchall()
+            pendentes = {sid: len(p) for sid, p in self._pending.items()}
+        colunas = ('id', 'name', 'seed', 'created_at', 'updated_at', 'total_jogadas')
+        sessoes = [dict(zip(colunas, linha)) for linha in linhas]
+        for sessao in sessoes:
+            sessao['total_jogadas'] += pendentes.get(sessao['id'], 0)
+        return sessoes
+
+    def append(self, session_id: int, dado1, dado2):
+        """Enfileira jogadas da sessão; grava quando o lote enche"""
+        dado1 = np.atleast_1d(np.asarray(dado1, dtype=np.uint8))
+        dado2 = np.atleast_1d(np.asarray(dado2, dtype=np.uint8))
+        with self._lock:
+            pendente = self._pending.get(session_id)
+            if pendente is None:
+                pendente = self._pending[session_id] = ResultsStore()
+            pendente.extend(dado1, dado2)
+            if len(pendente) >= self.batch_size:
+                self._flush_session(session_id)
+
+    def flush(self):
+        """Grava todas as jogadas pendentes"""
+        with self._lock:
+            for session_id in list(self._pending):
+                self._flush_session(session_id)
+
+    def _flush_session(self, session_id: int):
+        """Grava as pendências de uma sessão numa única transação (chamar com o lock)"""
+        pendente = self._pending.pop(session_id, None)
+        if pendente is None or not len(pendente):
+            return
+        with self._conn:
+            bloco, inicio = self._conn.execute(
+                "SELECT COALESCE(MAX(block) + 1, 0), COALESCE(MAX(first_round + n), 0) "
+                "FROM rounds WHERE session_id = ?", (session_id,)).fetchone()
+            linhas = []
+            for parte in pendente.iter_chunks(ROUNDS_BLOCK):
+                linhas.append((session_id, bloco, inicio, len(parte),
+                               parte.dado1.tobytes(), parte.dado2.tobytes()))
+                bloco += 1
+                inicio += len(parte)
+            self._conn.executemany(
+                "INSERT INTO rounds (session_id, block, first_round, n, dado1, dado2) "
+                "VALUES (?, ?, ?, ?, ?, ?)", linhas)
+
+            contagens = RunningStatistics.from_results(pendente.dado1, pendente.dado2).joint_counts.ravel()
+            self._conn.executemany(
+                "INSERT INTO session_cells (session_id, cell, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (session_id, cell) DO UPDATE SET count = count + excluded.count",
+                [(session_id, celula, c) for celula, c in enumerate(contagens.tolist()) if c])
+            self._conn.execute(
+                "UPDATE sessions SET total_jogadas = total_jogadas + ?, updated_at = ? WHERE id = ?",
+                (len(pendente), datetime.now().isoformat(timespec='seconds'), session_id))
+
+    def load_statistics(self, session_id: int) -> RunningStatistics:
+        """Acumulador da sessão a partir das contagens agregadas (sem ler as jogadas)"""
+        with self._lock:
+            self._flush_session(session_id)
+            linhas = self._conn.execute(
+                "SELECT cell, count FROM session_cells WHERE session_id = ?", (session_id,)).fetchall()
+        contagens = np.zeros(36, dtype=np.int64)
+        for celula, count in linhas:
+            contagens[celula] = count
+        return RunningStatistics.from_joint_counts(contagens)
+
+    def load_history(self, session_id: int) -> ResultsStore:
+        """Lê as jogadas da sessão para um ResultsStore"""
+        with self._lock:
+            self._flush_session(session_id)
+            total = self._session_row(session_id)['total_jogadas']
+            historico = ResultsStore(capacity=max(total, 1))
+            for dado1, dado2 in self._conn.execute(
+                    "SELECT dado1, dado2 FROM rounds WHERE session_id = ? ORDER BY block", (session_id,)):
+                historico.extend(np.frombuffer(dado1, dtype=np.uint8), np.frombuffer(dado2, dtype=np.uint8))
+        return historico
+
+    def get_session(self, session_id: int) -> Dict:
+        """Dados da sessão (levanta ValueError se não existir)"""
+        with self._lock:
+            self._flush_session(session_id)
+            return self._session_row(session_id)
+
+    def _session_row(self, session_id: int) -> Dict:
+        linha = self._conn.execute(
+            "SELECT id, name, seed, created_at, updated_at, total_jogadas FROM sessions WHERE id = ?",
+            (session_id,)).fetchone()
+        if linha is None:
+            raise ValueError(f"Sessão não encontrada: {session_id}")
+        return dict(zip(('id', 'name', 'seed', 'created_at', 'updated_at', 'total_jogadas'), linha))
+
+    def delete_session(self, session_id: int):
+        """Remove a sessão, suas jogadas e agregados"""
+        with self._lock, self._conn:
+            self._pending.pop(session_id, None)
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def close(self):
+        """Grava as pendências e fecha o banco"""
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __enter__(self) -> 'SessionDatabase':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
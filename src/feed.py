@@ -0,0 +1,408 @@
+"""
+Módulo de feed ao vivo - Ingestão assíncrona de jogadas com backpressure
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from analyzer import TREND_LABELS
+from importer import create_parser
+from profiling import span
+
+# Jogadas por micro-lote (alvo: um bloco lido pode passar um pouco disso)
+FEED_BATCH = 4096
+
+# Espera máxima por mais linhas antes de fechar um micro-lote incompleto
+FEED_INTERVAL = 0.05
+
+# Blocos entre a leitura e a análise; cheia, a leitura para e a fonte espera
+FEED_QUEUE = 64
+
+# Bytes por leitura da fonte
+FEED_READ = 1 << 16
+
+# Intervalo entre verificações de um arquivo seguido que não cresceu
+TAIL_POLL = 0.1
+
+# Intervalo mínimo entre resumos entregues a on_update (no máximo 4 por segundo)
+UPDATE_INTERVAL = 0.25
+
+# Janela da tendência mostrada no resumo ao vivo
+SUMMARY_WINDOW = 20
+
+# Marca na fila de que o arquivo seguido recomeçou (truncado ou trocado)
+_RESTART = object()
+
+def parse_source(source: str) -> Tuple[str, Any]:
+    """
+    Interpreta a fonte do feed
+
+    Returns:
+        ('stdin', None) para '-', ('tcp', (host, porta)) para tcp://host:porta,
+        ('unix', caminho) para unix://caminho ou ('arquivo', caminho)
+    """
+    if source == '-':
+        return 'stdin', None
+    if source.startswith('tcp://'):
+        host, _, porta = source[len('tcp://'):].rpartition(':')
+        if not host or not porta.isdigit():
+            raise ValueError(f"Fonte TCP inválida (use tcp://host:porta): {source}")
+        return 'tcp', (host, int(porta))
+    if source.startswith('unix://'):
+        if not hasattr(asyncio, 'open_unix_connection'):
+            raise ValueError("Sockets Unix não são suportados neste sistema")
+        return 'unix', source[len('unix://'):]
+    return 'arquivo', source
+
+def live_summary(analyzer, window_size: int = SUMMARY_WINDOW) -> Dict[str, Any]:
+    """
+    Resumo incremental do histórico para exibição ao vivo
+
+    Estatísticas vêm do acumulador, sequências do índice incremental (só
+    as jogadas novas são processadas) e a tendência só olha a última
+    janela, então o custo não cresce com o histórico.
+
+    Deve ser chamado pela thread que alimenta o histórico, entre dois
+    lotes: 'historico' é uma view fixa das jogadas já adicionadas, coerente
+    com 'estatisticas', que outras threads podem ler enquanto o feed segue.
+    """
+    historico = analyzer.get_last_results()
+    n = len(historico)
+    tendencia = None
+    if n >= window_size:
+        pares = int(np.count_nonzero(historico[-window_size:].par))
+        tendencia = {
+            'janela': window_size,
+            'pares': pares,
+            'impares': window_size - pares,
+            'tendencia': TREND_LABELS[int(pares > window_size - pares)]
+        }
+    return {
+        'jogadas': n,
+        'historico': historico,
+        'estatisticas': analyzer.stats.to_dict(),
+        'sequencias': analyzer.streak_summary(top=1),
+        'tendencia': tendencia
+    }
+
+class LiveFeed:
+    """
+    Lê jogadas de uma fonte local e as adiciona ao analisador em micro-lotes
+
+    Uma tarefa lê blocos de linhas completas para uma fila limitada e
+    outra os junta em micro-lotes de até batch_size jogadas (ou o que
+    chegou em batch_interval), decodificados de forma vetorizada pelos
+    parsers da importação. Com a fila cheia a leitura espera: num socket
+    o buffer do sistema enche e o remetente é freado; num arquivo a
+    leitura só continua depois. Fontes: arquivo seguido como tail -f (lido
+    desde o início), stdin, tcp://host:porta ou unix://caminho.
+    """
+
+    def __init__(self, analyzer, source: str, format_type: str = 'auto',
+                 batch_size: int = FEED_BATCH, batch_interval: float = FEED_INTERVAL,
+                 queue_size: int = FEED_QUEUE, limit: Optional[int] = None,
+                 skip_invalid: bool = True, on_update: Callable[[Dict[str, Any]], None] = None,
+                 update_interval: float = UPDATE_INTERVAL, window_size: int = SUMMARY_WINDOW):
+        """
+        Args:
+            analyzer: BacBoAnalyzer que recebe as jogadas
+            source: Fonte (ver parse_source)
+            format_type: 'csv', 'ndjson' ou 'auto' (pela primeira linha)
+            batch_size: Jogadas por micro-lote
+            batch_interval: Espera máxima para completar um micro-lote
+            queue_size: Blocos na fila antes de a leitura esperar
+            limit: Para depois de tantas jogadas (None segue até o fim da fonte)
+            skip_invalid: Ignora linhas inválidas em vez de parar o feed
+            on_update: Recebe live_summary() no máximo a cada update_interval
+                e ao terminar, na thread do feed
+            window_size: Janela da tendência do resumo
+        """
+        if format_type not in ('auto', 'csv', 'ndjson'):
+            raise ValueError(f"Formato não suportado: {format_type}")
+        self.analyzer = analyzer
+        self.source = source
+        self.kind, self.target = parse_source(source)
+        self.format_type = format_type
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.queue_size = queue_size
+        self.limit = limit
+        self.skip_invalid = skip_invalid
+        self.on_update = on_update
+        self.update_interval = update_interval
+        self.window_size = window_size
+
+        self.rows = 0
+        self.skipped = 0
+        self.batches = 0
+        # Vezes em que a leitura esperou por espaço na fila
+        self.waits = 0
+        self._parser = None
+        self._line = 1
+        # Linha incompleta do fim da última leitura
+        self._partial = b''
+        self._last_update = 0.0
+        self._loop = None
+        self._queue = None
+        self._stopping = None
+        self._stop_requested = False
+        self.thread = None
+
+    async def run(self) -> int:
+        """
+        Lê a fonte até o fim, o limite ou stop()
+
+        Erros da fonte (conexão recusada, arquivo inexistente) e linhas
+        inválidas sem skip_invalid são levantados depois de as jogadas já
+        lidas entrarem no histórico.
+
+        Returns:
+            Quantidade de jogadas adicionadas
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.queue_size)
+        self._stopping = asyncio.Event()
+        if self._stop_requested:
+            return self.rows
+        produtor = asyncio.ensure_future(self._produce())
+        consumidor = asyncio.ensure_future(self._consume())
+        parada = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait({consumidor, parada}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for tarefa in (produtor, consumidor, parada):
+                tarefa.cancel()
+            await asyncio.gather(produtor, consumidor, parada, return_exceptions=True)
+            self._notify(force=True)
+
+        for tarefa in (consumidor, produtor):
+            if not tarefa.cancelled() and tarefa.exception() is not None:
+                raise tarefa.exception()
+        return self.rows
+
+    def stop(self):
+        """Interrompe o feed (seguro em qualquer thread); o que estiver na fila é descartado"""
+        self._stop_requested = True
+        if self._loop is not None and self._stopping is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stopping.set)
+            except RuntimeError:
+                # O loop já terminou
+                pass
+
+    def start_thread(self, on_done: Callable[[Optional[BaseException]], None] = None) -> threading.Thread:
+        """
+        Roda o feed num loop asyncio em thread própria
+
+        Args:
+            on_done: Chamado na thread do feed com a exceção que o encerrou (ou None)
+        """
+        def executar():
+            erro = None
+            try:
+                asyncio.run(self.run())
+            except Exception as e:
+                erro = e
+            if on_done is not None:
+                on_done(erro)
+
+        self.thread = threading.Thread(target=executar, name=f"feed {self.source}", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    async def _produce(self):
+        """Lê a fonte e enfileira blocos de linhas completas; None marca o fim"""
+        try:
+            if self.kind == 'arquivo':
+                await self._read_chunks(self._tail_reader())
+            elif self.kind == 'stdin':
+                await self._read_chunks(await self._stdin_reader())
+            else:
+                if self.kind == 'tcp':
+                    reader, writer = await asyncio.open_connection(*self.target)
+                else:
+                    reader, writer = await asyncio.open_unix_connection(self.target)
+                try:
+                    await self._read_chunks(lambda: reader.read(FEED_READ))
+                finally:
+                    writer.close()
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            # O consumidor ainda processa o que já está na fila antes do erro subir
+            await self._queue.put(None)
+            raise
+        await self._queue.put(None)
+
+    async def _read_chunks(self, read):
+        self._partial = b''
+        while True:
+            dados = await read()
+            if not dados:
+                break
+            dados = self._partial + dados
+            corte = dados.rfind(b'\n') + 1
+            self._partial = dados[corte:]
+            if corte:
+                if self._queue.full():
+                    self.waits += 1
+                await self._queue.put(dados[:corte])
+        if self._partial.strip():
+            await self._queue.put(self._partial + b'\n')
+
+    async def _stdin_reader(self):
+        """Leitura assíncrona de stdin; arquivos redirecionados e sistemas sem pipes assíncronos usam uma thread"""
+        entrada = sys.stdin.buffer
+        reader = asyncio.StreamReader()
+        try:
+            await self._loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), entrada)
+        except (NotImplementedError, ValueError, OSError):
+            return lambda: self._loop.run_in_executor(None, entrada.read1, FEED_READ)
+        return lambda: reader.read(FEED_READ)
+
+    def _tail_reader(self):
+        """Leitura de um arquivo que continua crescendo; recomeça se for truncado ou trocado"""
+        estado = {'arquivo': open(self.target, 'rb')}
+
+        async def ler():
+            while True:
+                f = estado['arquivo']
+                dados = f.read(FEED_READ)
+                if dados:
+                    return dados
+                try:
+                    trocado = os.stat(self.target).st_ino != os.fstat(f.fileno()).st_ino
+                    truncado = os.path.getsize(self.target) < f.tell()
+                except OSError:
+                    trocado = truncado = False
+                if trocado:
+                    f.close()
+                    estado['arquivo'] = open(self.target, 'rb')
+                elif truncado:
+                    f.seek(0)
+                else:
+                    await asyncio.sleep(TAIL_POLL)
+                    continue
+                # A linha incompleta era do arquivo anterior, e o novo pode ter cabeçalho
+                self._partial = b''
+                await self._queue.put(_RESTART)
+
+        async def ler_e_fechar():
+            try:
+                return await ler()
+            except BaseException:
+                estado['arquivo'].close()
+                raise
+
+        return ler_e_fechar
+
+    async def _consume(self):
+        """Junta blocos da fila em micro-lotes e os adiciona ao analisador"""
+        while True:
+            bloco = await self._queue.get()
+            if bloco is None:
+                return
+            if bloco is _RESTART:
+                self._restart()
+                continue
+            partes = [bloco]
+            linhas = bloco.count(b'\n')
+            fim = reinicio = False
+            prazo = self._loop.time() + self.batch_interval
+            while linhas < self.batch_size:
+                try:
+                    bloco = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    restante = prazo - self._loop.time()
+                    if restante <= 0:
+                        break
+                    try:
+                        bloco = await asyncio.wait_for(self._queue.get(), restante)
+                    except asyncio.TimeoutError:
+                        break
+                if bloco is None:
+                    fim = True
+                    break
+                if bloco is _RESTART:
+                    reinicio = True
+                    break
+                partes.append(bloco)
+                linhas += bloco.count(b'\n')
+
+            if self._ingest(b''.join(partes)) or fim:
+                return
+            if reinicio:
+                self._restart()
+
+    def _restart(self):
+        """Volta a detectar o formato e a contar linhas do início do arquivo"""
+        self._parser = None
+        self._line = 1
+
+    def _ingest(self, bloco: bytes) -> bool:
+        """Decodifica e adiciona um micro-lote; retorna True ao atingir o limite"""
+        linha = self._line
+        self._line += bloco.count(b'\n')
+        if self._parser is None:
+            bloco, linha = self._create_parser(bloco, linha)
+            if not bloco:
+                return False
+
+        with span('feed.lote', bytes=len(bloco)):
+            dado1, dado2, ignoradas = self._parser.parse(bloco, linha, self.skip_invalid)
+            self.skipped += ignoradas
+            if self.limit is not None:
+                dado1, dado2 = dado1[:self.limit - self.rows], dado2[:self.limit - self.rows]
+            if len(dado1):
+                self.analyzer.extend_history(dado1, dado2)
+                self.rows += len(dado1)
+                self.batches += 1
+        self._notify()
+        return self.limit is not None and self.rows >= self.limit
+
+    def _create_parser(self, bloco: bytes, linha: int) -> Tuple[bytes, int]:
+        """Escolhe o parser pela primeira linha não vazia (CSV com ou sem cabeçalho, ou NDJSON)"""
+        conteudo = bloco.lstrip(b'\xef\xbb\xbf \t\r\n')
+        if not conteudo:
+            return b'', linha
+        linha += bloco[:len(bloco) - len(conteudo)].count(b'\n')
+        primeira = conteudo[:conteudo.find(b'\n')]
+        formato = self.format_type
+        if formato == 'auto':
+            formato = 'ndjson' if primeira.startswith(b'{') else 'csv'
+        colunas = None
+        if formato == 'csv' and primeira[:1].isdigit():
+            colunas = primeira.count(b',') + 1
+        self._parser = create_parser(formato, colunas)
+        return conteudo, linha
+
+    def _notify(self, force: bool = False):
+        """Entrega o resumo a on_update, no máximo a cada update_interval"""
+        if self.on_update is None:
+            return
+        agora = time.monotonic()
+        if not force and agora - self._last_update < self.update_interval:
+            return
+        self._last_update = agora
+        resumo = live_summary(self.analyzer, self.window_size)
+        resumo['feed'] = self.info()
+        self.on_update(resumo)
+
+    def info(self) -> Dict[str, Any]:
+        """Contadores do feed"""
+        return {
+            'fonte': self.source,
+            'jogadas': self.rows,
+            'ignoradas': self.skipped,
+            'lotes': self.batches,
+            'esperas': self.waits,
+            'fila': self._queue.qsize() if self._queue is not None else 0
+        }
+
+    def __repr__(self) -> str:
+        return f"LiveFeed({self.source!r}, {self.rows} jogadas)"
@@ -1,13 +1,39 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import random
+import os
+import sqlite3
 import threading
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk, messagebox, filedialog, simpledialog
 from analyzer import BacBoAnalyzer
-from utils import SoundManager, FileExporter
-import time
+from database import DEFAULT_DATABASE, SessionDatabase
+from profiling import PROFILER, span
+from jobs import JobCancelled, JobScheduler, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+from results_view import VirtualResultsView
+from store import as_view
+from running_stats import RunningStatistics
+from utils import AnimationHelper, AnimationScheduler, SoundManager, FileExporter, UIUpdateQueue
+
+# Jogadas simuladas por lote antes de atualizar a barra de progresso
+SIMULATION_CHUNK = 100_000
+
+# A partir daqui a simulação roda no pool de processos do montecarlo e guarda só
+# os agregados (o histórico por jogada passaria de 100 MB só nas colunas)
+PARALLEL_SIMULATION_MIN = 50_000_000
+
+# Frequência máxima de atualização da interface durante análises
+UI_FPS = 30
+
+# Threads do agendador e nomes dos jobs da aplicação
+JOB_WORKERS = 2
+ANALYSIS_JOB = 'análise'
+CHART_JOB = 'gráficos'
+EXPORT_JOB = 'exportação'
+IMPORT_JOB = 'importação'
+OPEN_SESSION_JOB = 'abrir sessão'
+FEED_JOB = 'feed ao vivo'
+
+# Fonte sugerida ao ligar o feed ao vivo
+FEED_SOURCE = 'tcp://127.0.0.1:9000'
 
 class BacBoAnalyzerApp:
     def __init__(self, root):
@@ -21,6 +47,33 @@ class BacBoAnalyzerApp:
         self.create_widgets()
         self.setup_bindings()
         
+        # Única via de atualização da interface a partir das threads de trabalho
+        self.ui_updates = UIUpdateQueue(self.root, {
+            'progress': self.update_progress,
+            'status': self.status_var.set,
+            'stats': self.show_partial_stats,
+            'jobs': self.update_jobs_label,
+            'feed': self.show_feed
+        }, fps=UI_FPS)
+        self.ui_updates.start()
+        
+        # Animações avançam num único tick do after, sem bloquear o loop do Tk
+        self.animations = AnimationScheduler.for_widget(self.root)
+        
+        # Análises, gráficos e exportações rodam como jobs canceláveis
+        self.jobs = JobScheduler(max_workers=JOB_WORKERS,
+                                 on_update=lambda job: self.ui_updates.post('jobs', job))
+        self._analysis_job = None
+        # Banco de sessões aberto na primeira análise: o histórico sobrevive ao fechamento
+        self.database = None
+        # get_database é chamado da thread do Tk e dos workers dos jobs
+        self._database_lock = threading.Lock()
+        self._database_closed = False
+        # Feed ao vivo em andamento (thread própria com loop asyncio)
+        self.feed = None
+        self.feed_source = FEED_SOURCE
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
     def setup_window(self):
         """Configura a janela principal"""
         self.root.title("VT BacBo Analyzer - Professional Edition")
@@ -127,12 +180,58 @@ class BacBoAnalyzerApp:
                                    style='Neon.TButton')
         self.btn_export.pack(side='left', padx=5)
         
+        self.btn_import = ttk.Button(button_frame,
+                                   text="📂 IMPORTAR",
+                                   command=self.import_data,
+                                   style='Neon.TButton')
+        self.btn_import.pack(side='left', padx=5)
+        
+        self.btn_sessions = ttk.Button(button_frame,
+                                     text="🗂️ SESSÕES",
+                                     command=self.show_sessions,
+                                     style='Neon.TButton')
+        self.btn_sessions.pack(side='left', padx=5)
+        
+        self.btn_feed = ttk.Button(button_frame,
+                                 text="📡 AO VIVO",
+                                 command=self.toggle_feed,
+                                 style='Neon.TButton')
+        self.btn_feed.pack(side='left', padx=5)
+        
         self.btn_clear = ttk.Button(button_frame,
                                   text="🗑️ LIMPAR",
                                   command=self.clear_results,
                                   style='Neon.TButton')
         self.btn_clear.pack(side='left', padx=5)
         
+        self.btn_cancel = ttk.Button(button_frame,
+                                   text="⛔ CANCELAR",
+                                   command=self.cancel_jobs,
+                                   style='Neon.TButton')
+        self.btn_cancel.pack(side='left', padx=5)
+        
+        self.btn_trace = ttk.Button(button_frame,
+                                  text="⏱ EXPORTAR TRACE",
+                                  command=self.export_trace,
+                                  style='Neon.TButton')
+        self.btn_trace.pack(side='left', padx=5)
+        
+        # Perfilamento desligado por padrão (spans viram no-op)
+        self.profile_var = tk.BooleanVar(value=PROFILER.enabled)
+        tk.Checkbutton(button_frame,
+                       text="PERFIL",
+                       variable=self.profile_var,
+                       command=self.toggle_profiling,
+                       font=('Consolas', 9, 'bold'),
+                       fg='#00ffea',
+                       bg='#0d0d0d',
+                       selectcolor='#1a1a1a',
+                       activebackground='#0d0d0d',
+                       activeforeground='#00ffea').pack(side='left', padx=5)
+        
+        self.jobs_var = tk.StringVar()
+        ttk.Label(button_frame, textvariable=self.jobs_var, style='Neon.TLabel').pack(side='left', padx=10)
+        
         # Barra de progresso
         self.progress = ttk.Progressbar(control_frame, 
                                       mode='determinate',
@@ -145,22 +244,9 @@ class BacBoAnalyzerApp:
         results_frame = ttk.Frame(self.root, style='Neon.TFrame')
         results_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
-        # Área de resultados com scroll
-        self.results_text = scrolledtext.ScrolledText(results_frame,
-                                                    bg='#1a1a1a',
-                                                    fg='#00ff00',
-                                                    insertbackground='#00ff00',
-                                                    selectbackground='#00ffea',
-                                                    font=('Consolas', 10),
-                                                    wrap=tk.WORD,
-                                                    height=15)
-        self.results_text.pack(fill='both', expand=True)
-        
-        # Configurar tags para formatação colorida
-        self.results_text.tag_configure('header', foreground='#00ffea', font=('Consolas', 11, 'bold'))
-        self.results_text.tag_configure('even', foreground='#00ff00')
-        self.results_text.tag_configure('odd', foreground='#ff4444')
-        self.results_text.tag_configure('stats', foreground='#ffaa00')
+        # Lista virtualizada: só as linhas visíveis são formatadas
+        self.results_view = VirtualResultsView(results_frame, style='Neon.TFrame')
+        self.results_view.pack(fill='both', expand=True)
         
     def create_charts_panel(self):
         """Cria o painel de gráficos"""
@@ -171,6 +257,10 @@ class BacBoAnalyzerApp:
         self.chart_container = ttk.Frame(self.charts_frame, style='Neon.TFrame')
         self.chart_container.pack(fill='both', expand=True)
         
+        # Criados na primeira análise e reaproveitados depois
+        self.chart_panel = None
+        self.chart_canvas = None
+        
     def create_status_bar(self):
         """Cria a barra de status"""
         self.status_var = tk.StringVar()
@@ -193,160 +283,437 @@ class BacBoAnalyzerApp:
         self.sound_manager.play_click()
         
     def analyze_games(self):
-        """Analisa as jogadas em thread separada"""
+        """Agenda a análise das jogadas no agendador de jobs"""
+        if self.feed_running():
+            return
         try:
             num_jogadas = int(self.entry_jogadas.get())
             if num_jogadas <= 0:
                 messagebox.showwarning("Entrada Inválida", "Digite um número positivo de jogadas.")
                 return
                 
-            # Desabilitar botão durante análise
-            self.btn_analyze.config(state='disabled')
-            self.progress.pack(fill='x', pady=5)
-            self.progress['maximum'] = num_jogadas
-            
-            # Executar em thread separada
-            thread = threading.Thread(target=self._analyze_thread, args=(num_jogadas,))
-            thread.daemon = True
-            thread.start()
+            # Análises alteram o histórico, então rodam uma atrás da outra
+            job = self._analyze_job if num_jogadas < PARALLEL_SIMULATION_MIN else self._parallel_simulation_job
+            self._analysis_job = self.jobs.submit(job, num_jogadas,
+                                                  name=ANALYSIS_JOB, priority=PRIORITY_NORMAL,
+                                                  after=[self._analysis_job])
             
         except ValueError:
             messagebox.showerror("Erro", "Digite um número válido de jogadas.")
             
-    def _analyze_thread(self, num_jogadas):
-        """Thread para análise das jogadas"""
+    def _analyze_job(self, job, num_jogadas):
+        """Job de análise das jogadas (roda fora da thread do Tk)"""
+        feitas = 0
         try:
+            self.persist_analyzer(self.analyzer)
+            self.ui_updates.call(self.start_progress, num_jogadas)
             self.sound_manager.play_analyze()
-            self.status_var.set("Analisando jogadas...")
+            self.ui_updates.post('status', "Analisando jogadas...")
             
-            # Gerar jogadas
-            results = []
-            for i in range(num_jogadas):
-                result = self.analyzer.simulate_game()
-                results.append(result)
-                
-                # Atualizar progresso
-                self.root.after(0, self.update_progress, i + 1)
-                time.sleep(0.01)  # Pequeno delay para animação
+            # Gerar jogadas em lotes vetorizados
+            parciais = RunningStatistics()
+            with span('gui.analise', jogadas=num_jogadas):
+                while feitas < num_jogadas:
+                    job.check_cancelled()
+                    lote = min(SIMULATION_CHUNK, num_jogadas - feitas)
+                    batch = self.analyzer.simulate_batch(lote)
+                    parciais.update(batch['dado1'], batch['dado2'])
+                    feitas += lote
+                    job.set_progress(feitas, num_jogadas)
+                    
+                    # Progresso e parciais são mesclados em uma atualização por frame
+                    self.ui_updates.post('progress', feitas)
+                    self.ui_updates.post('stats', parciais.to_dict())
                 
-            # Processar resultados
-            self.root.after(0, self.display_results, results)
-            self.root.after(0, self.display_charts, results)
-            
+        except JobCancelled:
+            self.ui_updates.post('status', f"Análise cancelada após {feitas} jogadas")
+            raise
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Erro", f"Erro na análise: {str(e)}"))
+            self.ui_updates.call(messagebox.showerror, "Erro", f"Erro na análise: {str(e)}")
+            raise
         finally:
-            self.root.after(0, self.analysis_complete)
+            # Mesmo cancelada, a análise mostra as jogadas já simuladas
+            if feitas:
+                results = self.analyzer.get_last_results(feitas)
+                self.ui_updates.call(self.display_results, results)
+                self.display_charts(results)
+            self.ui_updates.call(self.analysis_complete, job)
             
+    def _parallel_simulation_job(self, job, num_jogadas):
+        """Job de simulação grande em processos; mostra só os agregados, sem mudar o histórico"""
+        from montecarlo import run_simulation
+        
+        def progresso(feitas):
+            job.check_cancelled()
+            job.set_progress(feitas, num_jogadas)
+            self.ui_updates.post('progress', feitas)
+            
+        try:
+            self.ui_updates.call(self.start_progress, num_jogadas)
+            self.sound_manager.play_analyze()
+            self.ui_updates.post('status', f"Simulando {num_jogadas:,} jogadas em paralelo...")
+            with span('gui.simulacao_paralela', jogadas=num_jogadas):
+                stats = run_simulation(num_jogadas, progress=progresso)
+        except JobCancelled:
+            self.ui_updates.post('status', "Simulação paralela cancelada")
+            raise
+        except Exception as e:
+            self.ui_updates.call(messagebox.showerror, "Erro", f"Erro na simulação: {str(e)}")
+            raise
+        finally:
+            self.ui_updates.call(self.analysis_complete, job)
+        self.ui_updates.call(self.show_simulation_stats, stats.to_dict())
+        
+    def show_simulation_stats(self, stats):
+        """Mostra os agregados de uma simulação paralela (sem lista nem gráficos por jogada)"""
+        self.results_view.set_results(None, stats)
+        if self.chart_panel is not None:
+            self.chart_panel.clear()
+            self.chart_canvas.draw_idle()
+        self.status_var.set(f"{stats['total_jogadas']:,} jogadas simuladas em paralelo "
+                            f"(só estatísticas; o histórico não foi alterado)")
+        
+    def start_progress(self, maximum):
+        """Mostra a barra de progresso para uma nova análise"""
+        self.progress['maximum'] = maximum
+        self.progress['value'] = 0
+        self.progress.pack(fill='x', pady=5)
+        
     def update_progress(self, value):
         """Atualiza a barra de progresso"""
         self.progress['value'] = value
         
-    def analysis_complete(self):
+    def show_partial_stats(self, stats):
+        """Mostra as estatísticas parciais da análise em andamento"""
+        if stats:
+            self.status_var.set(f"Analisando... {stats['total_jogadas']} jogadas | "
+                                f"Pares {stats['perc_pares']:.1f}% | Média {stats['media_total']:.2f}")
+        
+    def analysis_complete(self, job):
         """Finaliza a análise"""
-        self.btn_analyze.config(state='normal')
-        self.progress.pack_forget()
-        self.status_var.set("Análise concluída!")
-        
-    def display_results(self, results):
-        """Exibe os resultados na área de texto"""
-        self.results_text.delete(1.0, tk.END)
-        
-        # Cabeçalho
-        self.results_text.insert(tk.END, "RESULTADOS DAS JOGADAS\n", 'header')
-        self.results_text.insert(tk.END, "="*50 + "\n", 'header')
-        
-        # Resultados individuais
-        for i, result in enumerate(results, 1):
-            tag = 'even' if i % 2 == 0 else 'odd'
-            line = f"Jogada {i:2d}: Dados ({result['dado1']}, {result['dado2']}) | "
-            line += f"Total: {result['total']:2d} | "
-            line += f"Resultado: {result['resultado']}\n"
-            self.results_text.insert(tk.END, line, tag)
+        if not any(j is not job for j in self.jobs.active(ANALYSIS_JOB)):
+            self.progress.pack_forget()
+        if not job.cancelled:
+            self.status_var.set("Análise concluída!")
+            self.show_profile()
             
-        # Estatísticas
-        stats = self.analyzer.calculate_statistics(results)
-        self.results_text.insert(tk.END, "\n" + "="*50 + "\n", 'header')
-        self.results_text.insert(tk.END, "ESTATÍSTICAS:\n", 'header')
-        self.results_text.insert(tk.END, f"Total de Jogadas: {stats['total_jogadas']}\n", 'stats')
-        self.results_text.insert(tk.END, f"Pares: {stats['pares']} ({stats['perc_pares']:.1f}%)\n", 'stats')
-        self.results_text.insert(tk.END, f"Ímpares: {stats['impares']} ({stats['perc_impares']:.1f}%)\n", 'stats')
-        self.results_text.insert(tk.END, f"Média dos Totais: {stats['media_total']:.2f}\n", 'stats')
+    def update_jobs_label(self, _job=None):
+        """Atualiza o contador de jobs ativos"""
+        ativos = self.jobs.active()
+        self.jobs_var.set(f"Jobs ativos: {len(ativos)}" if ativos else "")
+        
+    def cancel_jobs(self):
+        """Cancela todos os jobs pendentes e em execução"""
+        for job in self.jobs.active():
+            job.cancel()
+        self.status_var.set("Cancelando...")
+        
+    def display_results(self, results, keep_position=False, stats=None):
+        """Exibe os resultados na lista virtualizada (keep_position mantém rolagem e seleção)"""
+        with span('gui.resultados', jogadas=len(results)):
+            if stats is None:
+                stats = self.analyzer.calculate_statistics(results)
+            if keep_position:
+                self.results_view.update_results(as_view(results), stats)
+            else:
+                self.results_view.set_results(as_view(results), stats)
         
     def display_charts(self, results):
-        """Exibe os gráficos de análise"""
-        # Limpar gráficos anteriores
-        for widget in self.chart_container.winfo_children():
-            widget.destroy()
+        """Agenda o cálculo dos gráficos; o desenho volta para a thread do Tk"""
+        self.jobs.submit(self._chart_job, results, name=CHART_JOB, priority=PRIORITY_HIGH)
+        
+    def _chart_job(self, job, results):
+        """Job que calcula os dados dos gráficos fora da thread do Tk"""
+        from charts import MAX_LINE_POINTS, chart_data, extend_chart_data
+        with span('gui.graficos.dados', jogadas=len(results)):
+            # Redesenhar o mesmo histórico é uma consulta ao cache do analisador
+            data = self.analyzer.memoize('graficos', results, chart_data, params=(MAX_LINE_POINTS,),
+                                         extend=extend_chart_data)
+        job.check_cancelled()
+        self.ui_updates.call(self._draw_charts, data)
+        
+    def _draw_charts(self, data):
+        """Desenha os gráficos com dados já calculados"""
+        if self.chart_panel is None:
+            # matplotlib só é importado no primeiro gráfico, para a janela abrir antes
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from charts import ChartPanel
             
-        # Criar figura matplotlib
-        fig = Figure(figsize=(12, 8), facecolor='#0d0d0d')
-        
-        # Gráfico 1: Distribuição de resultados
-        ax1 = fig.add_subplot(221)
-        totals = [r['total'] for r in results]
-        ax1.hist(totals, bins=range(2, 13), alpha=0.7, color='#00ffea', edgecolor='white')
-        ax1.set_title('Distribuição dos Totais', color='#00ffea', fontweight='bold')
-        ax1.set_facecolor('#1a1a1a')
-        ax1.tick_params(colors='#00ff00')
-        
-        # Gráfico 2: Proporção Par/Ímpar
-        ax2 = fig.add_subplot(222)
-        pares = sum(1 for r in results if r['resultado'] == 'PAR')
-        impares = len(results) - pares
-        ax2.pie([pares, impares], 
-               labels=['PAR', 'ÍMPAR'], 
-               colors=['#00ff00', '#ff4444'],
-               autopct='%1.1f%%',
-               textprops={'color': 'white', 'fontweight': 'bold'})
-        ax2.set_title('Proporção Par/Ímpar', color='#00ffea', fontweight='bold')
-        
-        # Gráfico 3: Tendência ao longo do tempo
-        ax3 = fig.add_subplot(223)
-        acumulado_pares = [sum(1 for r in results[:i+1] if r['resultado'] == 'PAR') 
-                          for i in range(len(results))]
-        ax3.plot(acumulado_pares, color='#00ff00', linewidth=2, marker='o')
-        ax3.set_title('Tendência de Pares (Acumulado)', color='#00ffea', fontweight='bold')
-        ax3.set_facecolor('#1a1a1a')
-        ax3.tick_params(colors='#00ff00')
-        ax3.grid(True, alpha=0.3)
-        
-        # Gráfico 4: Frequência dos dados
-        ax4 = fig.add_subplot(224)
-        dados1 = [r['dado1'] for r in results]
-        dados2 = [r['dado2'] for r in results]
-        ax4.hist([dados1, dados2], bins=range(1, 8), alpha=0.7, 
-                label=['Dado 1', 'Dado 2'], color=['#00ffea', '#ffaa00'])
-        ax4.set_title('Distribuição dos Dados', color='#00ffea', fontweight='bold')
-        ax4.set_facecolor('#1a1a1a')
-        ax4.tick_params(colors='#00ff00')
-        ax4.legend(facecolor='#1a1a1a', labelcolor='white')
-        
-        fig.tight_layout(pad=3.0)
-        
-        # Embed no tkinter
-        canvas = FigureCanvasTkAgg(fig, self.chart_container)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+            self.chart_panel = ChartPanel()
+            self.chart_canvas = FigureCanvasTkAgg(self.chart_panel.figure, self.chart_container)
+            self.chart_canvas.get_tk_widget().pack(fill='both', expand=True)
+            
+        # Artistas existentes são atualizados no lugar
+        with span('gui.graficos.desenho'):
+            self.chart_panel.update_data(data)
+            if PROFILER.enabled:
+                # Desenho síncrono para o span medir a renderização de fato
+                self.chart_canvas.draw()
+            else:
+                self.chart_canvas.draw_idle()
+        self.show_profile()
         
     def export_data(self):
-        """Exporta os dados para arquivo"""
+        """Agenda a exportação atrás da análise em andamento, se houver"""
+        self.jobs.submit(self._export_job, name=EXPORT_JOB, priority=PRIORITY_LOW,
+                         after=[self._analysis_job])
+        self.status_var.set("Exportação agendada...")
+        
+    def _export_job(self, job):
+        """Job de exportação (roda fora da thread do Tk)"""
+        results = self.analyzer.get_last_results()
+        
+        def progresso(escritas):
+            job.check_cancelled()
+            job.set_progress(escritas, len(results))
+            
         try:
-            filename = self.file_exporter.export_to_file(self.analyzer.get_last_results())
-            if filename:
-                messagebox.showinfo("Sucesso", f"Dados exportados para: {filename}")
-                self.status_var.set(f"Dados exportados: {filename}")
+            filename = self.file_exporter.export_to_file(results, progress=progresso)
+        except JobCancelled:
+            self.ui_updates.post('status', "Exportação cancelada")
+            raise
         except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao exportar: {str(e)}")
+            self.ui_updates.call(messagebox.showerror, "Erro", f"Erro ao exportar: {str(e)}")
+            raise
+        self.ui_updates.post('status', f"Dados exportados: {filename}")
+        self.ui_updates.call(messagebox.showinfo, "Sucesso", f"Dados exportados para: {filename}")
+            
+    def import_data(self):
+        """Escolhe um CSV/NDJSON gravado e agenda a importação"""
+        if self.feed_running():
+            return
+        filename = filedialog.askopenfilename(
+            title="Importar jogadas",
+            filetypes=[("Resultados", "*.csv *.ndjson *.jsonl *.gz *.bz2 *.xz *.zst"),
+                       ("Todos os arquivos", "*.*")])
+        if not filename:
+            return
+        # Depois da análise em andamento, que ainda escreve no histórico atual
+        self._analysis_job = self.jobs.submit(self._import_job, filename, name=IMPORT_JOB,
+                                              priority=PRIORITY_NORMAL, after=[self._analysis_job])
+        self.status_var.set("Importação agendada...")
+        
+    def _import_job(self, job, filename):
+        """Job de importação (roda fora da thread do Tk)"""
+        def progresso(lidos, tamanho):
+            job.check_cancelled()
+            job.set_progress(lidos, tamanho)
+            self.ui_updates.post('progress', lidos)
+            
+        try:
+            self.ui_updates.call(self.start_progress, max(os.path.getsize(filename), 1))
+            self.ui_updates.post('status', f"Importando {os.path.basename(filename)}...")
+            # Importa num analisador novo e só troca no fim: tudo ou nada
+            analyzer = BacBoAnalyzer.from_file(filename, progress=progresso)
+        except JobCancelled:
+            self.ui_updates.post('status', "Importação cancelada")
+            raise
+        except Exception as e:
+            self.ui_updates.call(messagebox.showerror, "Erro", f"Erro ao importar: {str(e)}")
+            raise
+        finally:
+            self.ui_updates.call(self.progress.pack_forget)
+            
+        self.persist_analyzer(analyzer, name=os.path.basename(filename))
+        self.analyzer = analyzer
+        results = analyzer.get_last_results()
+        self.ui_updates.call(self.display_results, results)
+        self.display_charts(results)
+        self.ui_updates.post('status', f"{len(results)} jogadas importadas de {os.path.basename(filename)}")
+        
+    def get_database(self):
+        """Abre o banco de sessões na primeira vez; None se não for possível"""
+        with self._database_lock:
+            if self.database is None and not self._database_closed:
+                try:
+                    self.database = SessionDatabase(DEFAULT_DATABASE)
+                except (OSError, sqlite3.Error) as e:
+                    self.ui_updates.post('status', f"Sessões não serão salvas: {e}")
+            return self.database
+        
+    def persist_analyzer(self, analyzer, name=None):
+        """Liga o analisador a uma sessão do banco, se ainda não estiver"""
+        database = self.get_database()
+        if database is not None and analyzer.database is None:
+            analyzer.attach_database(database, name=name)
+            
+    def show_sessions(self):
+        """Lista as sessões gravadas para reabrir uma delas"""
+        if self.feed_running():
+            return
+        database = self.get_database()
+        if database is None:
+            messagebox.showwarning("Aviso", "Banco de sessões indisponível.")
+            return
+        sessoes = database.list_sessions()
+        
+        janela = tk.Toplevel(self.root)
+        janela.title("Sessões gravadas")
+        janela.configure(bg='#0d0d0d')
+        lista = tk.Listbox(janela, width=70, height=15, bg='#1a1a1a', fg='#00ff00',
+                           selectbackground='#00ffea', font=('Consolas', 10))
+        lista.pack(fill='both', expand=True, padx=10, pady=10)
+        for sessao in sessoes:
+            nome = sessao['name'] or f"Sessão {sessao['id']}"
+            lista.insert(tk.END, f"#{sessao['id']:<4} {nome[:28]:28} {sessao['total_jogadas']:>12,} jogadas  "
+                                 f"{sessao['updated_at']}")
+            
+        def abrir():
+            selecao = lista.curselection()
+            if not selecao:
+                return
+            session_id = sessoes[selecao[0]]['id']
+            janela.destroy()
+            self._analysis_job = self.jobs.submit(self._open_session_job, session_id, name=OPEN_SESSION_JOB,
+                                                  priority=PRIORITY_NORMAL, after=[self._analysis_job])
+            
+        lista.bind('<Double-Button-1>', lambda e: abrir())
+        ttk.Button(janela, text="ABRIR", command=abrir, style='Neon.TButton').pack(pady=(0, 10))
+        AnimationHelper.fade_in(janela, duration=200)
+        
+    def _open_session_job(self, job, session_id):
+        """Job que reabre uma sessão do banco (roda fora da thread do Tk)"""
+        try:
+            analyzer = BacBoAnalyzer.open_database_session(self.database, session_id)
+        except Exception as e:
+            self.ui_updates.call(messagebox.showerror, "Erro", f"Erro ao abrir sessão: {str(e)}")
+            raise
+        job.check_cancelled()
+        self.analyzer = analyzer
+        results = analyzer.get_last_results()
+        self.ui_updates.call(self.display_results, results)
+        self.display_charts(results)
+        self.ui_updates.post('status', f"Sessão #{session_id} reaberta: {len(results)} jogadas")
+        
+    def feed_running(self):
+        """Avisa e retorna True se o feed ao vivo estiver escrevendo no histórico"""
+        if self.feed is None:
+            return False
+        messagebox.showwarning("Feed ao vivo", "Pare o feed ao vivo antes de trocar o histórico.")
+        return True
+        
+    def toggle_feed(self):
+        """Liga o feed ao vivo ou, se já estiver ligado, para"""
+        if self.feed is not None:
+            self.feed.stop()
+            self.status_var.set("Parando feed ao vivo...")
+            return
+            
+        source = simpledialog.askstring("Feed ao vivo",
+                                        "Fonte (arquivo seguido, tcp://host:porta ou unix://caminho):",
+                                        initialvalue=self.feed_source, parent=self.root)
+        if not source:
+            return
+        # asyncio só é importado quando o feed é usado, para a janela abrir antes
+        from feed import LiveFeed
+        try:
+            # Resumos chegam no máximo 4 vezes por segundo, seja qual for a taxa do feed
+            feed = LiveFeed(self.analyzer, source, on_update=lambda resumo: self.ui_updates.post('feed', resumo))
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        self.feed = feed
+        self.feed_source = source
+        self.btn_feed.config(text="⏹ PARAR AO VIVO")
+        self.status_var.set(f"Conectando a {source}...")
+        # Depois da análise em andamento, que ainda escreve no histórico atual
+        self._analysis_job = self.jobs.submit(self._start_feed_job, feed, name=FEED_JOB,
+                                              priority=PRIORITY_NORMAL, after=[self._analysis_job])
+        
+    def _start_feed_job(self, job, feed):
+        """Grava o histórico atual no banco (fora da thread do Tk) e inicia o feed"""
+        self.persist_analyzer(feed.analyzer, name=feed.source)
+        feed.start_thread(on_done=lambda erro: self.ui_updates.call(self.feed_done, feed, erro))
+        
+    def show_feed(self, resumo):
+        """Mostra o resumo do feed ao vivo e atualiza lista e gráficos"""
+        stats = resumo['estatisticas']
+        if not stats:
+            return
+        atual = resumo['sequencias']['atual']
+        texto = (f"📡 {resumo['jogadas']} jogadas | Pares {stats['perc_pares']:.1f}% | "
+                 f"Sequência {atual['valor']} x{atual['comprimento']}")
+        tendencia = resumo['tendencia']
+        if tendencia is not None:
+            texto += f" | Últimas {tendencia['janela']}: {tendencia['tendencia']}"
+        self.status_var.set(texto)
+        
+        # View e estatísticas foram tiradas juntas pela thread do feed, entre dois
+        # lotes; ler o histórico daqui pegaria um lote pela metade
+        results = resumo['historico']
+        # Sem voltar ao topo: o usuário pode rolar, selecionar e buscar durante o feed
+        self.display_results(results, keep_position=True, stats=stats)
+        # Um cálculo de gráficos por vez; o próximo resumo traz os dados novos
+        if not self.jobs.active(CHART_JOB):
+            self.display_charts(results)
+            
+    def feed_done(self, feed, erro):
+        """Finaliza o feed ao vivo (chamado pela thread do feed via fila da interface)"""
+        if feed is not self.feed:
+            return
+        self.feed = None
+        self.btn_feed.config(text="📡 AO VIVO")
+        self.status_var.set(f"Feed encerrado: {feed.rows} jogadas recebidas")
+        if erro is not None:
+            messagebox.showerror("Erro", f"Erro no feed ao vivo: {erro}")
+            
+    def toggle_profiling(self):
+        """Liga ou desliga os spans de perfilamento"""
+        if self.profile_var.get():
+            PROFILER.clear()
+            PROFILER.enable()
+            self.status_var.set("Perfilamento ligado")
+        else:
+            PROFILER.disable()
+            self.status_var.set("Perfilamento desligado")
+            
+    def show_profile(self):
+        """Mostra os tempos dos trechos mais demorados na barra de status"""
+        if PROFILER.enabled and PROFILER.spans:
+            self.status_var.set(f"⏱ {PROFILER.format_summary()}")
+            
+    def export_trace(self):
+        """Grava os spans coletados em JSON no formato Chrome trace"""
+        if not PROFILER.spans:
+            messagebox.showwarning("Aviso", "Nenhum span coletado. Ligue o PERFIL e rode uma análise.")
+            return
+        try:
+            self.file_exporter._ensure_export_dir()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = PROFILER.export_chrome_trace(
+                f"{self.file_exporter.export_dir}bacbo_trace_{timestamp}.json")
+            self.status_var.set(f"Trace exportado: {filename}")
+        except OSError as e:
+            messagebox.showerror("Erro", f"Erro ao exportar trace: {str(e)}")
             
     def clear_results(self):
         """Limpa todos os resultados"""
-        self.results_text.delete(1.0, tk.END)
-        for widget in self.chart_container.winfo_children():
-            widget.destroy()
+        self.results_view.clear()
+        if self.chart_panel is not None:
+            self.chart_panel.clear()
+            self.chart_canvas.draw_idle()
         self.status_var.set("Resultados limpos - Pronto para nova análise")
         self.sound_manager.play_click()
         
+    def on_close(self):
+        """Cancela os jobs e fecha a janela"""
+        if self.feed is not None:
+            self.feed.stop()
+            if self.feed.thread is not None:
+                # O banco só fecha depois do último lote do feed
+                self.feed.thread.join(timeout=2)
+        self.jobs.shutdown(cancel=True)
+        self.ui_updates.stop()
+        self.animations.stop()
+        with self._database_lock:
+            if self.database is not None:
+                # Grava as jogadas ainda pendentes no lote
+                self.database.close()
+                self.database = None
+            # Jobs que ainda terminam depois do fechamento não reabrem o banco
+            self._database_closed = True
+        self.root.destroy()
+        
     def __del__(self):
         """Destrutor - limpa recursos"""
         if hasattr(self, 'sound_manager'):
@@ -0,0 +1,525 @@
+"""
+Módulo de importação - Leitura vetorizada de resultados gravados em CSV/NDJSON
+"""
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import unicodedata
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils import FileExporter, load_zstandard
+
+# Bytes lidos por bloco: a memória da importação não depende do tamanho do arquivo,
+# e blocos de 1 MB mantêm as máscaras numpy no cache (8 MB era ~15% mais lento)
+IMPORT_CHUNK = 1 << 20
+
+# Mesmas extensões de compressão da exportação
+COMPRESSIONS = FileExporter.COMPRESSIONS
+
+# Assinaturas usadas quando a extensão não indica a compressão
+MAGIC_NUMBERS = {
+    b'\x1f\x8b': 'gzip',
+    b'BZh': 'bz2',
+    b'\xfd7zXZ\x00': 'xz',
+    b'\x28\xb5\x2f\xfd': 'zstd'
+}
+
+_NL = ord('\n')
+_CR = ord('\r')
+_COMMA = ord(',')
+_ZERO = ord('0')
+_QUOTE = ord('"')
+_COLON = ord(':')
+_VALUE_END = np.frombuffer(b', }\t\r', dtype=np.uint8)
+
+class FileImporter:
+    """
+    Importa jogadas de arquivos CSV ou NDJSON, um bloco de bytes por vez
+
+    Blocos bem formados são decodificados sem laço Python: linhas, vírgulas
+    e chaves são localizadas com numpy e dados/totais validados em massa.
+    O caso comum, em que todas as linhas têm o mesmo leiaute (as mesmas
+    colunas, ou as mesmas chaves na mesma ordem), sai de uma única varredura
+    do bloco. Blocos com qualquer irregularidade (aspas, espaços, valores
+    fora da faixa) caem no leitor linha a linha, que aponta a linha com
+    problema.
+    """
+
+    FORMATS = ('csv', 'ndjson')
+
+    def __init__(self, chunk_size: int = IMPORT_CHUNK, skip_invalid: bool = False):
+        """
+        Args:
+            chunk_size: Bytes lidos por bloco
+            skip_invalid: Ignora linhas inválidas em vez de levantar ValueError
+        """
+        self.chunk_size = chunk_size
+        self.skip_invalid = skip_invalid
+        self.rows = 0
+        self.skipped = 0
+
+    def import_file(self, analyzer, filename: str, format_type: str = 'auto',
+                    compression: str = None, progress: Callable[[int, int], None] = None) -> int:
+        """
+        Adiciona as jogadas do arquivo ao histórico do analisador
+
+        Se o arquivo tiver um erro no meio, os blocos anteriores já terão
+        entrado no histórico; importe num BacBoAnalyzer novo para tudo ou nada.
+
+        Returns:
+            Quantidade de jogadas importadas
+        """
+        for dado1, dado2 in self.iter_file(filename, format_type, compression, progress):
+            analyzer.extend_history(dado1, dado2)
+        return self.rows
+
+    def iter_file(self, filename: str, format_type: str = 'auto', compression: str = None,
+                  progress: Callable[[int, int], None] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Lê o arquivo em blocos
+
+        Args:
+            filename: Caminho do arquivo
+            format_type: 'csv', 'ndjson' ou 'auto' (pela extensão ou conteúdo)
+            compression: 'gzip', 'bz2', 'xz', 'zstd' ou None (pela extensão)
+            progress: Chamado com (bytes lidos do arquivo, tamanho do arquivo)
+                após cada bloco; uma exceção nele interrompe a leitura
+
+        Yields:
+            (dado1, dado2) em arrays uint8
+        """
+        self.rows = 0
+        self.skipped = 0
+        nome_base = filename
+        if compression is None:
+            compression = next((c for c, ext in COMPRESSIONS.items()
+                                if filename.lower().endswith(ext)), None)
+        if compression is not None:
+            if compression not in COMPRESSIONS:
+                raise ValueError(f"Compressão não suportada: {compression}")
+            if nome_base.lower().endswith(COMPRESSIONS[compression]):
+                nome_base = nome_base[:-len(COMPRESSIONS[compression])]
+
+        tamanho = os.path.getsize(filename)
+        with open(filename, 'rb') as bruto:
+            if compression is None:
+                assinatura = bruto.read(8)
+                bruto.seek(0)
+                compression = next((c for magic, c in MAGIC_NUMBERS.items()
+                                    if assinatura.startswith(magic)), None)
+            f = _open_input(bruto, compression)
+            try:
+                primeiro = f.read(self.chunk_size)
+                if format_type == 'auto':
+                    format_type = _detect_format(nome_base, primeiro)
+                if format_type not in self.FORMATS:
+                    raise ValueError(f"Formato não suportado: {format_type}")
+
+                parser = create_parser(format_type)
+                for bloco, linha in _iter_blocks(f, primeiro, self.chunk_size):
+                    dado1, dado2, ignoradas = parser.parse(bloco, linha, self.skip_invalid)
+                    self.skipped += ignoradas
+                    if len(dado1):
+                        self.rows += len(dado1)
+                        yield dado1, dado2
+                    if progress is not None:
+                        progress(bruto.tell(), tamanho)
+            finally:
+                if f is not bruto:
+                    f.close()
+
+def create_parser(format_type: str, columns: Optional[int] = None):
+    """
+    Parser de blocos de linhas completas, com parse(bloco, linha, skip_invalid)
+
+    Args:
+        format_type: 'csv' ou 'ndjson'
+        columns: Para CSV sem cabeçalho, quantidade de colunas (Dado1, Dado2
+            e, com 3, Total); None espera o cabeçalho na primeira linha
+
+    Returns:
+        Parser que devolve (dado1, dado2, linhas ignoradas) por bloco
+    """
+    if format_type == 'ndjson':
+        return _NdjsonParser()
+    if format_type != 'csv':
+        raise ValueError(f"Formato não suportado: {format_type}")
+    parser = _CsvParser()
+    if columns is not None:
+        if columns not in (2, 3):
+            raise ValueError("CSV sem cabeçalho deve ter 2 ou 3 colunas (Dado1, Dado2[, Total])")
+        parser.n_columns = columns
+        parser.columns = (0, 1, 2 if columns == 3 else None)
+    return parser
+
+def _open_input(bruto, compression: Optional[str]):
+    """Envolve o arquivo bruto com o descompressor (a posição do bruto mede o progresso)"""
+    if compression is None:
+        return bruto
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=bruto, mode='rb')
+    if compression == 'bz2':
+        return bz2.BZ2File(bruto, 'rb')
+    if compression == 'xz':
+        return lzma.LZMAFile(bruto, 'rb')
+    return load_zstandard().ZstdDecompressor().stream_reader(bruto)
+
+def _detect_format(nome: str, inicio: bytes) -> str:
+    """Formato pela extensão ou, sem extensão conhecida, pelo primeiro caractere"""
+    extensao = os.path.splitext(nome)[1].lower()
+    if extensao == '.csv':
+        return 'csv'
+    if extensao in ('.ndjson', '.jsonl', '.json'):
+        return 'ndjson'
+    return 'ndjson' if inicio.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'{') else 'csv'
+
+def _iter_blocks(f, primeiro: bytes, chunk_size: int) -> Iterator[Tuple[bytes, int]]:
+    """
+    Blocos terminados em quebra de linha
+
+    Yields:
+        (bloco, número da primeira linha do bloco, 1-based)
+    """
+    resto = b''
+    linha = 1
+    dados = primeiro
+    while dados:
+        dados = resto + dados
+        corte = dados.rfind(b'\n') + 1
+        if corte:
+            yield dados[:corte], linha
+            # Contagem em numpy: bytes.count é várias vezes mais lento em blocos grandes
+            linha += int(np.count_nonzero(np.frombuffer(dados, dtype=np.uint8, count=corte) == _NL))
+            resto = dados[corte:]
+        else:
+            resto = dados
+        dados = f.read(chunk_size)
+    if resto:
+        yield resto + b'\n', linha
+
+def _normalize(nome: str) -> str:
+    """Nome de coluna/chave sem acentos, espaços e maiúsculas"""
+    sem_acento = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode('ascii')
+    return sem_acento.strip().strip('"').lower().replace(' ', '').replace('_', '')
+
+def _line_bounds(buf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Início e fim (sem \\r\\n) das linhas não vazias de um bloco"""
+    quebras = np.flatnonzero(buf == _NL)
+    inicios = np.empty(len(quebras), dtype=np.int64)
+    inicios[:1] = 0
+    inicios[1:] = quebras[:-1] + 1
+    fins = quebras.copy()
+    com_cr = fins > inicios
+    com_cr[com_cr] = buf[fins[com_cr] - 1] == _CR
+    fins -= com_cr
+    cheias = fins > inicios
+    return inicios[cheias], fins[cheias]
+
+def _digits(buf: np.ndarray, inicios: np.ndarray, fins: np.ndarray, max_digits: int):
+    """
+    Inteiros de até max_digits dígitos nos campos [inicio, fim)
+
+    Returns:
+        (valores, máscara dos campos válidos)
+    """
+    tamanho = fins - inicios
+    ultimo = len(buf) - 1
+    # Em uint8, bytes abaixo de '0' dão a volta e também ficam acima de 9
+    digito = buf[np.minimum(inicios, ultimo)] - np.uint8(_ZERO)
+    validos = (tamanho >= 1) & (tamanho <= max_digits) & (digito <= 9)
+    valores = digito.astype(np.int16)
+    for j in range(1, max_digits):
+        digito = buf[np.minimum(inicios + j, ultimo)] - np.uint8(_ZERO)
+        usa = tamanho > j
+        validos &= ~usa | (digito <= 9)
+        valores = np.where(usa, valores * 10 + digito, valores)
+    return valores, validos
+
+def _fixed_layout(buf: np.ndarray, marca: int, por_linha: int) -> Optional[np.ndarray]:
+    """
+    Posições de marca numa única varredura, se toda linha tiver exatamente por_linha delas
+
+    Returns:
+        Matriz (linhas, por_linha + 1) de posições, a última coluna sendo a
+        quebra de linha, ou None se alguma linha fugir do leiaute
+    """
+    quebras = buf == _NL
+    separadores = np.flatnonzero(quebras | (buf == marca))
+    linhas = int(np.count_nonzero(quebras))
+    if not linhas or len(separadores) != linhas * (por_linha + 1):
+        return None
+    separadores = separadores.reshape(linhas, por_linha + 1)
+    # Todas as quebras estão na última coluna, então as demais posições são marcas
+    if not quebras[separadores[:, -1]].all():
+        return None
+    return separadores
+
+def _check_rows(dado1: np.ndarray, dado2: np.ndarray, total: Optional[np.ndarray]) -> np.ndarray:
+    """Máscara das jogadas válidas: dados de 1 a 6 e total coerente, se houver"""
+    validas = (dado1 >= 1) & (dado1 <= 6) & (dado2 >= 1) & (dado2 <= 6)
+    if total is not None:
+        validas &= total == dado1 + dado2
+    return validas
+
+def _as_int(valor) -> Optional[int]:
+    """Inteiro de um int (não bool) ou de uma string só de dígitos; None para o resto (1.9, true...)"""
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        return valor
+    if isinstance(valor, str) and valor.isascii() and valor.isdigit():
+        return int(valor)
+    return None
+
+class _RowCollector:
+    """Acumula as jogadas do leitor linha a linha, validando cada uma"""
+
+    def __init__(self, skip_invalid: bool):
+        self.skip_invalid = skip_invalid
+        self.dado1: List[int] = []
+        self.dado2: List[int] = []
+        self.skipped = 0
+
+    def add(self, linha: int, dado1, dado2, total=None):
+        d1, d2 = _as_int(dado1), _as_int(dado2)
+        valida = d1 is not None and d2 is not None and 1 <= d1 <= 6 and 1 <= d2 <= 6
+        if valida and total not in (None, ''):
+            valida = _as_int(total) == d1 + d2
+        if valida:
+            self.dado1.append(d1)
+            self.dado2.append(d2)
+        else:
+            self.invalid(linha, f"dados ({dado1}, {dado2}) ou total ({total}) inválidos")
+
+    def invalid(self, linha: int, motivo: str):
+        if not self.skip_invalid:
+            raise ValueError(f"Linha {linha}: {motivo}")
+        self.skipped += 1
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray, int]:
+        return (np.array(self.dado1, dtype=np.uint8), np.array(self.dado2, dtype=np.uint8), self.skipped)
+
+class _CsvParser:
+    """CSV com cabeçalho contendo Dado1 e Dado2 (Total é conferido se existir)"""
+
+    def __init__(self):
+        self.columns = None
+        self.n_columns = 0
+
+    def parse(self, bloco: bytes, linha: int, skip_invalid: bool) -> Tuple[np.ndarray, np.ndarray, int]:
+        if self.columns is None:
+            bloco, linha = self._read_header(bloco, linha)
+            if not bloco:
+                return np.zeros(0, np.uint8), np.zeros(0, np.uint8), 0
+        resultado = self._parse_fixed(bloco)
+        if resultado is None:
+            resultado = self._parse_fast(bloco)
+        if resultado is not None:
+            return resultado
+        return self._parse_slow(bloco, linha, skip_invalid)
+
+    def _read_header(self, bloco: bytes, linha: int) -> Tuple[bytes, int]:
+        fim = bloco.index(b'\n') + 1
+        campos = [_normalize(c) for c in bloco[:fim].decode('utf-8-sig').strip().split(',')]
+        if 'dado1' not in campos or 'dado2' not in campos:
+            raise ValueError("Cabeçalho CSV sem as colunas Dado1 e Dado2")
+        self.n_columns = len(campos)
+        self.columns = (campos.index('dado1'), campos.index('dado2'),
+                        campos.index('total') if 'total' in campos else None)
+        return bloco[fim:], linha + 1
+
+    def _field_bounds(self, inicios, fins, virgulas, coluna: int):
+        comeco = inicios if coluna == 0 else virgulas[:, coluna - 1] + 1
+        final = fins if coluna == self.n_columns - 1 else virgulas[:, coluna]
+        return comeco, final
+
+    def _parse_fixed(self, bloco: bytes):
+        """Vírgulas e quebras de linha de uma só vez; falha em linhas vazias ou com aspas"""
+        buf = np.frombuffer(bloco, dtype=np.uint8)
+        separadores = _fixed_layout(buf, _COMMA, self.n_columns - 1)
+        if separadores is None:
+            return None
+        ultima = self.n_columns - 1
+
+        def campo(coluna):
+            """Início e fim do campo: do separador anterior (ou início da linha) ao seguinte"""
+            if coluna:
+                comeco = separadores[:, coluna - 1] + 1
+            else:
+                comeco = np.empty(len(separadores), dtype=np.int64)
+                comeco[:1] = 0
+                comeco[1:] = separadores[:-1, -1] + 1
+            if coluna < ultima:
+                return comeco, separadores[:, coluna]
+            quebras = separadores[:, -1]
+            return comeco, quebras - (buf[np.maximum(quebras - 1, 0)] == _CR)
+
+        col1, col2, col_total = self.columns
+        dado1, ok1 = _digits(buf, *campo(col1), 1)
+        dado2, ok2 = _digits(buf, *campo(col2), 1)
+        validas = ok1 & ok2
+        total = None
+        if col_total is not None:
+            total, ok_total = _digits(buf, *campo(col_total), 2)
+            validas &= ok_total
+        if not (validas & _check_rows(dado1, dado2, total)).all():
+            return None
+        return dado1.astype(np.uint8), dado2.astype(np.uint8), 0
+
+    def _parse_fast(self, bloco: bytes):
+        buf = np.frombuffer(bloco, dtype=np.uint8)
+        inicios, fins = _line_bounds(buf)
+        n = len(inicios)
+        virgulas = np.flatnonzero(buf == _COMMA)
+        if len(virgulas) != n * (self.n_columns - 1):
+            return None
+        virgulas = virgulas.reshape(n, self.n_columns - 1)
+        # Vírgulas ordenadas e em quantidade exata: basta a primeira e a última caírem na linha
+        if self.n_columns > 1 and ((virgulas[:, 0] < inicios).any() or (virgulas[:, -1] >= fins).any()):
+            return None
+
+        col1, col2, col_total = self.columns
+        dado1, ok1 = _digits(buf, *self._field_bounds(inicios, fins, virgulas, col1), 1)
+        dado2, ok2 = _digits(buf, *self._field_bounds(inicios, fins, virgulas, col2), 1)
+        validas = ok1 & ok2
+        total = None
+        if col_total is not None:
+            total, ok_total = _digits(buf, *self._field_bounds(inicios, fins, virgulas, col_total), 2)
+            validas &= ok_total
+        if not (validas & _check_rows(dado1, dado2, total)).all():
+            return None
+        return dado1.astype(np.uint8), dado2.astype(np.uint8), 0
+
+    def _parse_slow(self, bloco: bytes, linha: int, skip_invalid: bool):
+        coletor = _RowCollector(skip_invalid)
+        col1, col2, col_total = self.columns
+        linhas = io.StringIO(bloco.decode('utf-8', errors='replace'), newline='')
+        for numero, campos in enumerate(csv.reader(linhas), linha):
+            if not campos or not any(c.strip() for c in campos):
+                continue
+            if len(campos) != self.n_columns:
+                coletor.invalid(numero, f"{len(campos)} colunas, esperadas {self.n_columns}")
+                continue
+            total = campos[col_total].strip() if col_total is not None else None
+            coletor.add(numero, campos[col1].strip(), campos[col2].strip(), total)
+        return coletor.result()
+
+class _NdjsonParser:
+    """Um objeto JSON por linha com as chaves dado1 e dado2 (total é conferido se existir)"""
+
+    KEYS = (b'"dado1"', b'"dado2"', b'"total"')
+
+    def parse(self, bloco: bytes, linha: int, skip_invalid: bool) -> Tuple[np.ndarray, np.ndarray, int]:
+        resultado = self._parse_fixed(bloco)
+        if resultado is None:
+            resultado = self._parse_fast(bloco)
+        if resultado is not None:
+            return resultado
+        return self._parse_slow(bloco, linha, skip_invalid)
+
+    def _parse_fixed(self, bloco: bytes):
+        """
+        Linhas com as mesmas chaves na mesma ordem (como as da exportação)
+
+        O leiaute vem da primeira linha: quantos ':' ela tem e qual deles
+        segue cada chave. Uma varredura acha ':' e quebras de todas as
+        linhas; depois só os bytes das chaves e valores são conferidos.
+        """
+        primeira = bloco[:bloco.find(b'\n')]
+        por_linha = primeira.count(b':')
+        indices = []
+        for chave in self.KEYS:
+            posicao = primeira.find(chave + b':')
+            if posicao < 0:
+                if chave == b'"total"':
+                    indices.append(None)
+                    continue
+                return None
+            indices.append(primeira.count(b':', 0, posicao))
+
+        buf = np.frombuffer(bloco, dtype=np.uint8)
+        separadores = _fixed_layout(buf, _COLON, por_linha)
+        if separadores is None:
+            return None
+        valores = []
+        for chave, indice in zip(self.KEYS, indices):
+            if indice is None:
+                valores.append(None)
+                continue
+            posicoes = separadores[:, indice] - len(chave)
+            for j, byte in enumerate(chave):
+                if not (buf[posicoes + j] == byte).all():
+                    return None
+            inicio, fim, terminados = self._value_bounds(buf, posicoes, len(chave))
+            valor, validos = _digits(buf, inicio, fim, 1 if chave != b'"total"' else 2)
+            if not (validos & terminados).all():
+                return None
+            valores.append(valor)
+        dado1, dado2, total = valores
+        if not _check_rows(dado1, dado2, total).all():
+            return None
+        return dado1.astype(np.uint8), dado2.astype(np.uint8), 0
+
+    @staticmethod
+    def _find(buf: np.ndarray, aspas: np.ndarray, chave: bytes) -> np.ndarray:
+        """Posições da chave no bloco, filtrando as aspas byte a byte"""
+        candidatos = aspas[aspas <= len(buf) - len(chave)]
+        for j in range(1, len(chave)):
+            candidatos = candidatos[buf[candidatos + j] == chave[j]]
+        return candidatos
+
+    @staticmethod
+    def _value_bounds(buf: np.ndarray, posicoes: np.ndarray, tamanho_chave: int):
+        """Início e fim do valor numérico após 'chave:', aceitando espaços"""
+        inicio = posicoes + tamanho_chave
+        limite = len(buf) - 1
+        for separador in (b' ', b':', b' '):
+            inicio = inicio + (buf[np.minimum(inicio, limite)] == separador[0])
+        fim = inicio.copy()
+        for _ in range(3):
+            digito = buf[np.minimum(fim, limite)]
+            fim = fim + ((digito >= _ZERO) & (digito <= _ZERO + 9))
+        # O número precisa terminar no fim do valor, não em '.', 'e' etc.
+        terminados = np.isin(buf[np.minimum(fim, limite)], _VALUE_END)
+        return inicio, fim, terminados
+
+    def _parse_fast(self, bloco: bytes):
+        buf = np.frombuffer(bloco, dtype=np.uint8)
+        inicios, fins = _line_bounds(buf)
+        n = len(inicios)
+        aspas = np.flatnonzero(buf == _QUOTE)
+        valores = []
+        for chave in self.KEYS:
+            posicoes = self._find(buf, aspas, chave)
+            if chave == b'"total"' and not len(posicoes):
+                valores.append(None)
+                continue
+            # Exatamente uma ocorrência por linha, dentro da linha
+            if len(posicoes) != n or (posicoes < inicios).any() or (posicoes >= fins).any():
+                return None
+            inicio, fim, terminados = self._value_bounds(buf, posicoes, len(chave))
+            valor, validos = _digits(buf, inicio, fim, 1 if chave != b'"total"' else 2)
+            if not (validos & terminados).all():
+                return None
+            valores.append(valor)
+        dado1, dado2, total = valores
+        if not _check_rows(dado1, dado2, total).all():
+            return None
+        return dado1.astype(np.uint8), dado2.astype(np.uint8), 0
+
+    def _parse_slow(self, bloco: bytes, linha: int, skip_invalid: bool):
+        coletor = _RowCollector(skip_invalid)
+        for numero, texto in enumerate(bloco.decode('utf-8', errors='replace').split('\n'), linha):
+            if not texto.strip():
+                continue
+            try:
+                objeto = {_normalize(k): v for k, v in json.loads(texto).items()}
+            except (ValueError, AttributeError):
+                coletor.invalid(numero, "JSON inválido")
+                continue
+            coletor.add(numero, objeto.get('dado1'), objeto.get('dado2'), objeto.get('total'))
+        return coletor.result()
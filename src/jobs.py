@@ -0,0 +1,205 @@
+"""
+Módulo de tarefas - Agendador de jobs em segundo plano com cancelamento
+"""
+import itertools
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Prioridades usuais (maior executa antes)
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+# Estados de um job
+PENDING = 'pendente'
+RUNNING = 'executando'
+DONE = 'concluído'
+CANCELLED = 'cancelado'
+FAILED = 'erro'
+
+FINAL_STATES = (DONE, CANCELLED, FAILED)
+
+class JobCancelled(Exception):
+    """Levantada dentro de um job quando seu cancelamento foi pedido"""
+
+class Job:
+    """Uma unidade de trabalho agendada, com progresso e cancelamento cooperativo"""
+
+    def __init__(self, job_id: int, name: str, func: Callable, args: tuple, kwargs: dict,
+                 priority: int, depends_on: List['Job']):
+        self.id = job_id
+        self.name = name
+        self.priority = priority
+        self.depends_on = depends_on
+        self.state = PENDING
+        self.progress = 0.0
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        self._scheduler: Optional['JobScheduler'] = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Indica se o cancelamento foi pedido"""
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINAL_STATES
+
+    def cancel(self):
+        """Pede o cancelamento; jobs pendentes nem chegam a executar"""
+        self._cancel_event.set()
+        if self._scheduler is not None:
+            self._scheduler._wake()
+
+    def check_cancelled(self):
+        """Ponto de cancelamento cooperativo: levanta JobCancelled se pedido"""
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.name)
+
+    def set_progress(self, done: float, total: float = 1.0):
+        """Atualiza o progresso (0 a 1) e notifica o agendador"""
+        self.progress = min(max(done / total, 0.0), 1.0) if total else 1.0
+        if self._scheduler is not None:
+            self._scheduler._notify(self)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera o job terminar; retorna False se o tempo esgotar"""
+        return self._done_event.wait(timeout)
+
+    def __repr__(self) -> str:
+        return f"Job(#{self.id} {self.name!r}, {self.state}, {self.progress:.0%})"
+
+class JobScheduler:
+    """
+    Pool de threads que executa jobs por prioridade
+
+    Um job só começa quando todos os jobs de que depende terminaram, o que
+    permite enfileirar exportações e gráficos atrás de uma simulação em
+    andamento. A função de cada job recebe o próprio Job como primeiro
+    argumento, para reportar progresso e checar cancelamento.
+    """
+
+    def __init__(self, max_workers: int = 2, on_update: Callable[[Job], None] = None):
+        self.on_update = on_update
+        self._jobs: Dict[int, Job] = {}
+        self._pending: List[Job] = []
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._shutdown = False
+        self._workers = [threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                         for i in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, func: Callable, *args, name: str = '', priority: int = PRIORITY_NORMAL,
+               after: Iterable[Optional[Job]] = (), **kwargs) -> Job:
+        """
+        Agenda um job
+
+        Args:
+            func: Função chamada como func(job, *args, **kwargs)
+            name: Nome exibido
+            priority: Maior executa antes entre jobs prontos
+            after: Jobs que precisam terminar antes deste (None é ignorado)
+
+        Returns:
+            O Job criado
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Agendador encerrado")
+            job = Job(next(self._ids), name or getattr(func, '__name__', 'job'), func, args, kwargs,
+                      priority, [dep for dep in after if dep is not None])
+            job._scheduler = self
+            self._jobs[job.id] = job
+            self._pending.append(job)
+            # Ordem estável: prioridade decrescente, depois ordem de chegada
+            self._pending.sort(key=lambda j: (-j.priority, j.id))
+            self._condition.notify_all()
+        self._notify(job)
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """Busca um job pelo ID"""
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        """Pede o cancelamento de um job pelo ID"""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def active(self, name: str = None) -> List[Job]:
+        """Jobs pendentes ou em execução (opcionalmente só os de um nome)"""
+        return [j for j in list(self._jobs.values())
+                if not j.finished and (name is None or j.name == name)]
+
+    def shutdown(self, cancel: bool = True, wait: bool = False):
+        """Encerra o agendador, cancelando os jobs restantes se pedido"""
+        with self._condition:
+            self._shutdown = True
+            if cancel:
+                for job in self._jobs.values():
+                    if not job.finished:
+                        job._cancel_event.set()
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _wake(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    def _notify(self, job: Job):
+        if self.on_update is not None:
+            self.on_update(job)
+
+    def _next_job(self) -> Optional[Job]:
+        """Retira o job pronto de maior prioridade (chamar com o lock)"""
+        for job in self._pending:
+            if job.cancelled or all(dep.finished for dep in job.depends_on):
+                self._pending.remove(job)
+                return job
+        return None
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    if self._shutdown and not self._pending:
+                        return
+                    self._condition.wait()
+                    job = self._next_job()
+                if not job.cancelled:
+                    job.state = RUNNING
+            self._run(job)
+
+    def _run(self, job: Job):
+        if job.cancelled:
+            job.state = CANCELLED
+        else:
+            self._notify(job)
+            try:
+                job.result = job._func(job, *job._args, **job._kwargs)
+                job.progress = 1.0
+                job.state = DONE
+            except JobCancelled:
+                job.state = CANCELLED
+            except Exception as e:
+                job.error = e
+                job.state = FAILED
+
+        with self._condition:
+            job._done_event.set()
+            self._condition.notify_all()
+        self._notify(job)
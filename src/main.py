@@ -2,16 +2,287 @@
 """
 VT BacBo Analyzer - Main Entry Point
 """
-import tkinter as tk
-from gui import BacBoAnalyzerApp
+import argparse
+import json
+import multiprocessing
 import os
 import sys
 
 # Adiciona o diretório atual ao path para imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def main():
-    """Função principal que inicia a aplicação"""
+# Posições listadas no relatório de --padrao
+PATTERN_POSITIONS = 10
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description="VT BacBo Analyzer")
+    parser.add_argument('--headless', action='store_true',
+                        help="Executa sem interface gráfica e imprime as estatísticas em JSON")
+    parser.add_argument('-n', '--jogadas', type=int, default=10,
+                        help="Número de jogadas a simular (padrão: 10)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Semente para resultados reproduzíveis")
+    parser.add_argument('--workers', type=int, nargs='?', const=0, default=None, metavar='N',
+                        help="Simula em N processos (sem N, todos os núcleos); só estatísticas e "
+                             "--teoria, sem o histórico por jogada")
+    parser.add_argument('--janela', type=int, default=None,
+                        help="Tamanho da janela para análise de tendências")
+    parser.add_argument('--janelas', type=int, nargs='+', default=None, metavar='N',
+                        help="Resume as tendências de várias janelas de uma vez (ex.: 5 10 20 50)")
+    parser.add_argument('--formato', choices=['auto', 'txt', 'csv', 'ndjson'], default=None,
+                        help="Formato de exportação (sem formato nem saída, não exporta)")
+    parser.add_argument('--compressao', choices=['gzip', 'bz2', 'xz', 'zstd'], default=None,
+                        help="Compressão do arquivo exportado (padrão: pela extensão da saída)")
+    parser.add_argument('--saida', default=None,
+                        help="Caminho do arquivo exportado")
+    parser.add_argument('--sessao', default=None,
+                        help="Reanalisa uma sessão .vtbb gravada em vez de simular")
+    parser.add_argument('--banco', default=None,
+                        help="Grava a execução numa sessão deste banco SQLite")
+    parser.add_argument('--sessao-banco', type=int, default=None, metavar='ID',
+                        help="Reanalisa a sessão ID do banco (--banco, ou o padrão da interface)")
+    parser.add_argument('--importar', default=None,
+                        help="Analisa jogadas gravadas em CSV/NDJSON (pode estar comprimido) em vez de simular")
+    parser.add_argument('--ignorar-invalidas', action='store_true',
+                        help="Na importação, ignora linhas inválidas em vez de falhar")
+    parser.add_argument('--feed', default=None, metavar='FONTE',
+                        help="Analisa jogadas ao vivo: arquivo seguido, '-' (stdin), tcp://host:porta "
+                             "ou unix://caminho (Ctrl+C encerra e imprime o relatório)")
+    parser.add_argument('--feed-limite', type=int, default=None, metavar='N',
+                        help="Encerra o feed depois de N jogadas")
+    parser.add_argument('--salvar-sessao', default=None,
+                        help="Grava o histórico em uma sessão .vtbb")
+    parser.add_argument('--teoria', action='store_true',
+                        help="Compara com as distribuições exatas (qui-quadrado e escores z)")
+    parser.add_argument('--sequencias', type=int, nargs='?', const=6, default=None, metavar='N',
+                        help="Resume as sequências PAR/ÍMPAR (conta as de comprimento >= N, padrão 6)")
+    parser.add_argument('--ic', type=int, nargs='?', const=10_000, default=None, metavar='B',
+                        help="Intervalos de confiança por bootstrap com B reamostragens (padrão 10000) "
+                             "para estatísticas, tendências (--janela/--janelas) e sequências")
+    parser.add_argument('--confianca', type=float, default=0.95,
+                        help="Nível de confiança dos intervalos (padrão: 0.95)")
+    parser.add_argument('--padrao', default=None,
+                        help="Conta um padrão de paridade (ex.: PAR,PAR,ÍMPAR) e o resultado seguinte")
+    parser.add_argument('--perfil', action='store_true',
+                        help="Liga os spans de perfilamento (tempo e memória por etapa; o tracemalloc deixa a execução mais lenta)")
+    parser.add_argument('--trace', default=None,
+                        help="Grava os spans em JSON Chrome trace (implica --perfil, só --headless)")
+    return parser.parse_args(argv)
+
+# Opções que precisam do histórico por jogada, indisponível com --workers
+HISTORY_OPTIONS = ('janela', 'janelas', 'sequencias', 'padrao', 'ic', 'formato', 'saida', 'compressao',
+                   'salvar_sessao', 'banco', 'sessao_banco', 'sessao', 'importar', 'feed')
+
+def run_headless(args: argparse.Namespace) -> int:
+    """Simula, analisa e exporta sem importar tkinter nem matplotlib"""
+    if args.workers is not None:
+        return _simulate_parallel(args)
+    if not args.banco and args.sessao_banco is None:
+        return _analyze_headless(args, None)
+
+    import sqlite3
+    from database import DEFAULT_DATABASE, SessionDatabase
+    try:
+        database = SessionDatabase(args.banco or DEFAULT_DATABASE)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Erro ao abrir o banco: {e}", file=sys.stderr)
+        return 2
+    try:
+        return _analyze_headless(args, database)
+    finally:
+        # Grava as jogadas ainda pendentes no lote
+        database.close()
+
+def _analyze_headless(args: argparse.Namespace, database) -> int:
+    """Corpo de run_headless, com o banco de sessões já aberto (ou None)"""
+    from analyzer import BacBoAnalyzer, TREND_PAR, TREND_WINDOWS
+    from utils import FileExporter
+    from profiling import PROFILER
+    from probability import expected_statistics, trend_probabilities
+
+    if args.sessao_banco is not None:
+        try:
+            analyzer = BacBoAnalyzer.open_database_session(database, args.sessao_banco)
+        except ValueError as e:
+            print(f"Erro ao abrir sessão do banco: {e}", file=sys.stderr)
+            return 2
+    elif args.sessao:
+        try:
+            analyzer = BacBoAnalyzer.open_session(args.sessao)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao abrir sessão: {e}", file=sys.stderr)
+            return 2
+    elif args.importar:
+        try:
+            analyzer = BacBoAnalyzer.from_file(args.importar, skip_invalid=args.ignorar_invalidas)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao importar: {e}", file=sys.stderr)
+            return 2
+    elif args.feed:
+        analyzer = BacBoAnalyzer()
+        if database is not None:
+            analyzer.attach_database(database, name=args.feed)
+        try:
+            feed = _run_feed(args, analyzer)
+        except (OSError, ValueError) as e:
+            print(f"Erro no feed: {e}", file=sys.stderr)
+            return 2
+    elif args.jogadas <= 0:
+        print("Erro: o número de jogadas deve ser positivo", file=sys.stderr)
+        return 2
+    else:
+        analyzer = BacBoAnalyzer()
+        if database is not None:
+            analyzer.attach_database(database)
+        analyzer.simulate_batch(args.jogadas, seed=args.seed)
+    if database is not None and analyzer.database is None:
+        analyzer.attach_database(database, name=os.path.basename(args.sessao or args.importar))
+    results = analyzer.get_last_results()
+
+    relatorio = {'seed': analyzer.seed, 'estatisticas': analyzer.calculate_statistics(results)}
+
+    if args.janela:
+        trends = analyzer.analyze_trends(results, args.janela)
+        n_janelas = len(trends['trend'])
+        janelas_par = int((trends['trend'] == TREND_PAR).sum())
+        relatorio['tendencias'] = {
+            'janela': args.janela,
+            'total_janelas': n_janelas,
+            'janelas_par': janelas_par,
+            'janelas_impar': n_janelas - janelas_par,
+            'frac_par': janelas_par / n_janelas if n_janelas else None
+        }
+
+    if args.janelas:
+        try:
+            relatorio['tendencias_multi'] = analyzer.analyze_trends_multi(results, args.janelas, summary=True)
+        except ValueError as e:
+            print(f"Erro nas janelas: {e}", file=sys.stderr)
+            return 2
+
+    if args.sequencias is not None:
+        relatorio['sequencias'] = analyzer.streak_summary(min_length=args.sequencias)
+
+    if args.padrao:
+        try:
+            busca = analyzer.find_pattern(args.padrao, max_positions=PATTERN_POSITIONS)
+        except ValueError as e:
+            print(f"Erro no padrão: {e}", file=sys.stderr)
+            return 2
+        relatorio['padrao'] = {'padrao': args.padrao, 'ocorrencias': busca['ocorrencias'],
+                               'primeiras_posicoes': busca['posicoes'].tolist(),
+                               'proximo': busca['proximo']}
+
+    if args.teoria:
+        relatorio['teoria'] = {
+            'esperado': expected_statistics(),
+            'testes': analyzer.compare_with_theory(results)
+        }
+        if args.janela:
+            relatorio['teoria']['frac_par_esperada'] = trend_probabilities(args.janela)['par']
+
+    if args.ic is not None:
+        janelas = args.janelas or ([args.janela] if args.janela else TREND_WINDOWS)
+        try:
+            relatorio['intervalos'] = analyzer.confidence_intervals(
+                results, janelas, min_length=args.sequencias or 6, resamples=args.ic,
+                confidence=args.confianca, seed=args.seed)
+        except ValueError as e:
+            print(f"Erro nos intervalos: {e}", file=sys.stderr)
+            return 2
+
+    if args.formato or args.saida or args.compressao:
+        try:
+            relatorio['arquivo'] = FileExporter().export_to_file(results, args.formato or 'auto',
+                                                                 filename=args.saida,
+                                                                 compression=args.compressao)
+        except ValueError as e:
+            print(f"Erro ao exportar: {e}", file=sys.stderr)
+            return 2
+
+    if args.salvar_sessao:
+        relatorio['sessao'] = analyzer.save_session(args.salvar_sessao)
+
+    if PROFILER.enabled:
+        relatorio['perfil'] = {nome: {'total_ms': round(dados['total_ms'], 3), 'count': dados['count']}
+                               for nome, dados in PROFILER.summary().items()}
+        relatorio['cache'] = analyzer.cache.info()
+        if args.trace:
+            relatorio['trace'] = PROFILER.export_chrome_trace(args.trace)
+
+    if args.feed:
+        relatorio['feed'] = feed.info()
+
+    if database is not None:
+        relatorio['banco'] = {'arquivo': database.path, 'sessao': analyzer.session_id}
+
+    print(json.dumps(relatorio, ensure_ascii=False, indent=2))
+    return 0
+
+def _simulate_parallel(args: argparse.Namespace) -> int:
+    """Simulação em shards no pool de processos do montecarlo; relatório só com agregados"""
+    from montecarlo import run_simulation
+    from profiling import PROFILER, span
+    from probability import expected_statistics, goodness_of_fit
+
+    conflitos = [f"--{nome.replace('_', '-')}" for nome in HISTORY_OPTIONS
+                 if getattr(args, nome) not in (None, False)]
+    if conflitos:
+        print(f"Erro: --workers não guarda o histórico por jogada e não combina com {', '.join(conflitos)}",
+              file=sys.stderr)
+        return 2
+    if args.jogadas <= 0:
+        print("Erro: o número de jogadas deve ser positivo", file=sys.stderr)
+        return 2
+    if args.workers < 0:
+        print("Erro: o número de processos não pode ser negativo", file=sys.stderr)
+        return 2
+
+    workers = args.workers or os.cpu_count() or 1
+    with span('montecarlo.simulacao', jogadas=args.jogadas, workers=workers):
+        stats = run_simulation(args.jogadas, seed=args.seed, workers=workers)
+    relatorio = {'seed': args.seed, 'workers': workers, 'estatisticas': stats.to_dict()}
+    if args.teoria:
+        relatorio['teoria'] = {'esperado': expected_statistics(), 'testes': goodness_of_fit(stats)}
+    if PROFILER.enabled:
+        relatorio['perfil'] = {nome: {'total_ms': round(dados['total_ms'], 3), 'count': dados['count']}
+                               for nome, dados in PROFILER.summary().items()}
+        if args.trace:
+            relatorio['trace'] = PROFILER.export_chrome_trace(args.trace)
+
+    print(json.dumps(relatorio, ensure_ascii=False, indent=2))
+    return 0
+
+def _run_feed(args: argparse.Namespace, analyzer):
+    """Roda o feed ao vivo até o fim da fonte, o limite ou Ctrl+C, com o resumo no stderr"""
+    import asyncio
+    from feed import LiveFeed
+
+    def mostrar(resumo):
+        stats = resumo['estatisticas']
+        if not stats:
+            return
+        atual = resumo['sequencias']['atual']
+        print(f"\r{resumo['jogadas']} jogadas | Pares {stats['perc_pares']:.1f}% | "
+              f"Sequência {atual['valor']} x{atual['comprimento']} | fila {resumo['feed']['fila']}",
+              end='', file=sys.stderr, flush=True)
+
+    feed = LiveFeed(analyzer, args.feed, limit=args.feed_limite,
+                    skip_invalid=args.ignorar_invalidas, on_update=mostrar)
+    try:
+        asyncio.run(feed.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(file=sys.stderr)
+    return feed
+
+def run_gui():
+    """Inicia a interface gráfica"""
+    import tkinter as tk
+    from gui import BacBoAnalyzerApp
+
     try:
         root = tk.Tk()
         app = BacBoAnalyzerApp(root)
@@ -20,5 +291,18 @@ def main():
         print(f"Erro ao iniciar aplicação: {e}")
         input("Pressione Enter para sair...")
 
+def main(argv=None) -> int:
+    """Função principal que inicia a aplicação"""
+    args = parse_args(argv)
+    if args.perfil or args.trace:
+        from profiling import PROFILER
+        PROFILER.enable()
+    if args.headless:
+        return run_headless(args)
+    run_gui()
+    return 0
+
 if __name__ == "__main__":
-    main()
+    # Necessário para o pool de processos do montecarlo no executável PyInstaller
+    multiprocessing.freeze_support()
+    sys.exit(main())
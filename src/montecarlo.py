@@ -0,0 +1,106 @@
+"""
+Módulo Monte Carlo - Simulações grandes distribuídas entre processos
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from running_stats import RunningStatistics
+
+# Jogadas por shard; define a divisão da semente, não depende do número de processos
+DEFAULT_SHARD_SIZE = 1 << 22
+
+# Jogadas sorteadas por vez dentro de um shard (limita a memória por processo)
+SHARD_BLOCK = 1 << 20
+
+def plan_shards(n: int, seed=None, shard_size: int = DEFAULT_SHARD_SIZE) -> List[Tuple[np.random.SeedSequence, int]]:
+    """
+    Divide uma simulação em shards com subsequências independentes
+
+    Args:
+        n: Total de jogadas
+        seed: Semente inteira, SeedSequence ou None (entropia do sistema)
+        shard_size: Jogadas por shard
+
+    Returns:
+        Lista de (SeedSequence do shard, quantidade de jogadas)
+    """
+    if n < 0:
+        raise ValueError("Quantidade de jogadas não pode ser negativa")
+    if shard_size <= 0:
+        raise ValueError("Tamanho do shard deve ser positivo")
+
+    raiz = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    n_shards = -(-n // shard_size)
+    tamanhos = [shard_size] * n_shards
+    if n_shards:
+        tamanhos[-1] = n - shard_size * (n_shards - 1)
+    return list(zip(raiz.spawn(n_shards), tamanhos))
+
+def simulate_shard(seed_seq: np.random.SeedSequence, n: int) -> np.ndarray:
+    """
+    Simula um shard e devolve só o resumo mesclável
+
+    Returns:
+        Tabela 6x6 int64 de contagens por (dado1, dado2)
+    """
+    rng = np.random.default_rng(seed_seq)
+    contagens = np.zeros(36, dtype=np.int64)
+    for inicio in range(0, n, SHARD_BLOCK):
+        bloco = min(SHARD_BLOCK, n - inicio)
+        # Sorteia direto o índice da célula (dado1 - 1) * 6 + (dado2 - 1)
+        celulas = rng.integers(0, 36, size=bloco, dtype=np.uint8)
+        contagens += np.bincount(celulas, minlength=36)
+    return contagens.reshape(6, 6)
+
+def run_simulation(n: int, seed=None, workers: Optional[int] = None,
+                   shard_size: int = DEFAULT_SHARD_SIZE,
+                   progress: Optional[Callable[[int], None]] = None) -> RunningStatistics:
+    """
+    Executa uma simulação de n jogadas em paralelo
+
+    O resultado depende apenas de (n, seed, shard_size): é idêntico para
+    qualquer número de processos, pois cada shard tem sua própria
+    SeedSequence e os resumos são somas inteiras.
+
+    Args:
+        n: Total de jogadas
+        seed: Semente para reprodutibilidade (None para aleatória)
+        workers: Processos (None usa todos os núcleos, 1 roda no processo atual)
+        shard_size: Jogadas por shard
+        progress: Chamado com o total de jogadas concluídas a cada shard; uma
+            exceção levantada nele cancela os shards que ainda não começaram
+
+    Returns:
+        RunningStatistics com histogramas de totais, dados e paridade
+    """
+    shards = plan_shards(n, seed, shard_size)
+    workers = workers or os.cpu_count() or 1
+    contagens = np.zeros((6, 6), dtype=np.int64)
+    feitas = 0
+
+    if workers == 1 or len(shards) <= 1:
+        for seed_seq, tamanho in shards:
+            contagens += simulate_shard(seed_seq, tamanho)
+            feitas += tamanho
+            if progress:
+                progress(feitas)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            futures = {executor.submit(simulate_shard, seed_seq, tamanho): tamanho
+                       for seed_seq, tamanho in shards}
+            try:
+                for future in as_completed(futures):
+                    contagens += future.result()
+                    feitas += futures[future]
+                    if progress:
+                        progress(feitas)
+            except BaseException:
+                # Sem isso, a saída do executor esperaria todos os shards pendentes
+                for future in futures:
+                    future.cancel()
+                raise
+
+    return RunningStatistics.from_joint_counts(contagens)
@@ -0,0 +1,214 @@
+"""
+Módulo de padrões - Índice de n-gramas para consultas de sequências
+"""
+from typing import Sequence
+
+import numpy as np
+
+from store import GrowableArray
+
+# Posições codificadas por vez ao alimentar o índice
+PATTERN_BLOCK = 1 << 20
+
+# A cauda não ordenada é mesclada na base quando passa de max(MERGE_MIN, base / MERGE_RATIO)
+MERGE_MIN = 1 << 16
+MERGE_RATIO = 16
+
+# Posições ficam em int32 (4 bytes por jogada) até a série passar deste tamanho
+POSITION_INT32_MAX = np.iinfo(np.int32).max
+
+def _code_dtype(alphabet: int, max_length: int) -> np.dtype:
+    """Menor inteiro sem sinal que comporta os códigos e o limite alphabet ** max_length"""
+    limite = alphabet ** max_length
+    for dtype in (np.uint16, np.uint32, np.uint64):
+        if limite <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Comprimento máximo {max_length} grande demais para alfabeto de {alphabet} símbolos")
+
+class PatternIndex:
+    """
+    Índice dos n-gramas de comprimento max_length de uma série de símbolos
+
+    Cada posição recebe o código do n-grama que começa nela (símbolos em
+    base alphabet, o primeiro como dígito mais significativo). Padrões
+    mais curtos ocupam um intervalo contíguo de códigos, então contagem e
+    posições saem de duas buscas binárias no array ordenado de códigos,
+    como num suffix array truncado. Jogadas novas vão para uma cauda não
+    ordenada, mesclada na base em O(n) quando cresce.
+    """
+
+    def __init__(self, alphabet: int, max_length: int = 16):
+        if max_length <= 0:
+            raise ValueError("Comprimento máximo deve ser positivo")
+        self.alphabet = alphabet
+        self.max_length = max_length
+        self.code_dtype = _code_dtype(alphabet, max_length)
+        self.reset()
+
+    def reset(self):
+        """Esvazia o índice"""
+        self._sequence = GrowableArray(np.uint8)
+        self._base_codes = np.zeros(0, dtype=self.code_dtype)
+        self._base_pos = np.zeros(0, dtype=np.int32)
+        self._tail_codes = GrowableArray(self.code_dtype)
+        self._tail_pos = GrowableArray(np.int32)
+        # Posições com n-grama completo já codificadas
+        self._complete = 0
+
+    def __len__(self) -> int:
+        return len(self._sequence)
+
+    @property
+    def n(self) -> int:
+        return len(self._sequence)
+
+    @property
+    def sequence(self) -> np.ndarray:
+        """Símbolos indexados (view sem cópia)"""
+        return self._sequence.view()
+
+    def extend(self, symbols: np.ndarray):
+        """Adiciona símbolos (0..alphabet-1) e codifica as posições que ficaram completas"""
+        symbols = np.asarray(symbols, dtype=np.uint8)
+        if len(symbols) and int(symbols.max()) >= self.alphabet:
+            raise ValueError("Símbolo fora do alfabeto do índice")
+        self._sequence.extend(symbols)
+
+        seq = self._sequence.view()
+        if len(seq) > POSITION_INT32_MAX and self._base_pos.dtype != np.int64:
+            self._widen_positions()
+        completas = max(len(seq) - self.max_length + 1, 0)
+        for inicio in range(self._complete, completas, PATTERN_BLOCK):
+            fim = min(inicio + PATTERN_BLOCK, completas)
+            self._tail_codes.extend(self._encode_positions(seq, inicio, fim))
+            self._tail_pos.extend(np.arange(inicio, fim, dtype=self._base_pos.dtype))
+        self._complete = max(completas, self._complete)
+
+        if len(self._tail_codes) > max(MERGE_MIN, len(self._base_codes) // MERGE_RATIO):
+            self._merge()
+
+    def _widen_positions(self):
+        """Passa as posições para int64 quando a série não cabe mais em int32"""
+        self._base_pos = self._base_pos.astype(np.int64)
+        cauda = GrowableArray(np.int64, max(len(self._tail_pos), 1))
+        cauda.extend(self._tail_pos.view())
+        self._tail_pos = cauda
+
+    def _encode_positions(self, seq: np.ndarray, inicio: int, fim: int) -> np.ndarray:
+        """Códigos dos n-gramas que começam em inicio..fim-1"""
+        codigos = np.zeros(fim - inicio, dtype=self.code_dtype)
+        base = self.code_dtype.type(self.alphabet)
+        for j in range(self.max_length):
+            codigos *= base
+            codigos += seq[inicio + j:fim + j]
+        return codigos
+
+    def _merge(self):
+        """Mescla a cauda ordenada na base, mantendo as posições crescentes por código"""
+        ordem = np.argsort(self._tail_codes.view(), kind='stable')
+        codigos = self._tail_codes.view()[ordem]
+        posicoes = self._tail_pos.view()[ordem]
+        # 'right': posições da cauda são todas maiores que as da base
+        destino = np.searchsorted(self._base_codes, codigos, side='right')
+        self._base_codes = np.insert(self._base_codes, destino, codigos)
+        self._base_pos = np.insert(self._base_pos, destino, posicoes)
+        self._tail_codes.clear()
+        self._tail_pos.clear()
+
+    def _validate(self, pattern: Sequence[int]) -> np.ndarray:
+        padrao = np.asarray(pattern, dtype=np.int64)
+        if padrao.ndim != 1 or not len(padrao):
+            raise ValueError("Padrão vazio")
+        if padrao.min() < 0 or padrao.max() >= self.alphabet:
+            raise ValueError("Símbolo fora do alfabeto do índice")
+        return padrao
+
+    def _code_range(self, padrao: np.ndarray):
+        """Intervalo [lo, hi) dos códigos que começam com o padrão (até max_length)"""
+        codigo = 0
+        for simbolo in padrao.tolist():
+            codigo = codigo * self.alphabet + simbolo
+        escala = self.alphabet ** (self.max_length - len(padrao))
+        return self.code_dtype.type(codigo * escala), self.code_dtype.type((codigo + 1) * escala)
+
+    def _edge_positions(self, padrao: np.ndarray) -> np.ndarray:
+        """Ocorrências nas últimas posições, que ainda não têm n-grama completo"""
+        seq = self._sequence.view()
+        k = len(padrao)
+        trecho = seq[self._complete:]
+        if len(trecho) < k:
+            return np.zeros(0, dtype=np.int64)
+        janelas = np.lib.stride_tricks.sliding_window_view(trecho, k)
+        return np.flatnonzero((janelas == padrao).all(axis=1)) + self._complete
+
+    def positions(self, pattern: Sequence[int]) -> np.ndarray:
+        """
+        Posições (0-based, crescentes) onde o padrão começa
+
+        Padrões maiores que max_length são buscados pelo prefixo e
+        conferidos no restante de forma vetorizada.
+        """
+        padrao = self._validate(pattern)
+        prefixo = padrao[:self.max_length]
+        lo, hi = self._code_range(prefixo)
+
+        inicio, fim = np.searchsorted(self._base_codes, np.array([lo, hi], dtype=self.code_dtype))
+        cauda = self._tail_codes.view()
+        partes = [self._base_pos[inicio:fim],
+                  self._tail_pos.view()[(cauda >= lo) & (cauda < hi)]]
+        if len(prefixo) < self.max_length:
+            partes.append(self._edge_positions(prefixo))
+        # Só o resultado passa a int64; o índice guarda as posições em int32 enquanto couberem
+        posicoes = np.sort(np.concatenate(partes).astype(np.int64, copy=False))
+
+        if len(padrao) > self.max_length:
+            seq = self._sequence.view()
+            posicoes = posicoes[posicoes + len(padrao) <= len(seq)]
+            for j in range(self.max_length, len(padrao)):
+                posicoes = posicoes[seq[posicoes + j] == padrao[j]]
+        return posicoes
+
+    def count(self, pattern: Sequence[int]) -> int:
+        """Quantidade de ocorrências do padrão (sobrepostas contam)"""
+        padrao = self._validate(pattern)
+        if len(padrao) > self.max_length:
+            return len(self.positions(padrao))
+        lo, hi = self._code_range(padrao)
+        inicio, fim = np.searchsorted(self._base_codes, np.array([lo, hi], dtype=self.code_dtype))
+        cauda = self._tail_codes.view()
+        total = int(fim - inicio) + int(np.count_nonzero((cauda >= lo) & (cauda < hi)))
+        if len(padrao) < self.max_length:
+            total += len(self._edge_positions(padrao))
+        return total
+
+    def next_counts(self, pattern: Sequence[int]) -> np.ndarray:
+        """
+        Distribuição do símbolo seguinte a cada ocorrência do padrão
+
+        Returns:
+            Array de tamanho alphabet com as contagens (ocorrências no fim
+            da série não têm seguinte e não entram)
+        """
+        padrao = self._validate(pattern)
+        seq = self._sequence.view()
+        if len(padrao) >= self.max_length:
+            posicoes = self.positions(padrao)
+            seguintes = posicoes + len(padrao)
+            return np.bincount(seq[seguintes[seguintes < len(seq)]], minlength=self.alphabet)
+
+        # Cada continuação é um subintervalo do intervalo do padrão
+        lo, _ = self._code_range(padrao)
+        escala = self.alphabet ** (self.max_length - len(padrao) - 1)
+        bordas = lo + np.arange(self.alphabet + 1, dtype=self.code_dtype) * self.code_dtype.type(escala)
+        contagens = np.diff(np.searchsorted(self._base_codes, bordas)).astype(np.int64)
+
+        cauda = self._tail_codes.view()
+        no_intervalo = cauda[(cauda >= bordas[0]) & (cauda < bordas[-1])]
+        contagens += np.bincount(((no_intervalo - lo) // escala).astype(np.intp), minlength=self.alphabet)
+
+        borda = self._edge_positions(padrao) + len(padrao)
+        contagens += np.bincount(seq[borda[borda < len(seq)]], minlength=self.alphabet)
+        return contagens
+
+    def __repr__(self) -> str:
+        return f"PatternIndex({self.n} símbolos, alfabeto {self.alphabet}, até {self.max_length})"
@@ -0,0 +1,242 @@
+"""
+Módulo de probabilidades exatas - Distribuições analíticas e testes de aderência
+"""
+import math
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+from running_stats import RunningStatistics
+
+FACES = 6
+
+# Acima disso as probabilidades de cauda já são 0 em ponto flutuante
+_CHI2_MAX_HALF = 1e5
+
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    """Marca como somente leitura um array devolvido por função com cache"""
+    array.flags.writeable = False
+    return array
+
+@lru_cache(maxsize=None)
+def total_counts(dice: int = 2, faces: int = FACES) -> np.ndarray:
+    """
+    Número de combinações que produzem cada total (convolução das faces)
+
+    Returns:
+        Array indexado pelo total (0..dice*faces); para 2 dados soma 36
+    """
+    face = np.ones(faces, dtype=np.int64)
+    contagens = np.ones(1, dtype=np.int64)
+    for _ in range(dice):
+        contagens = np.convolve(contagens, face)
+    # O menor total é dice (todas as faces 1)
+    return _frozen(np.concatenate([np.zeros(dice, dtype=np.int64), contagens]))
+
+@lru_cache(maxsize=None)
+def total_distribution(dice: int = 2, faces: int = FACES) -> np.ndarray:
+    """Probabilidade de cada total, indexada pelo total"""
+    contagens = total_counts(dice, faces)
+    return _frozen(contagens / contagens.sum())
+
+@lru_cache(maxsize=None)
+def parity_probability(dice: int = 2, faces: int = FACES) -> Fraction:
+    """Probabilidade exata de o total ser PAR"""
+    contagens = total_counts(dice, faces)
+    return Fraction(int(contagens[0::2].sum()), int(contagens.sum()))
+
+@lru_cache(maxsize=None)
+def expected_statistics(dice: int = 2, faces: int = FACES) -> Dict[str, float]:
+    """Valores teóricos das chaves de calculate_statistics (por jogada)"""
+    contagens = total_counts(dice, faces)
+    n = int(contagens.sum())
+    totais = range(len(contagens))
+    media = Fraction(sum(t * int(c) for t, c in zip(totais, contagens)), n)
+    segundo_momento = Fraction(sum(t * t * int(c) for t, c in zip(totais, contagens)), n)
+    par = parity_probability(dice, faces)
+    return {
+        'perc_pares': float(par * 100),
+        'perc_impares': float((1 - par) * 100),
+        'media_total': float(media),
+        'variancia_total': float(segundo_momento - media * media)
+    }
+
+@lru_cache(maxsize=256)
+def window_count_pmf(window_size: int, p: float = 0.5) -> np.ndarray:
+    """
+    Distribuição binomial da contagem de PARes numa janela
+
+    Returns:
+        Array de tamanho window_size + 1 com P(k pares), k = 0..window_size
+    """
+    if window_size <= 0:
+        raise ValueError("Tamanho da janela deve ser positivo")
+    k = np.arange(window_size + 1)
+    if p in (0.0, 1.0):
+        pmf = (k == (window_size if p else 0)).astype(float)
+        return _frozen(pmf)
+    # Em log para não estourar com janelas grandes
+    log_comb = np.array([math.lgamma(window_size + 1) - math.lgamma(i + 1) - math.lgamma(window_size - i + 1)
+                         for i in range(window_size + 1)])
+    return _frozen(np.exp(log_comb + k * math.log(p) + (window_size - k) * math.log1p(-p)))
+
+def trend_probabilities(window_size: int, p: float = 0.5) -> Dict[str, float]:
+    """
+    Probabilidade de cada rótulo de analyze_trends numa janela
+
+    Empates contam como ÍMPAR, como em analyze_trends.
+    """
+    pmf = window_count_pmf(window_size, p)
+    k = np.arange(window_size + 1)
+    par = float(pmf[2 * k > window_size].sum())
+    return {'par': par, 'impar': 1.0 - par, 'empate': float(pmf[2 * k == window_size].sum())}
+
+def streak_length_pmf(max_length: int, p: float = 0.5) -> np.ndarray:
+    """
+    Distribuição do comprimento de uma sequência (geométrica)
+
+    Returns:
+        Array indexado pelo comprimento (0..max_length) com P(comprimento = k)
+        para uma sequência do resultado de probabilidade p já iniciada
+    """
+    k = np.arange(max_length + 1)
+    pmf = np.where(k > 0, p ** np.maximum(k - 1, 0) * (1 - p), 0.0)
+    return pmf
+
+def expected_streaks(n: int, max_length: int, p: float = 0.5) -> np.ndarray:
+    """
+    Número esperado de sequências com comprimento >= k em n jogadas
+
+    Uma sequência começa no início ou logo após o outro resultado, então
+    E = p^k * (1 + (n - k) * (1 - p)) para k <= n.
+
+    Returns:
+        Array indexado por k (0..max_length)
+    """
+    k = np.arange(max_length + 1)
+    esperado = p ** k * (1 + np.maximum(n - k, 0) * (1 - p))
+    esperado[k > n] = 0.0
+    esperado[0] = np.nan
+    return esperado
+
+@lru_cache(maxsize=1024)
+def prob_longest_streak_at_least(n: int, k: int, p: float = 0.5) -> float:
+    """
+    Probabilidade de haver uma sequência de comprimento >= k em n jogadas
+
+    Cadeia de Markov sobre o comprimento da sequência em curso (0..k-1),
+    elevada à n-ésima potência por quadrados: O(k³ log n).
+    """
+    if k <= 0:
+        return 1.0
+    if k > n:
+        return 0.0
+    transicao = np.zeros((k, k))
+    transicao[0, :] = 1 - p
+    transicao[np.arange(1, k), np.arange(k - 1)] = p
+    sobrevivencia = np.linalg.matrix_power(transicao, n)[:, 0].sum()
+    return float(min(max(1.0 - sobrevivencia, 0.0), 1.0))
+
+def longest_streak_distribution(n: int, max_length: int, p: float = 0.5) -> np.ndarray:
+    """P(maior sequência >= k) para k = 0..max_length"""
+    return np.array([prob_longest_streak_at_least(n, k, p) for k in range(max_length + 1)])
+
+def chi2_sf(x, dof: int) -> np.ndarray:
+    """
+    Cauda superior da qui-quadrado (p-valor), vetorizada em x
+
+    Usa a forma fechada da gama incompleta regularizada para dof inteiro.
+    """
+    if dof <= 0:
+        raise ValueError("Graus de liberdade devem ser positivos")
+    metade = np.minimum(np.asarray(x, dtype=float) / 2, _CHI2_MAX_HALF)
+    if dof % 2 == 0:
+        termo = np.ones_like(metade)
+        soma = np.ones_like(metade)
+        for i in range(1, dof // 2):
+            termo = termo * metade / i
+            soma += termo
+        return np.exp(-metade) * soma
+
+    raiz = np.sqrt(metade)
+    soma = _erfc(raiz)
+    termo = raiz * np.exp(-metade) * 2 / math.sqrt(math.pi)
+    for i in range(1, (dof - 1) // 2 + 1):
+        soma += termo
+        termo = termo * metade / (i + 0.5)
+    return soma
+
+def chi_square(observed, probs) -> Tuple[np.ndarray, int]:
+    """
+    Estatística qui-quadrado de aderência, vetorizada nas linhas
+
+    Args:
+        observed: Contagens com forma (..., k)
+        probs: Probabilidades esperadas das k categorias
+
+    Returns:
+        (qui-quadrado por linha, graus de liberdade); categorias com
+        probabilidade zero são ignoradas
+    """
+    observed = np.asarray(observed, dtype=float)
+    probs = np.asarray(probs, dtype=float)
+    usadas = probs > 0
+    observed, probs = observed[..., usadas], probs[usadas]
+    n = observed.sum(axis=-1, keepdims=True)
+    esperado = n * probs
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi2 = np.where(esperado > 0, (observed - esperado) ** 2 / esperado, 0.0).sum(axis=-1)
+    return chi2, len(probs) - 1
+
+def z_scores(counts, n, p) -> np.ndarray:
+    """Escore z de contagens binomiais: (x - n p) / sqrt(n p (1 - p))"""
+    counts = np.asarray(counts, dtype=float)
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (counts - n * p) / np.sqrt(n * p * (1 - p))
+
+def two_sided_p(z) -> np.ndarray:
+    """p-valor bicaudal de escores z"""
+    return _erfc(np.abs(np.asarray(z, dtype=float)) / math.sqrt(2))
+
+def goodness_of_fit(stats: RunningStatistics) -> Dict[str, Dict[str, float]]:
+    """
+    Compara um acumulador com as distribuições exatas de dois dados justos
+
+    Returns:
+        Dict com 'totais', 'dado1', 'dado2' e 'conjunto' (qui-quadrado,
+        graus de liberdade e p-valor) e 'paridade' e 'media' (escore z e
+        p-valor); vazio sem jogadas
+    """
+    n = stats.total_jogadas
+    if not n:
+        return {}
+
+    face = np.full(FACES, 1 / FACES)
+    conjunto = np.full(FACES * FACES, 1 / FACES ** 2)
+    # Uma linha por teste com o mesmo número de categorias, de uma vez só
+    faces_chi2, faces_gl = chi_square(np.stack([stats.hist_dado1[1:], stats.hist_dado2[1:]]), face)
+    faces_p = chi2_sf(faces_chi2, faces_gl)
+    totais_chi2, totais_gl = chi_square(stats.hist_totais, total_distribution())
+    conjunto_chi2, conjunto_gl = chi_square(stats.joint_counts.ravel(), conjunto)
+
+    esperado = expected_statistics()
+    p_par = float(parity_probability())
+    z_par = float(z_scores(stats.pares, n, p_par))
+    z_media = (stats.soma_totais / n - esperado['media_total']) / math.sqrt(esperado['variancia_total'] / n)
+
+    def teste(chi2, gl, p_valor):
+        return {'chi2': float(chi2), 'gl': gl, 'p_valor': float(p_valor)}
+
+    return {
+        'totais': teste(totais_chi2, totais_gl, chi2_sf(totais_chi2, totais_gl)),
+        'dado1': teste(faces_chi2[0], faces_gl, faces_p[0]),
+        'dado2': teste(faces_chi2[1], faces_gl, faces_p[1]),
+        'conjunto': teste(conjunto_chi2, conjunto_gl, chi2_sf(conjunto_chi2, conjunto_gl)),
+        'paridade': {'z': z_par, 'p_valor': float(two_sided_p(z_par))},
+        'media': {'z': float(z_media), 'p_valor': float(two_sided_p(z_media))}
+    }
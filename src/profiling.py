@@ -0,0 +1,178 @@
+"""
+Módulo de perfilamento - Spans de tempo leves e exportação em Chrome trace
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict, List
+
+# Locais de alocação guardados por snapshot de span de nível superior
+SNAPSHOT_TOP = 5
+
+class _NullSpan:
+    """Span usado com o perfilamento desligado: não faz nada"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """Mede um trecho: tempo, thread e variação de memória"""
+
+    __slots__ = ('profiler', 'name', 'args', 'start', 'mem_start', 'snapshot', 'depth')
+
+    def __init__(self, profiler: 'Profiler', name: str, args: dict):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        local = self.profiler._local
+        self.depth = getattr(local, 'depth', 0)
+        local.depth = self.depth + 1
+        self.snapshot = None
+        self.mem_start = None
+        if tracemalloc.is_tracing():
+            self.mem_start = tracemalloc.get_traced_memory()[0]
+            if self.depth == 0 and self.profiler.snapshots:
+                self.snapshot = tracemalloc.take_snapshot()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        fim = time.perf_counter_ns()
+        self.profiler._local.depth = self.depth
+        registro = {
+            'name': self.name,
+            'start_ns': self.start,
+            'dur_ns': fim - self.start,
+            'tid': threading.get_ident(),
+            'thread': threading.current_thread().name,
+            'args': dict(self.args)
+        }
+        if self.mem_start is not None:
+            atual, pico = tracemalloc.get_traced_memory()
+            registro['args']['mem_delta_kb'] = round((atual - self.mem_start) / 1024, 1)
+            registro['args']['mem_peak_kb'] = round(pico / 1024, 1)
+            if self.snapshot is not None:
+                diferencas = tracemalloc.take_snapshot().compare_to(self.snapshot, 'lineno')
+                registro['args']['top_alloc'] = [str(d) for d in diferencas[:SNAPSHOT_TOP]]
+        self.profiler._record(registro)
+        return False
+
+class Profiler:
+    """
+    Coletor de spans de tempo
+
+    Desligado por padrão: span() devolve um objeto nulo compartilhado, então
+    o custo é uma chamada de função por trecho instrumentado.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.snapshots = False
+        self._spans: List[dict] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+        self._origin_ns = time.perf_counter_ns()
+
+    def enable(self, memory: bool = True, snapshots: bool = True):
+        """
+        Liga o perfilamento
+
+        Args:
+            memory: Liga o tracemalloc e registra variação e pico de memória
+            snapshots: Compara snapshots do tracemalloc em spans de nível superior
+        """
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.snapshots = memory and snapshots
+        self.enabled = True
+
+    def disable(self):
+        """Desliga o perfilamento (spans já coletados são mantidos)"""
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def clear(self):
+        """Descarta os spans coletados"""
+        with self._lock:
+            self._spans.clear()
+
+    def span(self, name: str, **args):
+        """Context manager que mede o trecho (nulo se desligado)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def _record(self, registro: dict):
+        with self._lock:
+            self._spans.append(registro)
+
+    @property
+    def spans(self) -> List[dict]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Total (ms) e contagem de chamadas por nome de span"""
+        resumo = {}
+        for registro in self.spans:
+            item = resumo.setdefault(registro['name'], {'total_ms': 0.0, 'count': 0})
+            item['total_ms'] += registro['dur_ns'] / 1e6
+            item['count'] += 1
+        return resumo
+
+    def format_summary(self, limit: int = 5) -> str:
+        """Resumo curto para a barra de status, dos trechos mais demorados"""
+        resumo = sorted(self.summary().items(), key=lambda kv: -kv[1]['total_ms'])
+        return " | ".join(f"{nome} {dados['total_ms']:.1f}ms" for nome, dados in resumo[:limit])
+
+    def export_chrome_trace(self, path: str) -> str:
+        """
+        Grava os spans no formato Chrome trace (chrome://tracing, Perfetto)
+
+        Returns:
+            Caminho do arquivo gravado
+        """
+        pid = os.getpid()
+        eventos = []
+        threads = {}
+        for registro in self.spans:
+            threads[registro['tid']] = registro['thread']
+            eventos.append({
+                'name': registro['name'],
+                'cat': registro['name'].split('.')[0],
+                'ph': 'X',
+                'ts': (registro['start_ns'] - self._origin_ns) / 1000,
+                'dur': registro['dur_ns'] / 1000,
+                'pid': pid,
+                'tid': registro['tid'],
+                'args': registro['args']
+            })
+        for tid, nome in threads.items():
+            eventos.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                            'args': {'name': nome}})
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        return path
+
+# Perfilador global usado por todos os módulos
+PROFILER = Profiler()
+
+def span(name: str, **args):
+    """Atalho para PROFILER.span"""
+    return PROFILER.span(name, **args)
@@ -0,0 +1,245 @@
+"""
+Módulo da lista de resultados virtualizada - Renderiza só as linhas visíveis
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, Optional
+
+import numpy as np
+
+from store import ResultsView
+
+# Jogadas examinadas por vez na busca por total
+SEARCH_CHUNK = 1 << 20
+
+class VirtualResultsView(ttk.Frame):
+    """
+    Lista de jogadas que formata apenas as linhas da área visível
+
+    O conteúdo vem de uma ResultsView (sem cópia do histórico); memória e
+    tempo de renderização dependem da altura da janela, não do número de
+    jogadas.
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.results: Optional[ResultsView] = None
+        self.top = 0
+        self.visible_rows = 15
+        self.selected = None
+
+        self._create_toolbar()
+
+        body = ttk.Frame(self, style='Neon.TFrame')
+        body.pack(fill='both', expand=True)
+
+        self.text = tk.Text(body,
+                            bg='#1a1a1a',
+                            fg='#00ff00',
+                            insertbackground='#00ff00',
+                            selectbackground='#00ffea',
+                            font=('Consolas', 10),
+                            wrap=tk.NONE,
+                            height=self.visible_rows,
+                            cursor='arrow')
+        self.scrollbar = ttk.Scrollbar(body, orient='vertical', command=self._on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
+        self.text.pack(side='left', fill='both', expand=True)
+
+        # Configurar tags para formatação colorida
+        self.text.tag_configure('header', foreground='#00ffea', font=('Consolas', 11, 'bold'))
+        self.text.tag_configure('even', foreground='#00ff00')
+        self.text.tag_configure('odd', foreground='#ff4444')
+        self.text.tag_configure('selected', background='#004d47')
+
+        self.stats_label = tk.Label(self,
+                                    bg='#0d0d0d',
+                                    fg='#ffaa00',
+                                    font=('Consolas', 10),
+                                    justify='left',
+                                    anchor='w')
+        self.stats_label.pack(fill='x')
+
+        self.text.bind('<Configure>', self._on_resize)
+        self.text.bind('<MouseWheel>', self._on_mousewheel)
+        self.text.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.text.bind('<Button-5>', lambda e: self.scroll(3))
+        for tecla, delta in (('<Up>', -1), ('<Down>', 1)):
+            self.text.bind(tecla, lambda e, d=delta: self._scroll_and_break(d))
+        self.text.bind('<Prior>', lambda e: self._scroll_and_break(-self.visible_rows))
+        self.text.bind('<Next>', lambda e: self._scroll_and_break(self.visible_rows))
+        self.text.bind('<Home>', lambda e: self._goto_and_break(0))
+        self.text.bind('<End>', lambda e: self._goto_and_break(self._max_top()))
+
+        self.render()
+
+    def _create_toolbar(self):
+        """Cria os campos de ir para jogada e buscar por total"""
+        toolbar = ttk.Frame(self, style='Neon.TFrame')
+        toolbar.pack(fill='x', pady=(0, 5))
+
+        tk.Label(toolbar, text="RESULTADOS DAS JOGADAS", font=('Consolas', 11, 'bold'),
+                 fg='#00ffea', bg='#0d0d0d').pack(side='left')
+
+        self.entry_total = ttk.Entry(toolbar, width=5, style='Neon.TEntry')
+        self.entry_total.pack(side='right')
+        self.entry_total.bind('<Return>', lambda e: self._search_from_entry())
+        ttk.Label(toolbar, text="Buscar total:", style='Neon.TLabel').pack(side='right', padx=(15, 5))
+
+        self.entry_jump = ttk.Entry(toolbar, width=10, style='Neon.TEntry')
+        self.entry_jump.pack(side='right')
+        self.entry_jump.bind('<Return>', lambda e: self._jump_from_entry())
+        ttk.Label(toolbar, text="Ir para jogada:", style='Neon.TLabel').pack(side='right', padx=5)
+
+    def set_results(self, results: ResultsView, stats: Dict[str, float] = None):
+        """Troca os resultados exibidos e as estatísticas do rodapé"""
+        self.results = results
+        self.top = 0
+        self.selected = None
+        self.stats_label.config(text=format_statistics(stats) if stats else "")
+        self.render()
+
+    def update_results(self, results: ResultsView, stats: Dict[str, float] = None):
+        """
+        Atualiza os resultados exibidos mantendo a posição e a seleção
+
+        Para o feed ao vivo: se a lista estava no fim, segue as jogadas
+        novas; se o usuário rolou para cima, a área visível não muda.
+        """
+        no_fim = self.top >= self._max_top()
+        self.results = results
+        if self.selected is not None and self.selected >= len(self):
+            self.selected = None
+        self.top = self._max_top() if no_fim else min(self.top, self._max_top())
+        self.stats_label.config(text=format_statistics(stats) if stats else "")
+        self.render()
+
+    def clear(self):
+        """Remove os resultados exibidos"""
+        self.set_results(None)
+
+    def __len__(self) -> int:
+        return len(self.results) if self.results is not None else 0
+
+    def render(self):
+        """Formata e desenha apenas as linhas visíveis"""
+        n = len(self)
+        fim = min(self.top + self.visible_rows, n)
+
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        if n:
+            dado1 = self.results.dado1[self.top:fim].tolist()
+            dado2 = self.results.dado2[self.top:fim].tolist()
+            for i, (d1, d2) in enumerate(zip(dado1, dado2), self.top + 1):
+                tags = ('even' if i % 2 == 0 else 'odd',)
+                if i - 1 == self.selected:
+                    tags += ('selected',)
+                self.text.insert(tk.END, format_row(i, d1, d2), tags)
+        self.text.config(state='disabled')
+
+        if n:
+            self.scrollbar.set(self.top / n, fim / n)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows: int):
+        """Rola a lista em rows linhas (negativo para cima)"""
+        self.goto(self.top + rows)
+
+    def goto(self, top: int):
+        """Posiciona a primeira linha visível no índice top (0-based)"""
+        top = max(0, min(int(top), self._max_top()))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def jump_to(self, jogada: int):
+        """Mostra e destaca a jogada (1-based)"""
+        if not 1 <= jogada <= len(self):
+            return False
+        self.selected = jogada - 1
+        self.top = max(0, min(self.selected - self.visible_rows // 2, self._max_top()))
+        self.render()
+        return True
+
+    def search_total(self, total: int) -> Optional[int]:
+        """
+        Procura a próxima jogada com o total dado, a partir da selecionada
+
+        Returns:
+            Número da jogada encontrada (1-based) ou None
+        """
+        n = len(self)
+        if not n:
+            return None
+        inicio = 0 if self.selected is None else self.selected + 1
+
+        # Busca até o fim e depois recomeça do início, em blocos vetorizados
+        for faixa_inicio, faixa_fim in ((inicio, n), (0, min(inicio, n))):
+            for bloco in range(faixa_inicio, faixa_fim, SEARCH_CHUNK):
+                bloco_fim = min(bloco + SEARCH_CHUNK, faixa_fim)
+                totais = self.results.dado1[bloco:bloco_fim] + self.results.dado2[bloco:bloco_fim]
+                achados = np.flatnonzero(totais == total)
+                if len(achados):
+                    jogada = bloco + int(achados[0]) + 1
+                    self.jump_to(jogada)
+                    return jogada
+        return None
+
+    def _max_top(self) -> int:
+        return max(len(self) - self.visible_rows, 0)
+
+    def _jump_from_entry(self):
+        try:
+            self.jump_to(int(self.entry_jump.get()))
+        except ValueError:
+            self.bell()
+
+    def _search_from_entry(self):
+        try:
+            achado = self.search_total(int(self.entry_total.get()))
+        except ValueError:
+            achado = None
+        if achado is None:
+            self.bell()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == 'moveto':
+            self.goto(float(args[1]) * len(self))
+        elif args[0] == 'scroll':
+            passo = self.visible_rows if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * passo)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def _scroll_and_break(self, rows: int):
+        self.scroll(rows)
+        return 'break'
+
+    def _goto_and_break(self, top: int):
+        self.goto(top)
+        return 'break'
+
+    def _on_resize(self, event):
+        altura_linha = max(int(self.text.tk.call('font', 'metrics', self.text.cget('font'), '-linespace')), 1)
+        linhas = max(event.height // altura_linha, 1)
+        if linhas != self.visible_rows:
+            self.visible_rows = linhas
+            self.top = min(self.top, self._max_top())
+            self.render()
+
+def format_row(jogada: int, dado1: int, dado2: int) -> str:
+    """Formata a linha de uma jogada"""
+    total = dado1 + dado2
+    resultado = 'PAR' if total % 2 == 0 else 'ÍMPAR'
+    return f"Jogada {jogada:2d}: Dados ({dado1}, {dado2}) | Total: {total:2d} | Resultado: {resultado}\n"
+
+def format_statistics(stats: Dict[str, float]) -> str:
+    """Formata o bloco de estatísticas do rodapé"""
+    return (f"ESTATÍSTICAS:  Total de Jogadas: {stats['total_jogadas']}  |  "
+            f"Pares: {stats['pares']} ({stats['perc_pares']:.1f}%)  |  "
+            f"Ímpares: {stats['impares']} ({stats['perc_impares']:.1f}%)  |  "
+            f"Média dos Totais: {stats['media_total']:.2f}")
@@ -0,0 +1,140 @@
+"""
+Módulo de estatísticas incrementais - Acumulador O(1) por consulta
+"""
+from typing import Dict
+
+import numpy as np
+
+# Total e paridade de cada célula (dado1 - 1, dado2 - 1) da tabela 6x6
+_FACES = np.arange(1, 7)
+CELL_TOTALS = _FACES[:, None] + _FACES[None, :]
+CELL_PAR = CELL_TOTALS % 2 == 0
+
+class RunningStatistics:
+    """
+    Acumula contagens, somas e histogramas das jogadas
+
+    Cada atualização custa O(tamanho do lote) e cada consulta custa O(1),
+    independente do tamanho do histórico. Acumuladores podem ser somados
+    e subtraídos para compor janelas.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Zera todos os acumuladores"""
+        self.total_jogadas = 0
+        self.pares = 0
+        self.soma_totais = 0
+        self.soma_quadrados = 0
+        self.hist_totais = np.zeros(13, dtype=np.int64)
+        self.hist_dado1 = np.zeros(7, dtype=np.int64)
+        self.hist_dado2 = np.zeros(7, dtype=np.int64)
+        self.joint_counts = np.zeros((6, 6), dtype=np.int64)
+
+    @classmethod
+    def from_results(cls, dado1: np.ndarray, dado2: np.ndarray) -> 'RunningStatistics':
+        """Cria um acumulador já alimentado com as colunas dadas"""
+        stats = cls()
+        stats.update(dado1, dado2)
+        return stats
+
+    @classmethod
+    def from_joint_counts(cls, counts: np.ndarray) -> 'RunningStatistics':
+        """Cria um acumulador a partir da tabela 6x6 de contagens (dado1, dado2)"""
+        stats = cls()
+        stats.add_joint_counts(counts)
+        return stats
+
+    def update(self, dado1: np.ndarray, dado2: np.ndarray):
+        """Adiciona um lote de jogadas"""
+        if not len(dado1):
+            return
+        celulas = (np.asarray(dado1, dtype=np.intp) - 1) * 6 + (np.asarray(dado2, dtype=np.intp) - 1)
+        self.add_joint_counts(np.bincount(celulas, minlength=36).reshape(6, 6))
+
+    def update_one(self, dado1: int, dado2: int):
+        """Adiciona uma única jogada sem passar por arrays temporários"""
+        total = dado1 + dado2
+        self.total_jogadas += 1
+        self.pares += total % 2 == 0
+        self.soma_totais += total
+        self.soma_quadrados += total * total
+        self.hist_totais[total] += 1
+        self.hist_dado1[dado1] += 1
+        self.hist_dado2[dado2] += 1
+        self.joint_counts[dado1 - 1, dado2 - 1] += 1
+
+    def add_joint_counts(self, counts: np.ndarray, sign: int = 1):
+        """Soma (ou subtrai, com sign=-1) uma tabela 6x6 de contagens"""
+        counts = np.asarray(counts, dtype=np.int64).reshape(6, 6) * sign
+        self.total_jogadas += int(counts.sum())
+        self.pares += int(counts[CELL_PAR].sum())
+        self.soma_totais += int((counts * CELL_TOTALS).sum())
+        self.soma_quadrados += int((counts * CELL_TOTALS ** 2).sum())
+        self.hist_totais += np.bincount(CELL_TOTALS.ravel(), weights=counts.ravel(),
+                                        minlength=13).astype(np.int64)
+        self.hist_dado1[1:] += counts.sum(axis=1)
+        self.hist_dado2[1:] += counts.sum(axis=0)
+        self.joint_counts += counts
+
+    def merge(self, other: 'RunningStatistics') -> 'RunningStatistics':
+        """Incorpora outro acumulador (ex.: de outro trecho do histórico)"""
+        self._combine(other, 1)
+        return self
+
+    def subtract(self, other: 'RunningStatistics') -> 'RunningStatistics':
+        """Remove um acumulador contido neste (ex.: rounds que saíram da janela)"""
+        self._combine(other, -1)
+        return self
+
+    def copy(self) -> 'RunningStatistics':
+        """Cópia independente do acumulador"""
+        return RunningStatistics().merge(self)
+
+    def __add__(self, other: 'RunningStatistics') -> 'RunningStatistics':
+        return self.copy().merge(other)
+
+    def __sub__(self, other: 'RunningStatistics') -> 'RunningStatistics':
+        return self.copy().subtract(other)
+
+    def _combine(self, other: 'RunningStatistics', sign: int):
+        self.total_jogadas += sign * other.total_jogadas
+        self.pares += sign * other.pares
+        self.soma_totais += sign * other.soma_totais
+        self.soma_quadrados += sign * other.soma_quadrados
+        self.hist_totais += sign * other.hist_totais
+        self.hist_dado1 += sign * other.hist_dado1
+        self.hist_dado2 += sign * other.hist_dado2
+        self.joint_counts += sign * other.joint_counts
+
+    @property
+    def impares(self) -> int:
+        return self.total_jogadas - self.pares
+
+    @property
+    def variancia_total(self) -> float:
+        """Variância populacional dos totais"""
+        if not self.total_jogadas:
+            return 0.0
+        media = self.soma_totais / self.total_jogadas
+        return max(self.soma_quadrados / self.total_jogadas - media * media, 0.0)
+
+    def to_dict(self) -> Dict[str, float]:
+        """Estatísticas no formato de BacBoAnalyzer.calculate_statistics"""
+        if not self.total_jogadas:
+            return {}
+        n = self.total_jogadas
+        return {
+            'total_jogadas': n,
+            'pares': self.pares,
+            'impares': self.impares,
+            'perc_pares': (self.pares / n) * 100,
+            'perc_impares': (self.impares / n) * 100,
+            'media_total': self.soma_totais / n,
+            'variancia_total': self.variancia_total
+        }
+
+    def __repr__(self) -> str:
+        return f"RunningStatistics({self.total_jogadas} jogadas, {self.pares} pares)"
@@ -0,0 +1,119 @@
+"""
+Módulo de sessão - Formato binário compacto para salvar e reabrir históricos
+
+Layout do arquivo (.vtbb):
+    MAGIC (8 bytes) | versão (uint16 LE) | tamanho do cabeçalho (uint32 LE)
+    cabeçalho JSON UTF-8, completado com espaços até múltiplo de 64 bytes
+    coluna dado1 (uint8 x total_jogadas) | coluna dado2 (uint8 x total_jogadas)
+"""
+import json
+import os
+import struct
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from running_stats import RunningStatistics
+from store import CHUNK_SIZE, ResultsStore, ResultsView
+
+MAGIC = b'VTBBSESS'
+VERSION = 1
+SESSION_EXTENSION = '.vtbb'
+
+# Regras do jogo gravadas no cabeçalho de toda sessão
+RULES = {'dados': 2, 'faces': 6, 'resultado': 'paridade do total'}
+
+_PREAMBLE = struct.Struct('<8sHI')
+_ALIGNMENT = 64
+
+def save_session(path: str, results: ResultsView, stats: Optional[RunningStatistics] = None,
+                 seed: Optional[int] = None) -> str:
+    """
+    Grava um histórico no formato binário de sessão
+
+    Args:
+        path: Caminho do arquivo
+        results: Histórico (ResultsStore/ResultsView)
+        stats: Acumulador do histórico (None calcula a partir das colunas)
+        seed: Semente usada para gerar o histórico, se conhecida
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    if stats is None:
+        stats = RunningStatistics.from_results(results.dado1, results.dado2)
+
+    header = {
+        'versao': VERSION,
+        'seed': seed,
+        'regras': RULES,
+        'total_jogadas': len(results),
+        'contagens': stats.joint_counts.tolist(),
+        'criado_em': datetime.now().isoformat(timespec='seconds')
+    }
+    dados_header = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    inicio_dados = _PREAMBLE.size + len(dados_header)
+    dados_header += b' ' * (-inicio_dados % _ALIGNMENT)
+
+    with open(path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(dados_header)))
+        f.write(dados_header)
+        for coluna in (results.dado1, results.dado2):
+            for inicio in range(0, len(coluna), CHUNK_SIZE * 16):
+                f.write(np.ascontiguousarray(coluna[inicio:inicio + CHUNK_SIZE * 16], dtype=np.uint8).data)
+    return path
+
+def read_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Lê o cabeçalho de uma sessão
+
+    Returns:
+        (cabeçalho, offset do início das colunas)
+    """
+    with open(path, 'rb') as f:
+        preambulo = f.read(_PREAMBLE.size)
+        if len(preambulo) < _PREAMBLE.size:
+            raise ValueError(f"Arquivo de sessão inválido: {path}")
+        magic, versao, tamanho = _PREAMBLE.unpack(preambulo)
+        if magic != MAGIC:
+            raise ValueError(f"Arquivo de sessão inválido: {path}")
+        if versao > VERSION:
+            raise ValueError(f"Versão de sessão não suportada: {versao}")
+        header = json.loads(f.read(tamanho).decode('utf-8'))
+
+    offset = _PREAMBLE.size + tamanho
+    esperado = offset + 2 * header['total_jogadas']
+    if os.path.getsize(path) < esperado:
+        raise ValueError(f"Arquivo de sessão truncado: {path}")
+    return header, offset
+
+def open_session(path: str, mmap: bool = True) -> Tuple[ResultsStore, RunningStatistics, Dict[str, Any]]:
+    """
+    Reabre uma sessão gravada por save_session
+
+    Com mmap=True as colunas são mapeadas do arquivo em modo somente
+    leitura: nada é carregado até ser acessado, e as estatísticas vêm das
+    contagens do cabeçalho. Adicionar jogadas copia o histórico para a memória.
+
+    Args:
+        path: Caminho do arquivo
+        mmap: Mapeia o arquivo em vez de lê-lo
+
+    Returns:
+        (histórico, acumulador de estatísticas, cabeçalho)
+    """
+    header, offset = read_header(path)
+    n = header['total_jogadas']
+
+    if n == 0:
+        dado1 = dado2 = np.empty(0, dtype=np.uint8)
+    elif mmap:
+        dados = np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(2, n))
+        dado1, dado2 = dados[0], dados[1]
+    else:
+        dados = np.fromfile(path, dtype=np.uint8, count=2 * n, offset=offset).reshape(2, n)
+        dado1, dado2 = dados[0], dados[1]
+
+    stats = RunningStatistics.from_joint_counts(np.asarray(header['contagens'], dtype=np.int64))
+    return ResultsStore.from_arrays(dado1, dado2), stats, header
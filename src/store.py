@@ -0,0 +1,196 @@
+"""
+Módulo de armazenamento - Histórico de jogadas em colunas compactas
+"""
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+# Capacidade é sempre ampliada em múltiplos deste bloco de jogadas
+CHUNK_SIZE = 1 << 16
+
+class GrowableArray:
+    """Array numpy com crescimento amortizado em blocos"""
+
+    def __init__(self, dtype, capacity: int = CHUNK_SIZE):
+        self.dtype = np.dtype(dtype)
+        self._data = np.empty(capacity, dtype=self.dtype)
+        self._size = 0
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> 'GrowableArray':
+        """Envolve um array existente sem copiá-lo (crescer depois gera cópia)"""
+        array = cls.__new__(cls)
+        array.dtype = values.dtype
+        array._data = values
+        array._size = len(values)
+        return array
+
+    def __len__(self) -> int:
+        return self._size
+
+    def view(self) -> np.ndarray:
+        """Retorna uma view (sem cópia) dos elementos válidos"""
+        return self._data[:self._size]
+
+    def append(self, value):
+        """Adiciona um elemento"""
+        self._reserve(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values: np.ndarray):
+        """Adiciona vários elementos de uma vez"""
+        values = np.asarray(values)
+        novo_tamanho = self._size + len(values)
+        self._reserve(novo_tamanho)
+        self._data[self._size:novo_tamanho] = values
+        self._size = novo_tamanho
+
+    def clear(self):
+        """Esvazia o array sem invalidar views já entregues"""
+        self._data = np.empty(CHUNK_SIZE, dtype=self.dtype)
+        self._size = 0
+
+    def _reserve(self, capacity: int):
+        """Garante capacidade, realocando em múltiplos de CHUNK_SIZE"""
+        if capacity <= len(self._data):
+            return
+        capacity = max(capacity, 2 * len(self._data))
+        capacity = -(-capacity // CHUNK_SIZE) * CHUNK_SIZE
+        data = np.empty(capacity, dtype=self.dtype)
+        data[:self._size] = self._data[:self._size]
+        # Views antigas continuam apontando para o buffer anterior, que não é mais escrito
+        self._data = data
+
+class ResultsView:
+    """
+    Visão de leitura sobre colunas de dados, compatível com a lista de dicts
+
+    Indexar retorna um dict no formato de BacBoAnalyzer.simulate_game e
+    fatiar retorna outra ResultsView que compartilha a memória.
+    """
+
+    def __init__(self, dado1: np.ndarray, dado2: np.ndarray):
+        self._dado1 = dado1
+        self._dado2 = dado2
+
+    @property
+    def dado1(self) -> np.ndarray:
+        return self._dado1
+
+    @property
+    def dado2(self) -> np.ndarray:
+        return self._dado2
+
+    @property
+    def total(self) -> np.ndarray:
+        """Soma dos dados, derivada sob demanda"""
+        return self.dado1 + self.dado2
+
+    @property
+    def par(self) -> np.ndarray:
+        """Máscara booleana das jogadas com total PAR"""
+        return ((self.dado1 ^ self.dado2) & 1) == 0
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Colunas no formato de BacBoAnalyzer.simulate_batch"""
+        dado1, dado2 = self.dado1, self.dado2
+        total = dado1 + dado2
+        return {'dado1': dado1, 'dado2': dado2, 'total': total, 'par': (total & 1) == 0}
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator['ResultsView']:
+        """Itera o conteúdo em views consecutivas de até chunk_size jogadas"""
+        dado1, dado2 = self.dado1, self.dado2
+        for inicio in range(0, len(dado1), chunk_size):
+            yield ResultsView(dado1[inicio:inicio + chunk_size], dado2[inicio:inicio + chunk_size])
+
+    def __len__(self) -> int:
+        return len(self.dado1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResultsView(self.dado1[index], self.dado2[index])
+        return _row(int(self.dado1[index]), int(self.dado2[index]))
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (_row(d1, d2) for d1, d2 in zip(self.dado1.tolist(), self.dado2.tolist()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} jogadas)"
+
+class ResultsStore(ResultsView):
+    """Histórico crescente de jogadas guardado em colunas uint8"""
+
+    def __init__(self, capacity: Optional[int] = None):
+        capacity = capacity or CHUNK_SIZE
+        self._col1 = GrowableArray(np.uint8, capacity)
+        self._col2 = GrowableArray(np.uint8, capacity)
+
+    @classmethod
+    def from_arrays(cls, dado1: np.ndarray, dado2: np.ndarray) -> 'ResultsStore':
+        """Cria um histórico apoiado diretamente nos arrays dados (sem cópia)"""
+        if len(dado1) != len(dado2):
+            raise ValueError("Colunas de dados com tamanhos diferentes")
+        store = cls.__new__(cls)
+        store._col1 = GrowableArray.from_array(np.asarray(dado1, dtype=np.uint8))
+        store._col2 = GrowableArray.from_array(np.asarray(dado2, dtype=np.uint8))
+        return store
+
+    @property
+    def dado1(self) -> np.ndarray:
+        return self._col1.view()
+
+    @property
+    def dado2(self) -> np.ndarray:
+        return self._col2.view()
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelas colunas válidas"""
+        return len(self._col1) * 2
+
+    def append(self, dado1: int, dado2: int):
+        """Adiciona uma jogada"""
+        self._col1.append(dado1)
+        self._col2.append(dado2)
+
+    def extend(self, dado1: np.ndarray, dado2: np.ndarray):
+        """Adiciona um lote de jogadas"""
+        if len(dado1) != len(dado2):
+            raise ValueError("Colunas de dados com tamanhos diferentes")
+        self._col1.extend(dado1)
+        self._col2.extend(dado2)
+
+    def clear(self):
+        """Remove todas as jogadas"""
+        self._col1.clear()
+        self._col2.clear()
+
+def as_view(results) -> ResultsView:
+    """
+    Converte resultados para ResultsView
+
+    Args:
+        results: ResultsView/ResultsStore, colunas de simulate_batch ou lista de dicts
+
+    Returns:
+        ResultsView sobre os mesmos dados (cópia apenas para lista de dicts)
+    """
+    if isinstance(results, ResultsView):
+        return results
+    if isinstance(results, dict):
+        return ResultsView(np.asarray(results['dado1'], dtype=np.uint8),
+                           np.asarray(results['dado2'], dtype=np.uint8))
+    dado1 = np.fromiter((r['dado1'] for r in results), dtype=np.uint8, count=len(results))
+    dado2 = np.fromiter((r['dado2'] for r in results), dtype=np.uint8, count=len(results))
+    return ResultsView(dado1, dado2)
+
+def _row(dado1: int, dado2: int) -> Dict:
+    """Monta o dict de uma jogada no formato de BacBoAnalyzer.simulate_game"""
+    total = dado1 + dado2
+    return {
+        'dado1': dado1,
+        'dado2': dado2,
+        'total': total,
+        'resultado': 'PAR' if total % 2 == 0 else 'ÍMPAR'
+    }
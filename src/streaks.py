@@ -0,0 +1,196 @@
+"""
+Módulo de sequências - Run-length vetorizado e índice incremental de sequências
+"""
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Jogadas processadas por vez ao alimentar o índice
+STREAK_BLOCK = 1 << 20
+
+# Maiores sequências guardadas com posição, por valor
+TOP_KEEP = 100
+
+def run_lengths(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Codificação run-length vetorizada
+
+    Returns:
+        (inícios 0-based, comprimentos, valores) de cada sequência
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if not n:
+        vazio = np.zeros(0, dtype=np.int64)
+        return vazio, vazio.copy(), values[:0]
+    inicios = np.empty(1, dtype=np.int64)
+    inicios[0] = 0
+    inicios = np.concatenate([inicios, np.flatnonzero(values[1:] != values[:-1]) + 1])
+    comprimentos = np.diff(np.append(inicios, n))
+    return inicios, comprimentos, values[inicios]
+
+def find_streaks(values: np.ndarray, value: int, min_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Todas as sequências de value com comprimento >= min_length
+
+    Returns:
+        (inícios 0-based, comprimentos)
+    """
+    inicios, comprimentos, valores = run_lengths(values)
+    selecionadas = (valores == value) & (comprimentos >= min_length)
+    return inicios[selecionadas], comprimentos[selecionadas]
+
+class StreakIndex:
+    """
+    Índice incremental das sequências de uma série categórica
+
+    Guarda o histograma de comprimentos por valor, as TOP_KEEP maiores
+    sequências de cada valor com a posição e a sequência em aberto (a
+    última, que ainda pode crescer). Consultas custam O(maior sequência),
+    independente do tamanho do histórico; alimentar custa O(lote).
+    """
+
+    def __init__(self, n_values: int, top_keep: int = TOP_KEEP):
+        self.n_values = n_values
+        self.top_keep = top_keep
+        self.reset()
+
+    def reset(self):
+        """Esvazia o índice"""
+        self.n = 0
+        self.hist = np.zeros((self.n_values, 64), dtype=np.int64)
+        # Heap mínimo por valor com (comprimento, -início) das maiores sequências fechadas
+        self._top: List[List[Tuple[int, int]]] = [[] for _ in range(self.n_values)]
+        self.open_value = -1
+        self.open_start = 0
+        self.open_length = 0
+
+    def push(self, value: int):
+        """Adiciona um único valor sem passar por arrays"""
+        if self.open_length and value == self.open_value:
+            self.open_length += 1
+        else:
+            if self.open_length:
+                self._close_one(self.open_value, self.open_start, self.open_length)
+            self.open_value, self.open_start, self.open_length = value, self.n, 1
+        self.n += 1
+
+    def extend(self, values: np.ndarray):
+        """Adiciona um lote de valores, em blocos de STREAK_BLOCK"""
+        values = np.asarray(values)
+        for inicio in range(0, len(values), STREAK_BLOCK):
+            self._extend_block(values[inicio:inicio + STREAK_BLOCK])
+
+    def _extend_block(self, values: np.ndarray):
+        if not len(values):
+            return
+        inicios, comprimentos, valores = run_lengths(values)
+        inicios += self.n
+        valores = valores.astype(np.int64)
+
+        if self.open_length:
+            if valores[0] == self.open_value:
+                # A sequência em aberto continua no novo bloco
+                inicios[0] = self.open_start
+                comprimentos[0] += self.open_length
+            else:
+                inicios = np.concatenate([[self.open_start], inicios])
+                comprimentos = np.concatenate([[self.open_length], comprimentos])
+                valores = np.concatenate([[self.open_value], valores])
+
+        # Todas menos a última estão fechadas
+        self._close(inicios[:-1], comprimentos[:-1], valores[:-1])
+        self.open_value = int(valores[-1])
+        self.open_start = int(inicios[-1])
+        self.open_length = int(comprimentos[-1])
+        self.n += len(values)
+
+    def _grow_hist(self, max_length: int):
+        if max_length >= self.hist.shape[1]:
+            largura = 1 << int(max_length).bit_length()
+            hist = np.zeros((self.n_values, largura), dtype=np.int64)
+            hist[:, :self.hist.shape[1]] = self.hist
+            self.hist = hist
+
+    def _close_one(self, value: int, start: int, length: int):
+        self._grow_hist(length)
+        self.hist[value, length] += 1
+        self._offer(value, start, length)
+
+    def _close(self, inicios: np.ndarray, comprimentos: np.ndarray, valores: np.ndarray):
+        if not len(comprimentos):
+            return
+        self._grow_hist(int(comprimentos.max()))
+        largura = self.hist.shape[1]
+        self.hist += np.bincount(valores * largura + comprimentos,
+                                 minlength=self.n_values * largura).reshape(self.n_values, largura)
+
+        for valor in np.unique(valores).tolist():
+            heap = self._top[valor]
+            minimo = heap[0][0] if len(heap) >= self.top_keep else 0
+            candidatas = np.flatnonzero((valores == valor) & (comprimentos >= minimo))
+            if len(candidatas) > self.top_keep:
+                # Só as top_keep maiores do lote podem entrar no heap
+                maiores = np.argpartition(-comprimentos[candidatas], self.top_keep - 1)[:self.top_keep]
+                candidatas = np.sort(candidatas[maiores])
+            for inicio, comprimento in zip(inicios[candidatas].tolist(), comprimentos[candidatas].tolist()):
+                self._offer(valor, inicio, comprimento)
+
+    def _offer(self, value: int, start: int, length: int):
+        heap = self._top[value]
+        item = (length, -start)
+        if len(heap) < self.top_keep:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def histogram(self, value: int, include_open: bool = True) -> np.ndarray:
+        """
+        Quantidade de sequências de value por comprimento
+
+        Returns:
+            Array indexado pelo comprimento (posição 0 sempre zero)
+        """
+        hist = self.hist[value].copy()
+        if include_open and self.open_length and self.open_value == value:
+            if self.open_length >= len(hist):
+                hist = np.append(hist, np.zeros(self.open_length - len(hist) + 1, dtype=np.int64))
+            hist[self.open_length] += 1
+        comprimentos = np.flatnonzero(hist)
+        return hist[:comprimentos[-1] + 1] if len(comprimentos) else hist[:1]
+
+    def count_at_least(self, value: int, min_length: int, include_open: bool = True) -> int:
+        """Quantidade de sequências de value com comprimento >= min_length"""
+        return int(self.histogram(value, include_open)[max(min_length, 1):].sum())
+
+    def longest(self, value: Optional[int] = None, top: int = 1) -> List[Dict[str, int]]:
+        """
+        Maiores sequências com as posições (incluindo a em aberto)
+
+        Args:
+            value: Valor da sequência (None para todos)
+            top: Quantidade de sequências (até top_keep)
+
+        Returns:
+            Lista de dicts 'valor', 'inicio' (jogada 1-based) e 'comprimento',
+            da maior para a menor; empates pela mais antiga
+        """
+        valores = range(self.n_values) if value is None else [value]
+        candidatas = [(comprimento, -negativo, v) for v in valores
+                      for comprimento, negativo in self._top[v]]
+        if self.open_length and self.open_value in valores:
+            candidatas.append((self.open_length, self.open_start, self.open_value))
+        candidatas.sort(key=lambda c: (-c[0], c[1]))
+        return [{'valor': v, 'inicio': inicio + 1, 'comprimento': comprimento}
+                for comprimento, inicio, v in candidatas[:top]]
+
+    @property
+    def current(self) -> Optional[Dict[str, int]]:
+        """Sequência em aberto (a das últimas jogadas) ou None se vazio"""
+        if not self.open_length:
+            return None
+        return {'valor': self.open_value, 'inicio': self.open_start + 1, 'comprimento': self.open_length}
+
+    def __repr__(self) -> str:
+        return f"StreakIndex({self.n} valores, atual={self.current})"
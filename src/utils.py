@@ -2,14 +2,23 @@
 Módulo de utilitários - Sons, exportação, helpers
 """
 import os
-import csv
+import contextlib
 import json
+import queue
+import time
 from datetime import datetime
+from typing import Optional
+
+# numpy, store, profiling e os módulos de compressão são importados só na
+# exportação, para não pesar na abertura da interface
 try:
     import winsound
 except ImportError:
     winsound = None
 
+# Buffer de escrita dos arquivos exportados sem compressão
+WRITE_BUFFER = 1 << 20
+
 class SoundManager:
     """Gerenciador de efeitos sonoros"""
     
@@ -45,105 +54,422 @@ class SoundManager:
         pass
 
 class FileExporter:
-    """Gerencia exportação de dados"""
+    """Gerencia exportação de dados em blocos, com compressão opcional"""
     
-    def __init__(self):
+    FORMATS = ('txt', 'csv', 'ndjson')
+    
+    # Extensão de arquivo de cada compressão suportada
+    COMPRESSIONS = {'gzip': '.gz', 'bz2': '.bz2', 'xz': '.xz', 'zstd': '.zst'}
+    
+    def __init__(self, chunk_size: Optional[int] = None):
         self.export_dir = "exports/"
-        self._ensure_export_dir()
+        # None usa store.CHUNK_SIZE
+        self.chunk_size = chunk_size
         
     def _ensure_export_dir(self):
         """Garante que o diretório de export existe"""
         if not os.path.exists(self.export_dir):
             os.makedirs(self.export_dir)
             
-    def export_to_file(self, data: list, format_type: str = 'auto') -> str:
+    def export_to_file(self, data, format_type: str = 'auto', filename: str = None,
+                       compression: str = None, progress=None) -> str:
         """
-        Exporta dados para arquivo
+        Exporta dados para arquivo, um bloco de jogadas por vez
         
         Args:
-            data: Dados a serem exportados
-            format_type: 'txt', 'csv', ou 'auto'
+            data: Lista de resultados, ResultsView, colunas de simulate_batch
+                ou iterador de blocos em qualquer desses formatos
+            format_type: 'txt', 'csv', 'ndjson' ou 'auto'
+            filename: Caminho de saída (None gera um nome em export_dir)
+            compression: 'gzip', 'bz2', 'xz', 'zstd' ou None (deduzida da
+                extensão de filename, quando houver)
+            progress: Chamado com o total de jogadas escritas após cada bloco;
+                uma exceção levantada nele interrompe a exportação
+                
+        O arquivo é escrito num temporário no mesmo diretório e só substitui
+        filename ao final, então uma falha não deixa arquivo parcial nem
+        apaga um arquivo que já existia no caminho.
             
         Returns:
             Caminho do arquivo exportado
         """
-        if not data:
+        total = _count_rows(data)
+        if total == 0:
             raise ValueError("Nenhum dado para exportar")
             
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
+        nome_base = filename or ''
+        if compression is None and filename:
+            compression = next((c for c, ext in self.COMPRESSIONS.items()
+                                if filename.lower().endswith(ext)), None)
+        if compression is not None:
+            if compression not in self.COMPRESSIONS:
+                raise ValueError(f"Compressão não suportada: {compression}")
+            if nome_base.lower().endswith(self.COMPRESSIONS[compression]):
+                nome_base = nome_base[:-len(self.COMPRESSIONS[compression])]
+            
         if format_type == 'auto':
-            format_type = 'csv' if len(data) > 10 else 'txt'
+            extensao = os.path.splitext(nome_base)[1].lstrip('.').lower()
+            if extensao in self.FORMATS:
+                format_type = extensao
+            else:
+                format_type = 'csv' if total is None or total > 10 else 'txt'
+        if format_type not in self.FORMATS:
+            raise ValueError(f"Formato não suportado: {format_type}")
             
-        filename = f"{self.export_dir}bacbo_analysis_{timestamp}.{format_type}"
+        if filename is None:
+            # Diretório criado só na primeira exportação, não na abertura do app
+            self._ensure_export_dir()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{self.export_dir}bacbo_analysis_{timestamp}.{format_type}"
+            if compression:
+                filename += self.COMPRESSIONS[compression]
+            
+        from profiling import span
+        from store import CHUNK_SIZE
         
-        if format_type == 'txt':
-            self._export_txt(data, filename)
-        elif format_type == 'csv':
-            self._export_csv(data, filename)
-        else:
-            raise ValueError(f"Formato não suportado: {format_type}")
+        export = getattr(self, f'_export_{format_type}')
+        chunks = _iter_chunks(data, self.chunk_size or CHUNK_SIZE)
+        if progress is not None:
+            chunks = _report_progress(chunks, progress)
+        diretorio, nome = os.path.split(filename)
+        temporario = os.path.join(diretorio, f".{nome}.{os.urandom(4).hex()}.tmp")
+        try:
+            with span('exportacao.' + format_type, jogadas=total, compressao=compression), \
+                    open(temporario, 'xb', buffering=WRITE_BUFFER) as bruto, \
+                    _open_output(bruto, compression, nome) as f:
+                export(chunks, f, total)
+            os.replace(temporario, filename)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
             
         return filename
     
-    def _export_txt(self, data: list, filename: str):
+    def _export_txt(self, chunks, f, total):
         """Exporta para arquivo texto formatado"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("VT BACBO ANALYZER - RELATÓRIO DE ANÁLISE\n")
-            f.write("=" * 50 + "\n")
-            f.write(f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-            f.write(f"Total de Jogadas: {len(data)}\n\n")
-            
-            f.write("DETALHES DAS JOGADAS:\n")
-            f.write("-" * 40 + "\n")
-            
-            for i, result in enumerate(data, 1):
-                line = f"Jogada {i:3d}: Dados ({result['dado1']}, {result['dado2']}) | "
-                line += f"Total: {result['total']:2d} | "
-                line += f"Resultado: {result['resultado']}\n"
-                f.write(line)
+        cabecalho = "VT BACBO ANALYZER - RELATÓRIO DE ANÁLISE\n"
+        cabecalho += "=" * 50 + "\n"
+        cabecalho += f"Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n"
+        if total is not None:
+            cabecalho += f"Total de Jogadas: {total}\n"
+        cabecalho += "\nDETALHES DAS JOGADAS:\n"
+        cabecalho += "-" * 40 + "\n"
+        f.write(cabecalho.encode('utf-8'))
+        
+        escritas = _write_rows(f, chunks, "Jogada ", _TXT_LINES, largura=3)
+        if total is None:
+            f.write(f"\nTotal de Jogadas: {escritas}\n".encode('utf-8'))
                 
-    def _export_csv(self, data: list, filename: str):
+    def _export_csv(self, chunks, f, total):
         """Exporta para arquivo CSV"""
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Jogada', 'Dado1', 'Dado2', 'Total', 'Resultado'])
+        f.write(b"Jogada,Dado1,Dado2,Total,Resultado\r\n")
+        _write_rows(f, chunks, "", _CSV_LINES)
+        
+    def _export_ndjson(self, chunks, f, total):
+        """Exporta para NDJSON (um objeto JSON por jogada)"""
+        _write_rows(f, chunks, '{"jogada": ', _NDJSON_LINES)
+
+def _line_table(formato) -> list:
+    """Pré-formata o final da linha de cada uma das 36 combinações de dados"""
+    tabela = []
+    for dado1 in range(1, 7):
+        for dado2 in range(1, 7):
+            total = dado1 + dado2
+            tabela.append(formato(dado1, dado2, total, 'PAR' if total % 2 == 0 else 'ÍMPAR'))
+    return tabela
+
+_TXT_LINES = _line_table(lambda d1, d2, t, r: f": Dados ({d1}, {d2}) | Total: {t:2d} | Resultado: {r}\n")
+_CSV_LINES = _line_table(lambda d1, d2, t, r: f",{d1},{d2},{t},{r}\r\n")
+_NDJSON_LINES = _line_table(lambda d1, d2, t, r: ", " + json.dumps(
+    {'dado1': d1, 'dado2': d2, 'total': t, 'resultado': r}, ensure_ascii=False)[1:] + "\n")
+
+def _write_rows(f, chunks, prefixo: str, tabela: list, largura: int = 0) -> int:
+    """
+    Escreve as jogadas bloco a bloco; retorna quantas foram escritas
+    
+    Cada linha é prefixo + número da jogada (alinhado à direita em largura)
+    + final pré-formatado em tabela. As partes são intercaladas em uma lista
+    e unidas por um único join, sem laço Python por linha.
+    """
+    import numpy as np
+    
+    numero = 1
+    for chunk in chunks:
+        celulas = ((chunk.dado1.astype(np.intp) - 1) * 6 + (chunk.dado2 - 1)).tolist()
+        n = len(celulas)
+        numeros = map(str, range(numero, numero + n))
+        if largura and numero < 10 ** (largura - 1):
+            numeros = [s.rjust(largura) for s in numeros]
             
-            for i, result in enumerate(data, 1):
-                writer.writerow([
-                    i,
-                    result['dado1'],
-                    result['dado2'],
-                    result['total'],
-                    result['resultado']
-                ])
+        passo = 3 if prefixo else 2
+        partes = [prefixo] * (passo * n)
+        partes[passo - 2::passo] = numeros
+        partes[passo - 1::passo] = map(tabela.__getitem__, celulas)
+        f.write(''.join(partes).encode('utf-8'))
+        numero += n
+    return numero - 1
 
-class AnimationHelper:
-    """Helper para animações suaves"""
+def _open_output(bruto, compression: str = None, nome: str = ''):
+    """Envolve o arquivo binário aberto com o compressor (nome vai no cabeçalho gzip)"""
+    if compression is None:
+        return contextlib.nullcontext(bruto)
+    if compression == 'gzip':
+        import gzip
+        return gzip.GzipFile(filename=nome, mode='wb', compresslevel=6, fileobj=bruto)
+    if compression == 'bz2':
+        import bz2
+        return bz2.BZ2File(bruto, 'wb')
+    if compression == 'xz':
+        import lzma
+        return lzma.LZMAFile(bruto, 'wb')
+    return load_zstandard().ZstdCompressor().stream_writer(bruto)
+
+def load_zstandard():
+    """Importa o pacote opcional zstandard (ValueError se não estiver instalado)"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("Compressão zstd requer o pacote 'zstandard'") from None
+    return zstandard
+
+def _count_rows(data):
+    """Quantidade de jogadas dos dados, ou None para iteradores"""
+    if isinstance(data, dict):
+        return len(data['dado1'])
+    if hasattr(data, '__len__'):
+        return len(data)
+    return None
+
+def _report_progress(chunks, progress):
+    """Repassa os blocos chamando progress com o total já entregue"""
+    entregues = 0
+    for chunk in chunks:
+        yield chunk
+        entregues += len(chunk)
+        progress(entregues)
+
+def _iter_chunks(data, chunk_size: int):
+    """Itera os dados como ResultsView de até chunk_size jogadas"""
+    from store import ResultsView, as_view
     
-    @staticmethod
-    def fade_in(widget, duration=300):
-        """Efeito fade-in para widget"""
-        widget.attributes('-alpha', 0.0)
-        widget.update()
+    if isinstance(data, (dict, list, ResultsView)):
+        yield from as_view(data).iter_chunks(chunk_size)
+        return
+    for bloco in data:
+        yield from as_view(bloco).iter_chunks(chunk_size)
+
+class UIUpdateQueue:
+    """
+    Fila única de atualizações das threads de trabalho para a interface
+    
+    Workers chamam post() de qualquer thread; a thread do Tk drena a fila em
+    taxa fixa. Para cada tipo, só o valor mais recente de cada frame é
+    aplicado, então o custo na UI é constante, seja qual for o volume postado.
+    O tipo 'call' não é mesclado: cada função é executada, em ordem, depois
+    das atualizações mescladas do frame.
+    """
+    
+    def __init__(self, root, handlers: dict, fps: int = 30):
+        self.root = root
+        self.handlers = handlers
+        self.interval = max(1000 // fps, 1)
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+        
+    def post(self, kind: str, value=None):
+        """Enfileira uma atualização (seguro em qualquer thread)"""
+        self._queue.put((kind, value))
         
-        steps = 20
-        delay = duration // steps
+    def call(self, func, *args):
+        """Enfileira uma função para rodar na thread da interface"""
+        self._queue.put(('call', (func, args)))
         
-        for i in range(steps + 1):
-            alpha = i / steps
-            widget.attributes('-alpha', alpha)
-            widget.update()
-            widget.after(delay)
+    def start(self):
+        """Inicia a drenagem periódica"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval, self._drain)
+            
+    def stop(self):
+        """Interrompe a drenagem periódica"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+            
+    def _drain(self):
+        """Aplica tudo que chegou desde o último frame, uma vez por tipo"""
+        ultimos = {}
+        chamadas = []
+        try:
+            while True:
+                kind, value = self._queue.get_nowait()
+                if kind == 'call':
+                    chamadas.append(value)
+                else:
+                    ultimos[kind] = value
+        except queue.Empty:
+            pass
+            
+        try:
+            for kind, value in ultimos.items():
+                self.handlers[kind](value)
+            for func, args in chamadas:
+                func(*args)
+        finally:
+            self._after_id = self.root.after(self.interval, self._drain)
+
+def ease_in_out(t: float) -> float:
+    """Suavização cúbica: começa e termina devagar"""
+    return 4 * t * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+class _Animation:
+    """Interpolação de um valor no tempo, aplicada por um setter"""
+    
+    __slots__ = ('setter', 'start', 'end', 'duration', 'easing', 'on_done', 'started')
+    
+    def __init__(self, setter, start, end, duration, easing, on_done, started):
+        self.setter = setter
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.easing = easing
+        self.on_done = on_done
+        self.started = started
+        
+    def step(self, now: float) -> bool:
+        """Aplica o valor do instante now; retorna True quando terminou"""
+        t = min((now - self.started) / self.duration, 1.0) if self.duration > 0 else 1.0
+        self.setter(self.start + (self.end - self.start) * self.easing(t))
+        return t >= 1.0
+
+class AnimationScheduler:
+    """
+    Linha do tempo única das animações da interface
+    
+    Todas as animações ativas avançam no mesmo tick do after, sem nunca
+    bloquear nem chamar update(). O valor de cada quadro sai do relógio e
+    não da contagem de quadros: se o loop do Tk atrasar, os quadros
+    perdidos são pulados e a animação termina no tempo previsto. Cada tick
+    respeita um orçamento de tempo; o que não coube fica para o próximo,
+    começando de onde parou. Sem animações, nenhum tick fica agendado.
+    """
+    
+    def __init__(self, root, fps: int = 60, budget_ms: float = 4.0):
+        import tkinter
+        self.root = root
+        self.interval = max(1000 // fps, 1)
+        self.budget = budget_ms / 1000
+        self._tcl_error = tkinter.TclError
+        self._animations = {}
+        self._after_id = None
+        self._last_tick = None
+        self._next = 0
+        # Quadros pulados por atraso do loop e animações adiadas pelo orçamento
+        self.dropped_frames = 0
+        self.deferred = 0
+        
+    @classmethod
+    def for_widget(cls, widget) -> 'AnimationScheduler':
+        """Agendador compartilhado da janela raiz do widget"""
+        root = widget._root()
+        scheduler = getattr(root, '_animation_scheduler', None)
+        if scheduler is None:
+            scheduler = root._animation_scheduler = cls(root)
+        return scheduler
+        
+    def animate(self, setter, start: float, end: float, duration: int = 300,
+                easing=None, on_done=None, key=None):
+        """
+        Interpola de start a end em duration ms, chamando setter(valor) a cada quadro
+        
+        Args:
+            setter: Recebe o valor interpolado
+            easing: Função de [0, 1] em [0, 1] (padrão: linear)
+            on_done: Chamado ao terminar (não é chamado se cancelada)
+            key: Identifica a animação; uma nova com a mesma chave substitui a anterior
+            
+        Returns:
+            Chave da animação, para cancel()
+        """
+        if key is None:
+            key = object()
+        self._animations[key] = _Animation(setter, start, end, duration / 1000,
+                                           easing or (lambda t: t), on_done, time.perf_counter())
+        if self._after_id is None:
+            self._last_tick = None
+            self._after_id = self.root.after(0, self._tick)
+        return key
+        
+    def cancel(self, key):
+        """Interrompe uma animação no valor em que está"""
+        self._animations.pop(key, None)
+        
+    def stop(self):
+        """Cancela todas as animações e o tick agendado"""
+        self._animations.clear()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+            
+    def __len__(self) -> int:
+        return len(self._animations)
+        
+    def _tick(self):
+        inicio = time.perf_counter()
+        if self._last_tick is not None:
+            atraso = (inicio - self._last_tick) * 1000
+            self.dropped_frames += max(int(atraso // self.interval) - 1, 0)
+        self._last_tick = inicio
+        
+        chaves = list(self._animations)
+        # Rodízio: quem ficou de fora por orçamento começa o próximo tick
+        self._next %= max(len(chaves), 1)
+        ordem = chaves[self._next:] + chaves[:self._next]
+        concluidas = []
+        for feitas, key in enumerate(ordem):
+            if feitas and time.perf_counter() - inicio > self.budget:
+                self.deferred += len(ordem) - feitas
+                self._next += feitas
+                break
+            animacao = self._animations[key]
+            try:
+                if animacao.step(time.perf_counter()):
+                    concluidas.append((key, animacao))
+            except self._tcl_error:
+                # Widget destruído durante a animação
+                self._animations.pop(key, None)
+        else:
+            self._next = 0
+            
+        for key, animacao in concluidas:
+            if self._animations.get(key) is animacao:
+                del self._animations[key]
+                if animacao.on_done is not None:
+                    animacao.on_done()
+                    
+        if self._animations:
+            decorrido = int((time.perf_counter() - inicio) * 1000)
+            self._after_id = self.root.after(max(self.interval - decorrido, 1), self._tick)
+        else:
+            self._after_id = None
+
+class AnimationHelper:
+    """Animações comuns sobre o AnimationScheduler da janela (não bloqueiam)"""
+    
+    @staticmethod
+    def fade_in(widget, duration=300, on_done=None):
+        """Efeito fade-in para widget (janela com atributo -alpha)"""
+        return AnimationHelper._fade(widget, 0.0, 1.0, duration, on_done)
+    
+    @staticmethod
+    def fade_out(widget, duration=300, on_done=None):
+        """Efeito fade-out para widget (janela com atributo -alpha)"""
+        return AnimationHelper._fade(widget, 1.0, 0.0, duration, on_done)
     
     @staticmethod
-    def fade_out(widget, duration=300):
-        """Efeito fade-out para widget"""
-        steps = 20
-        delay = duration // steps
-        
-        for i in range(steps, -1, -1):
-            alpha = i / steps
-            widget.attributes('-alpha', alpha)
-            widget.update()
-            widget.after(delay)
+    def _fade(widget, start, end, duration, on_done):
+        widget.attributes('-alpha', start)
+        # Mesma chave: um fade-out iniciado no meio de um fade-in o substitui
+        return AnimationScheduler.for_widget(widget).animate(
+            lambda alpha: widget.attributes('-alpha', alpha), start, end, duration,
+            on_done=on_done, key=(str(widget), 'alpha'))
@@ -0,0 +1,17 @@
+"""
+Configuração dos testes - módulos de src importados como no app (from analyzer import ...)
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+@pytest.fixture
+def dados():
+    """Jogadas reproduzíveis: (dado1, dado2) em arrays uint8"""
+    rng = np.random.default_rng(1234)
+    sorteio = rng.integers(1, 7, size=(2, 5000), dtype=np.uint8)
+    return sorteio[0], sorteio[1]
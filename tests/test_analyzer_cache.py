@@ -0,0 +1,109 @@
+"""
+Testes do cache versionado do analisador: valores memoizados/estendidos iguais aos recalculados
+"""
+import numpy as np
+
+from analyzer import BacBoAnalyzer
+from running_stats import RunningStatistics
+from store import ResultsView
+
+def _tendencias_diretas(dado1, dado2, janela):
+    par = ((dado1.astype(int) + dado2) % 2 == 0).astype(int)
+    pares = np.array([par[i:i + janela].sum() for i in range(len(par) - janela + 1)])
+    return pares, (pares > janela - pares).astype(np.uint8)
+
+def _conferir_tendencias(resultado, dado1, dado2, janela, offset=0):
+    pares, trend = _tendencias_diretas(dado1, dado2, janela)
+    np.testing.assert_array_equal(resultado['pares_in_window'], pares)
+    np.testing.assert_array_equal(resultado['impares_in_window'], janela - pares)
+    np.testing.assert_array_equal(resultado['trend'], trend)
+    np.testing.assert_array_equal(resultado['window_start'], np.arange(1, len(pares) + 1) + offset)
+
+def test_trends_extended_after_new_rounds(dados):
+    dado1, dado2 = dados
+    analyzer = BacBoAnalyzer()
+    analyzer.extend_history(dado1[:1000], dado2[:1000])
+
+    primeira = analyzer.analyze_trends(analyzer.get_last_results(), 20)
+    assert analyzer.analyze_trends(analyzer.get_last_results(), 20) is primeira
+    assert analyzer.cache.info()['acertos'] == 1
+    # Valores compartilhados pelo cache são somente leitura
+    assert not primeira['trend'].flags.writeable
+
+    analyzer.extend_history(dado1[1000:], dado2[1000:])
+    estendida = analyzer.analyze_trends(analyzer.get_last_results(), 20)
+    assert analyzer.cache.info()['extensoes'] == 1
+    _conferir_tendencias(estendida, dado1, dado2, 20)
+    fresca = BacBoAnalyzer().analyze_trends(ResultsView(dado1, dado2), 20)
+    for chave in fresca:
+        np.testing.assert_array_equal(estendida[chave], fresca[chave])
+
+def test_trends_of_history_slice(dados):
+    dado1, dado2 = dados
+    analyzer = BacBoAnalyzer()
+    analyzer.extend_history(dado1[:3000], dado2[:3000])
+    trecho = analyzer.results_history[100:]
+    _conferir_tendencias(analyzer.analyze_trends(trecho, 7), dado1[100:3000], dado2[100:3000], 7)
+
+    analyzer.extend_history(dado1[3000:], dado2[3000:])
+    estendida = analyzer.analyze_trends(analyzer.results_history[100:], 7)
+    assert analyzer.cache.info()['extensoes'] == 1
+    _conferir_tendencias(estendida, dado1[100:], dado2[100:], 7)
+
+def test_statistics_extended_after_new_rounds(dados):
+    dado1, dado2 = dados
+    analyzer = BacBoAnalyzer()
+    analyzer.extend_history(dado1[:2000], dado2[:2000])
+    assert analyzer.calculate_statistics(analyzer.results_history[10:])['total_jogadas'] == 1990
+
+    analyzer.extend_history(dado1[2000:], dado2[2000:])
+    estendida = analyzer.calculate_statistics(analyzer.results_history[10:])
+    assert analyzer.cache.info()['extensoes'] == 1
+    assert estendida == RunningStatistics.from_results(dado1[10:], dado2[10:]).to_dict()
+    assert analyzer.calculate_statistics(analyzer.get_last_results()) == \
+        RunningStatistics.from_results(dado1, dado2).to_dict()
+
+def test_reset_invalidates_cache(dados):
+    dado1, dado2 = dados
+    analyzer = BacBoAnalyzer()
+    analyzer.extend_history(dado1, dado2)
+    analyzer.analyze_trends(analyzer.get_last_results(), 5)
+    analyzer.calculate_statistics(analyzer.results_history[1:])
+
+    analyzer.reset_history()
+    assert analyzer.cache.info()['entradas'] == 0
+    assert analyzer.calculate_statistics(analyzer.get_last_results()) == {}
+
+    # Histórico novo do mesmo tamanho não pode reaproveitar valores do anterior
+    novo1, novo2 = dado2[::-1].copy(), dado1[::-1].copy()
+    analyzer.extend_history(novo1, novo2)
+    _conferir_tendencias(analyzer.analyze_trends(analyzer.get_last_results(), 5), novo1, novo2, 5)
+    assert analyzer.calculate_statistics(analyzer.results_history[1:]) == \
+        RunningStatistics.from_results(novo1[1:], novo2[1:]).to_dict()
+    assert analyzer.cache.info()['acertos'] == 0
+
+def test_outside_views_not_memoized(dados):
+    analyzer = BacBoAnalyzer()
+    externa = ResultsView(*dados)
+    analyzer.analyze_trends(externa, 5)
+    analyzer.calculate_statistics(externa)
+    assert analyzer.cache.info()['entradas'] == 0
+
+def test_indexes_follow_history(dados):
+    dado1, dado2 = dados
+    analyzer = BacBoAnalyzer()
+    analyzer.extend_history(dado1[:100], dado2[:100])
+    assert analyzer.get_streaks().n == 100
+    analyzer.extend_history(dado1[100:], dado2[100:])
+
+    index = analyzer.get_streaks('total')
+    assert index.n == len(dado1)
+    total = dado1.astype(int) + dado2
+    assert index.histogram(12).sum() > 0
+    assert sum(index.histogram(v).dot(np.arange(len(index.histogram(v)))) for v in range(13)) == len(total)
+
+    resultado = analyzer.find_pattern('PAR, PAR, ÍMPAR')
+    par = (total % 2 == 0)
+    esperadas = np.flatnonzero(par[:-2] & par[1:-1] & ~par[2:]) + 1
+    assert resultado['ocorrencias'] == len(esperadas)
+    np.testing.assert_array_equal(resultado['posicoes'], esperadas)
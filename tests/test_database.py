@@ -0,0 +1,72 @@
+"""
+Testes do banco de sessões: agregados por célula iguais às estatísticas das jogadas
+"""
+import numpy as np
+import pytest
+
+from analyzer import BacBoAnalyzer
+from database import SessionDatabase
+from running_stats import RunningStatistics
+
+@pytest.fixture
+def database(tmp_path):
+    with SessionDatabase(str(tmp_path / 'sessoes' / 'bacbo.db'), batch_size=700) as db:
+        yield db
+
+def test_aggregates_match_rounds(database, dados):
+    dado1, dado2 = dados
+    sessao = database.create_session('teste', seed=5)
+    for inicio in range(0, len(dado1), 333):
+        database.append(sessao, dado1[inicio:inicio + 333], dado2[inicio:inicio + 333])
+
+    stats = database.load_statistics(sessao)
+    esperado = RunningStatistics.from_results(dado1, dado2)
+    np.testing.assert_array_equal(stats.joint_counts, esperado.joint_counts)
+    assert stats.to_dict() == esperado.to_dict()
+
+    historico = database.load_history(sessao)
+    np.testing.assert_array_equal(historico.dado1, dado1)
+    np.testing.assert_array_equal(historico.dado2, dado2)
+    assert database.get_session(sessao)['total_jogadas'] == len(dado1)
+
+def test_pending_rounds_listed(database):
+    sessao = database.create_session()
+    database.append(sessao, [1, 2, 3], [4, 5, 6])
+    assert database.list_sessions()[0]['total_jogadas'] == 3
+    database.append(sessao, 6, 6)
+    assert database.get_session(sessao)['total_jogadas'] == 4
+
+def test_sessions_are_independent(database, dados):
+    dado1, dado2 = dados
+    primeira = database.create_session()
+    segunda = database.create_session()
+    database.append(primeira, dado1[:1000], dado2[:1000])
+    database.append(segunda, dado1[1000:], dado2[1000:])
+
+    assert database.load_statistics(segunda).to_dict() == \
+        RunningStatistics.from_results(dado1[1000:], dado2[1000:]).to_dict()
+
+    database.delete_session(primeira)
+    assert [s['id'] for s in database.list_sessions()] == [segunda]
+    with pytest.raises(ValueError):
+        database.get_session(primeira)
+    assert database.load_statistics(primeira).total_jogadas == 0
+
+def test_analyzer_session_round_trip(tmp_path, dados):
+    dado1, dado2 = dados
+    caminho = str(tmp_path / 'bacbo.db')
+    with SessionDatabase(caminho) as db:
+        analyzer = BacBoAnalyzer()
+        analyzer.extend_history(dado1[:2000], dado2[:2000])
+        sessao = analyzer.attach_database(db, name='gravada')
+        analyzer.extend_history(dado1[2000:], dado2[2000:])
+
+    with SessionDatabase(caminho) as db:
+        aberto = BacBoAnalyzer.open_database_session(db, sessao)
+        np.testing.assert_array_equal(aberto.results_history.dado1, dado1)
+        assert aberto.stats.to_dict() == analyzer.stats.to_dict()
+
+        aberto.extend_history(dado1[:10], dado2[:10])
+        assert db.get_session(sessao)['total_jogadas'] == len(dado1) + 10
+        aberto.reset_history()
+        assert aberto.session_id != sessao
@@ -0,0 +1,37 @@
+"""
+Testes do exportador: escrita atômica sobre arquivos existentes
+"""
+import os
+
+import numpy as np
+import pytest
+
+from store import ResultsView
+from utils import FileExporter
+
+def test_failed_export_keeps_existing_file(tmp_path, dados):
+    caminho = tmp_path / 'jogadas.csv'
+    caminho.write_bytes(b'conteudo anterior')
+
+    def interromper(escritas):
+        raise RuntimeError("cancelado")
+
+    with pytest.raises(RuntimeError):
+        FileExporter(chunk_size=100).export_to_file(ResultsView(*dados), filename=str(caminho),
+                                                    progress=interromper)
+    assert caminho.read_bytes() == b'conteudo anterior'
+    assert os.listdir(tmp_path) == ['jogadas.csv']
+
+def test_export_replaces_existing_file(tmp_path):
+    caminho = tmp_path / 'jogadas.csv'
+    caminho.write_bytes(b'conteudo anterior')
+
+    FileExporter().export_to_file(ResultsView(np.array([1, 6], np.uint8), np.array([2, 6], np.uint8)),
+                                  filename=str(caminho))
+    assert caminho.read_text(encoding='utf-8').splitlines()[1:] == ['1,1,2,3,ÍMPAR', '2,6,6,12,PAR']
+    assert os.listdir(tmp_path) == ['jogadas.csv']
+
+def test_empty_export_rejected(tmp_path):
+    vazio = np.zeros(0, np.uint8)
+    with pytest.raises(ValueError):
+        FileExporter().export_to_file(ResultsView(vazio, vazio), filename=str(tmp_path / 'x.csv'))
@@ -0,0 +1,27 @@
+"""
+Testes do resumo ao vivo: view do histórico coerente com as estatísticas
+"""
+import numpy as np
+
+from analyzer import BacBoAnalyzer
+from feed import live_summary
+from running_stats import RunningStatistics
+from store import ResultsStore
+
+def test_summary_snapshot_survives_new_batches(dados):
+    dado1, dado2 = dados
+    analyzer = BacBoAnalyzer()
+    # Capacidade pequena para o lote seguinte realocar as colunas
+    analyzer.results_history = ResultsStore(capacity=1024)
+    analyzer.extend_history(dado1[:1000], dado2[:1000])
+    resumo = live_summary(analyzer, window_size=10)
+
+    # Lotes seguintes não mudam o resumo já entregue
+    analyzer.extend_history(dado1[1000:], dado2[1000:])
+    historico = resumo['historico']
+    assert len(historico) == resumo['jogadas'] == resumo['estatisticas']['total_jogadas'] == 1000
+    np.testing.assert_array_equal(historico.dado1, dado1[:1000])
+    np.testing.assert_array_equal(historico.dado2, dado2[:1000])
+    assert resumo['estatisticas'] == RunningStatistics.from_results(dado1[:1000], dado2[:1000]).to_dict()
+    pares = int(np.count_nonzero((dado1[990:1000] + dado2[990:1000]) % 2 == 0))
+    assert resumo['tendencia']['pares'] == pares
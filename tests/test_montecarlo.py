@@ -0,0 +1,24 @@
+"""
+Testes do runner Monte Carlo: resultado independente da quantidade de processos
+"""
+import numpy as np
+import pytest
+
+from montecarlo import plan_shards, run_simulation
+
+def test_shards_cover_all_rounds():
+    shards = plan_shards(10_005, seed=1, shard_size=1000)
+    assert sum(tamanho for _, tamanho in shards) == 10_005
+
+def test_same_result_for_any_worker_count():
+    serial = run_simulation(20_000, seed=42, workers=1, shard_size=3000)
+    paralelo = run_simulation(20_000, seed=42, workers=2, shard_size=3000)
+    np.testing.assert_array_equal(serial.joint_counts, paralelo.joint_counts)
+    assert serial.total_jogadas == 20_000
+
+def test_progress_exception_cancels():
+    def cancelar(feitas):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_simulation(20_000, seed=1, workers=1, shard_size=3000, progress=cancelar)
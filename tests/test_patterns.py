@@ -0,0 +1,70 @@
+"""
+Testes do PatternIndex contra a busca direta em janelas deslizantes
+"""
+import numpy as np
+import pytest
+
+import patterns
+from patterns import PatternIndex
+
+def _posicoes(seq, padrao):
+    k = len(padrao)
+    if len(seq) < k:
+        return np.zeros(0, dtype=np.int64)
+    janelas = np.lib.stride_tricks.sliding_window_view(seq, k)
+    return np.flatnonzero((janelas == np.asarray(padrao)).all(axis=1))
+
+def _conferir(index, seq, padroes):
+    for padrao in padroes:
+        esperado = _posicoes(seq, padrao)
+        np.testing.assert_array_equal(index.positions(padrao), esperado)
+        assert index.count(padrao) == len(esperado)
+        seguintes = esperado + len(padrao)
+        np.testing.assert_array_equal(
+            index.next_counts(padrao),
+            np.bincount(seq[seguintes[seguintes < len(seq)]], minlength=index.alphabet))
+
+@pytest.mark.parametrize('merge_min', [patterns.MERGE_MIN, 16])
+def test_index_matches_brute_force(monkeypatch, merge_min):
+    # Com MERGE_MIN pequeno a cauda é mesclada na base várias vezes
+    monkeypatch.setattr(patterns, 'MERGE_MIN', merge_min)
+    rng = np.random.default_rng(3)
+    seq = rng.integers(0, 3, 4000).astype(np.uint8)
+    index = PatternIndex(3, max_length=5)
+    padroes = [[0], [2], [1, 1], [0, 2, 1], [2, 2, 2, 2, 2], [0, 1, 2, 0, 1], [1, 0, 0, 1, 2, 2, 0], [2] * 9]
+
+    for inicio, fim in ((0, 3), (3, 700), (700, 701), (701, 4000)):
+        index.extend(seq[inicio:fim])
+        _conferir(index, seq[:fim], padroes)
+
+def test_short_sequence_only_edge_positions():
+    index = PatternIndex(2, max_length=8)
+    index.extend([1, 0, 1])
+    assert index.positions([1]).tolist() == [0, 2]
+    assert index.count([0, 1]) == 1
+    assert index.next_counts([1]).tolist() == [1, 0]
+    assert index.count([1] * 10) == 0
+
+def test_invalid_patterns():
+    index = PatternIndex(2, max_length=4)
+    index.extend([0, 1, 1, 0, 1])
+    with pytest.raises(ValueError):
+        index.count([])
+    with pytest.raises(ValueError):
+        index.positions([2])
+    with pytest.raises(ValueError):
+        index.extend([3])
+
+def test_positions_widen_past_int32(monkeypatch):
+    # Com o limite reduzido, a troca para int64 acontece no meio da série
+    monkeypatch.setattr(patterns, 'POSITION_INT32_MAX', 1000)
+    monkeypatch.setattr(patterns, 'MERGE_MIN', 16)
+    rng = np.random.default_rng(5)
+    seq = rng.integers(0, 2, 3000).astype(np.uint8)
+    index = PatternIndex(2, max_length=6)
+    index.extend(seq[:900])
+    assert index._base_pos.dtype == np.int32
+    index.extend(seq[900:950])
+    index.extend(seq[950:])
+    assert index._base_pos.dtype == np.int64 and index._tail_pos.dtype == np.int64
+    _conferir(index, seq, [[1], [0, 1, 1], [1, 0, 1, 0, 0, 1], [0] * 8])
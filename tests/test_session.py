@@ -0,0 +1,67 @@
+"""
+Testes do formato de sessão .vtbb: gravação, reabertura mapeada e jogadas novas
+"""
+import numpy as np
+import pytest
+
+import session
+from analyzer import BacBoAnalyzer
+from running_stats import RunningStatistics
+from store import ResultsView
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_and_reopen(tmp_path, dados, mmap):
+    dado1, dado2 = dados
+    analyzer = BacBoAnalyzer()
+    analyzer.simulate_batch(0, seed=99)
+    analyzer.extend_history(dado1, dado2)
+    caminho = analyzer.save_session(str(tmp_path / 'sessao.vtbb'))
+
+    aberto = BacBoAnalyzer.open_session(caminho, mmap=mmap)
+    assert aberto.seed == 99
+    np.testing.assert_array_equal(aberto.results_history.dado1, dado1)
+    np.testing.assert_array_equal(aberto.results_history.dado2, dado2)
+    # Mapeado do arquivo em modo somente leitura
+    assert aberto.results_history.dado1.flags.writeable != mmap
+    assert aberto.calculate_statistics(aberto.get_last_results()) == analyzer.stats.to_dict()
+
+def test_append_after_mmap_reopen(tmp_path, dados):
+    dado1, dado2 = dados
+    caminho = str(tmp_path / 'sessao.vtbb')
+    session.save_session(caminho, ResultsView(dado1[:3000], dado2[:3000]))
+    with open(caminho, 'rb') as f:
+        original = f.read()
+
+    aberto = BacBoAnalyzer.open_session(caminho)
+    aberto.get_streaks()
+    aberto.extend_history(dado1[3000:], dado2[3000:])
+
+    np.testing.assert_array_equal(aberto.results_history.dado1, dado1)
+    np.testing.assert_array_equal(aberto.results_history.dado2, dado2)
+    assert aberto.stats.to_dict() == RunningStatistics.from_results(dado1, dado2).to_dict()
+    assert aberto.get_streaks().n == len(dado1)
+    # O arquivo mapeado não é alterado pelas jogadas novas
+    with open(caminho, 'rb') as f:
+        assert f.read() == original
+
+    relido = BacBoAnalyzer.open_session(aberto.save_session(str(tmp_path / 'continuada.vtbb')))
+    np.testing.assert_array_equal(relido.results_history.dado1, dado1)
+
+def test_empty_session(tmp_path):
+    caminho = BacBoAnalyzer().save_session(str(tmp_path / 'vazia.vtbb'))
+    aberto = BacBoAnalyzer.open_session(caminho)
+    assert len(aberto.results_history) == 0
+    assert aberto.calculate_statistics(aberto.get_last_results()) == {}
+
+def test_invalid_and_truncated_files(tmp_path, dados):
+    invalido = tmp_path / 'invalido.vtbb'
+    invalido.write_bytes(b'nada disso')
+    with pytest.raises(ValueError):
+        session.open_session(str(invalido))
+
+    caminho = str(tmp_path / 'sessao.vtbb')
+    session.save_session(caminho, ResultsView(*dados))
+    with open(caminho, 'r+b') as f:
+        f.truncate(len(f.read()) - 1)
+    with pytest.raises(ValueError, match="truncado"):
+        session.read_header(caminho)
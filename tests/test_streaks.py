@@ -0,0 +1,77 @@
+"""
+Testes do StreakIndex contra a contagem direta das sequências
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+import streaks
+from streaks import StreakIndex, find_streaks, run_lengths
+
+def _sequencias(valores):
+    """(valor, início 0-based, comprimento) de cada sequência, por itertools.groupby"""
+    resultado, inicio = [], 0
+    for valor, grupo in itertools.groupby(valores):
+        comprimento = len(list(grupo))
+        resultado.append((valor, inicio, comprimento))
+        inicio += comprimento
+    return resultado
+
+def _serie(n, n_valores, seed):
+    rng = np.random.default_rng(seed)
+    # Valores repetidos em rajadas para ter sequências longas
+    return np.repeat(rng.integers(0, n_valores, n), rng.integers(1, 9, n)).astype(np.uint8)
+
+def test_run_lengths():
+    valores = np.array([1, 1, 0, 2, 2, 2, 1], dtype=np.uint8)
+    inicios, comprimentos, vals = run_lengths(valores)
+    assert inicios.tolist() == [0, 2, 3, 6]
+    assert comprimentos.tolist() == [2, 1, 3, 1]
+    assert vals.tolist() == [1, 0, 2, 1]
+
+    inicios, comprimentos = find_streaks(valores, 2, 2)
+    assert (inicios.tolist(), comprimentos.tolist()) == ([3], [3])
+
+@pytest.mark.parametrize('bloco', [streaks.STREAK_BLOCK, 37])
+def test_index_matches_brute_force(monkeypatch, bloco):
+    monkeypatch.setattr(streaks, 'STREAK_BLOCK', bloco)
+    valores = _serie(3000, 3, seed=7)
+    index = StreakIndex(3, top_keep=5)
+    # Lotes de tamanhos variados, com algumas jogadas avulsas por push
+    posicao = 0
+    for tamanho in (1, 500, 1, 1, 1200, 3, len(valores)):
+        lote = valores[posicao:posicao + tamanho]
+        if tamanho == 1:
+            index.push(int(lote[0]))
+        else:
+            index.extend(lote)
+        posicao += tamanho
+
+    esperadas = _sequencias(valores.tolist())
+    assert index.n == len(valores)
+    for valor in range(3):
+        comprimentos = [c for v, _, c in esperadas if v == valor]
+        hist = np.bincount(comprimentos, minlength=max(comprimentos) + 1)
+        hist[0] = 0
+        np.testing.assert_array_equal(index.histogram(valor), hist)
+        assert index.count_at_least(valor, 4) == sum(c >= 4 for c in comprimentos)
+
+        # Maiores primeiro, empates pela mais antiga
+        maiores = sorted((s for s in esperadas if s[0] == valor), key=lambda s: (-s[2], s[1]))[:5]
+        assert index.longest(valor, top=5) == [{'valor': v, 'inicio': i + 1, 'comprimento': c}
+                                               for v, i, c in maiores]
+
+    ultima = esperadas[-1]
+    assert index.current == {'valor': ultima[0], 'inicio': ultima[1] + 1, 'comprimento': ultima[2]}
+
+def test_open_streak_excluded_on_request():
+    index = StreakIndex(2)
+    index.extend(np.array([0, 0, 1, 1, 1], dtype=np.uint8))
+    assert index.count_at_least(1, 3) == 1
+    assert index.count_at_least(1, 3, include_open=False) == 0
+    assert index.longest() == [{'valor': 1, 'inicio': 3, 'comprimento': 3}]
+
+    index.reset()
+    assert index.current is None
+    assert index.longest() == []